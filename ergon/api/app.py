@@ -48,6 +48,7 @@ from ergon.core.database.engine import get_db_session, init_db
 from ergon.core.database.models import Agent, AgentFile, AgentTool, AgentExecution, AgentMessage, DocumentationPage
 from ergon.core.agents.generator import AgentGenerator
 from ergon.core.agents.runner import AgentRunner
+from ergon.core.agents.runner.execution.db import record_execution_error, record_execution_success
 from ergon.core.docs.crawler import crawl_all_docs, crawl_pydantic_ai_docs, crawl_langchain_docs, crawl_anthropic_docs
 from ergon.core.llm.client import LLMClient
 from ergon.core.vector_store.faiss_store import FAISSDocumentStore
@@ -401,23 +402,28 @@ async def run_agent(
             if not agent:
                 raise HTTPException(status_code=404, detail=f"Agent with ID {agent_id} not found")
             
-            # Create execution record
+            # Create execution record, flushing only to get its ID
             execution = AgentExecution(agent_id=agent.id)
             db.add(execution)
-            db.commit()
-            db.refresh(execution)
+            db.flush()
             
-            # Record user message
+            # Record user message in the same transaction
             user_message = AgentMessage(
                 execution_id=execution.id,
                 role="user",
                 content=message.content
             )
             db.add(user_message)
+            execution_id = execution.id
             db.commit()
+            
+            # Reload the agent expired by the commit and detach it, so the
+            # runner can read it after the session closes
+            db.refresh(agent)
+            db.expunge(agent)
         
         # Initialize runner
-        runner = AgentRunner(agent=agent, execution_id=execution.id)
+        runner = AgentRunner(agent=agent, execution_id=execution_id)
         
         if message.stream:
             async def generate():
@@ -425,31 +431,19 @@ async def run_agent(
                     yield f"data: {chunk}\n\n"
                 
                 # Mark execution as completed
-                with get_db_session() as db:
-                    execution = db.query(AgentExecution).filter(AgentExecution.id == execution.id).first()
-                    if execution:
-                        execution.completed_at = datetime.now()
-                        execution.success = True
-                        db.commit()
+                record_execution_success(execution_id)
                 
                 yield "data: [DONE]\n\n"
             
             return StreamingResponse(generate(), media_type="text/event-stream")
         else:
-            # Run agent
+            # Run agent; the run records its messages and completion in one commit
             response = await runner.arun(message.content)
             
-            # Mark execution as completed
             with get_db_session() as db:
-                execution = db.query(AgentExecution).filter(AgentExecution.id == execution.id).first()
-                if execution:
-                    execution.completed_at = datetime.now()
-                    execution.success = True
-                    db.commit()
-                
                 # Get assistant message
                 assistant_message = db.query(AgentMessage).filter(
-                    AgentMessage.execution_id == execution.id,
+                    AgentMessage.execution_id == execution_id,
                     AgentMessage.role == "assistant"
                 ).order_by(AgentMessage.id.desc()).first()
                 
@@ -471,6 +465,68 @@ async def run_agent(
         logger.error(f"Error running agent: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error running agent: {str(e)}")
 
+@routers.v1.post("/agents/{agent_id}/submit")
+async def submit_agent_run(
+    message: MessageCreate,
+    agent_id: int = Path(..., description="ID of the agent")
+):
+    """Start an agent run in the background and return its execution ID."""
+    with get_db_session() as db:
+        agent = db.query(Agent).filter(Agent.id == agent_id).first()
+        if not agent:
+            raise HTTPException(status_code=404, detail=f"Agent with ID {agent_id} not found")
+        
+        # Create execution record with the user message
+        execution = AgentExecution(agent_id=agent.id, input_data=message.content)
+        db.add(execution)
+        db.flush()
+        execution_id = execution.id
+        db.add(AgentMessage(
+            execution_id=execution_id,
+            role="user",
+            content=message.content
+        ))
+        db.commit()
+        
+        # Reload the agent expired by the commit and detach it, so the
+        # runner can read it after the session closes
+        db.refresh(agent)
+        db.expunge(agent)
+    
+    try:
+        runner = AgentRunner(agent=agent, execution_id=execution_id)
+        await runner.submit(message.content)
+    except Exception as e:
+        # Fail the execution rather than leave it pending forever
+        logger.error(f"Error submitting agent run: {str(e)}")
+        record_execution_error(execution_id, str(e))
+        raise HTTPException(status_code=500, detail=f"Error submitting agent run: {str(e)}")
+    
+    return {"execution_id": execution_id, "status": "running"}
+
+@routers.v1.get("/executions/{execution_id}")
+async def get_execution(execution_id: int = Path(..., description="ID of the execution")):
+    """Get the status of an agent execution and its latest response."""
+    with get_db_session() as db:
+        execution = db.query(AgentExecution).filter(AgentExecution.id == execution_id).first()
+        if not execution:
+            raise HTTPException(status_code=404, detail=f"Execution with ID {execution_id} not found")
+        
+        assistant_message = db.query(AgentMessage).filter(
+            AgentMessage.execution_id == execution_id,
+            AgentMessage.role == "assistant"
+        ).order_by(AgentMessage.id.desc()).first()
+        
+        return {
+            "execution_id": execution.id,
+            "agent_id": execution.agent_id,
+            "status": execution.status,
+            "start_time": execution.start_time,
+            "end_time": execution.end_time,
+            "error": execution.error,
+            "response": assistant_message.content if assistant_message else None
+        }
+
 @routers.v1.post("/docs/crawl", response_model=DocCrawlResponse)
 async def crawl_docs(request: DocCrawlRequest):
     """Crawl documentation from specified source."""
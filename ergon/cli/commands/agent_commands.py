@@ -9,7 +9,6 @@ from rich.console import Console
 from rich.table import Table
 import os
 import json
-import asyncio
 from datetime import datetime
 from typing import Optional
 
@@ -252,7 +251,7 @@ def run_agent(
                     
                     # Run agent
                     with console.status("[bold green]Agent thinking..."):
-                        response = asyncio.run(runner.run(user_input))
+                        response = runner.run_sync(user_input)
                     
                     # Print response with consistent agent name display
                     console.print(f"[bold cyan]{agent.name}[/bold cyan] [dim](ID: {agent.id})[/dim]: {response}")
@@ -284,7 +283,7 @@ def run_agent(
                     db.commit()
                     
                     # Run agent
-                    response = asyncio.run(runner.run(input))
+                    response = runner.run_sync(input)
                     
                     # Record assistant message
                     message = AgentMessage(
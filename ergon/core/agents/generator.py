@@ -10,6 +10,8 @@ from datetime import datetime
 import logging
 import importlib
 
+from sqlalchemy.orm import undefer
+
 from ergon.core.database.engine import get_db_session
 from ergon.core.database.models import Agent as DatabaseAgent, AgentFile, AgentTool, DocumentationPage
 from ergon.core.vector_store.faiss_store import FAISSDocumentStore
@@ -108,7 +110,9 @@ class AgentGenerator:
         # If no docs in vector store yet, get from database
         if not docs:
             with get_db_session() as db:
-                db_docs = db.query(DocumentationPage).limit(5).all()
+                db_docs = db.query(DocumentationPage).options(
+                    undefer(DocumentationPage.content)
+                ).limit(5).all()
                 docs = [
                     {
                         "id": f"doc_{doc.id}",
@@ -487,7 +491,9 @@ def generate_agent(
             
             files_data = []
             with get_db_session() as db:
-                files = db.query(AgentFile).filter(AgentFile.agent_id == nexus_agent.id).all()
+                files = db.query(AgentFile).options(
+                    undefer(AgentFile.content)
+                ).filter(AgentFile.agent_id == nexus_agent.id).all()
                 for file in files:
                     files_data.append({
                         "filename": file.filename,
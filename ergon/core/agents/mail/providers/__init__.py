@@ -5,12 +5,22 @@ This module defines the interfaces and implementations for different
 email service providers (Gmail, Outlook, etc.).
 """
 
-from typing import Optional
+from typing import Callable, Dict, Optional
 
 from ergon.core.agents.mail.providers.base import MailProvider
 from ergon.core.agents.mail.providers.gmail import GmailProvider
 from ergon.core.agents.mail.providers.outlook import OutlookProvider
 
+# Default IMAP/SMTP servers for common email domains
+_IMAP_SERVERS = {
+    "gmail.com": ("imap.gmail.com", "smtp.gmail.com"),
+    "outlook.com": ("outlook.office365.com", "smtp.office365.com"),
+    "hotmail.com": ("outlook.office365.com", "smtp.office365.com"),
+    "live.com": ("outlook.office365.com", "smtp.office365.com"),
+    "yahoo.com": ("imap.mail.yahoo.com", "smtp.mail.yahoo.com"),
+}
+
+
 # Lazy import for IMAP to avoid circular imports
 def _get_imap_provider():
     """Lazily import the IMAP provider class."""
@@ -18,6 +28,29 @@ def _get_imap_provider():
     return ImapSmtpProvider
 
 
+def _create_imap_provider(**kwargs) -> MailProvider:
+    """Create an IMAP/SMTP provider, filling in servers for well-known domains."""
+    # Import lazily to avoid circular imports
+    ImapSmtpProvider = _get_imap_provider()
+    
+    # Set default servers based on common email providers if not specified
+    if 'imap_server' not in kwargs:
+        email = kwargs.get('email_address', '')
+        servers = _IMAP_SERVERS.get(email.rpartition('@')[2]) if '@' in email else None
+        if servers:
+            kwargs['imap_server'], kwargs['smtp_server'] = servers
+    
+    return ImapSmtpProvider(**kwargs)
+
+
+# Provider factories by type; add new providers here
+_PROVIDERS: Dict[str, Callable[..., MailProvider]] = {
+    "gmail": GmailProvider,
+    "outlook": OutlookProvider,
+    "imap": _create_imap_provider,
+}
+
+
 def get_mail_provider(provider_type: str = "gmail", **kwargs) -> Optional[MailProvider]:
     """
     Factory function to create a mail provider instance.
@@ -29,30 +62,9 @@ def get_mail_provider(provider_type: str = "gmail", **kwargs) -> Optional[MailPr
     Returns:
         Provider instance or None if invalid type
     """
-    if provider_type.lower() == "gmail":
-        return GmailProvider(**kwargs)
-    elif provider_type.lower() == "outlook":
-        return OutlookProvider(**kwargs)
-    elif provider_type.lower() == "imap":
-        # Import lazily to avoid circular imports
-        ImapSmtpProvider = _get_imap_provider()
-        
-        # Get email domain for auto-configuration
-        email = kwargs.get('email_address', '')
-        email_domain = email.split('@')[-1] if '@' in email else ''
-        
-        # Set default servers based on common email providers if not specified
-        if email_domain == 'gmail.com' and 'imap_server' not in kwargs:
-            kwargs['imap_server'] = 'imap.gmail.com'
-            kwargs['smtp_server'] = 'smtp.gmail.com'
-        elif email_domain in ('outlook.com', 'hotmail.com', 'live.com') and 'imap_server' not in kwargs:
-            kwargs['imap_server'] = 'outlook.office365.com'
-            kwargs['smtp_server'] = 'smtp.office365.com'
-        elif email_domain == 'yahoo.com' and 'imap_server' not in kwargs:
-            kwargs['imap_server'] = 'imap.mail.yahoo.com'
-            kwargs['smtp_server'] = 'smtp.mail.yahoo.com'
-        
-        return ImapSmtpProvider(**kwargs)
+    factory = _PROVIDERS.get(provider_type.lower())
+    if factory is not None:
+        return factory(**kwargs)
     
     # Unknown provider type
     from ergon.core.logging import get_logger
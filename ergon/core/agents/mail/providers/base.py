@@ -4,6 +4,7 @@ Mail Provider Base Interface
 This module defines the base interface for mail providers.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional
 
@@ -11,6 +12,9 @@ from typing import List, Dict, Any, Optional
 class MailProvider(ABC):
     """Base interface for mail providers."""
     
+    # No per-instance state here, so slotted subclasses stay free of __dict__
+    __slots__ = ()
+    
     @abstractmethod
     async def authenticate(self) -> bool:
         """Authenticate with the provider."""
@@ -26,6 +30,15 @@ class MailProvider(ABC):
         """Retrieve a specific message by ID."""
         pass
     
+    async def get_messages(self, message_ids: List[str]) -> List[Dict[str, Any]]:
+        """Retrieve several messages by ID, skipping any that cannot be fetched."""
+        messages = []
+        for message_id in message_ids:
+            message = await self.get_message(message_id)
+            if message:
+                messages.append(message)
+        return messages
+    
     @abstractmethod
     async def send_message(self, to: List[str], subject: str, body: str, 
                            cc: Optional[List[str]] = None,
@@ -33,6 +46,28 @@ class MailProvider(ABC):
         """Send a new message."""
         pass
     
+    async def send_messages(self, messages: List[Dict[str, Any]],
+                            concurrency: int = 10) -> List[bool]:
+        """
+        Send several messages concurrently.
+        
+        Args:
+            messages: Keyword arguments for send_message, one dict per message
+            concurrency: Maximum number of sends in flight at once
+            
+        Returns:
+            Whether each message was sent, in the same order as messages
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def send_one(message: Dict[str, Any]) -> bool:
+            async with semaphore:
+                return await self.send_message(**message)
+        
+        results = await asyncio.gather(
+            *(send_one(message) for message in messages), return_exceptions=True)
+        return [result is True for result in results]
+    
     @abstractmethod
     async def reply_to_message(self, message_id: str, body: str) -> bool:
         """Reply to a specific message."""
@@ -46,4 +81,14 @@ class MailProvider(ABC):
     @abstractmethod
     async def get_folders(self) -> List[Dict[str, Any]]:
         """Get available folders/labels."""
-        pass
\ No newline at end of file
+        pass
+    
+    async def close(self) -> None:
+        """Release any resources held by the provider."""
+        pass
+    
+    async def __aenter__(self) -> "MailProvider":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
\ No newline at end of file
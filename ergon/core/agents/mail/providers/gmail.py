@@ -5,10 +5,18 @@ This module implements the MailProvider interface for Gmail.
 """
 
 import os
-import json
-import base64
+import re
+import uuid
+import asyncio
+import binascii
 import logging
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict, deque
+from urllib.parse import urlencode
+from email.parser import BytesParser
+from email.message import EmailMessage
+from email.policy import SMTP
+from email.utils import parseaddr
+from typing import List, Dict, Any, Optional, Tuple
 
 import httpx
 from google.oauth2.credentials import Credentials
@@ -16,13 +24,35 @@ from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from google.auth.exceptions import RefreshError
 
+from ergon.utils import fast_json
 from ergon.utils.config.settings import settings
 from ergon.core.agents.mail.providers.base import MailProvider
+from ergon.core.agents.mail.providers.http import (
+    RATE_LIMIT_STATUS_CODES, TRANSIENT_STATUS_CODES, request_with_retry
+)
 
 # Configure logger
 logger = logging.getLogger(__name__)
 logger.setLevel(getattr(logging, settings.log_level.value))
 
+# Translation tables between the base64url and standard base64 alphabets
+_B64_TABLE = bytes.maketrans(b"-_", b"+/")
+_URLSAFE_TABLE = bytes.maketrans(b"+/", b"-_")
+
+# Reply prefixes in their common spellings: "Re:", "RE:", "Re :", "Re[2]:"
+_RE_PREFIX = re.compile(r"^\s*re\s*(\[\d+\])?\s*:\s*", re.IGNORECASE)
+
+
+def _decode_body(data: str) -> str:
+    """Decode a base64url-encoded Gmail body part in a single pass."""
+    # a2b_base64 ignores surplus padding, so always append enough for unpadded input
+    return binascii.a2b_base64(data.encode("ascii").translate(_B64_TABLE) + b"==").decode("utf-8", "replace")
+
+
+def _encode_message(message: EmailMessage) -> str:
+    """Serialize a MIME message and encode it as base64url for the Gmail send API."""
+    return binascii.b2a_base64(message.as_bytes(policy=SMTP), newline=False).translate(_URLSAFE_TABLE).decode("ascii")
+
 
 class GmailProvider(MailProvider):
     """Gmail implementation of MailProvider."""
@@ -32,6 +62,19 @@ class GmailProvider(MailProvider):
               'https://www.googleapis.com/auth/gmail.send',
               'https://www.googleapis.com/auth/gmail.labels']
     
+    # Gmail batch endpoint and maximum sub-requests per batch call
+    BATCH_URL = "https://gmail.googleapis.com/batch/gmail/v1"
+    BATCH_SIZE = 100
+    
+    # Cap on concurrent API requests, matching the connection pool size
+    MAX_CONCURRENT_REQUESTS = 64
+    
+    # Headers requested for list views, which skip the message body
+    METADATA_HEADERS = ("Subject", "From", "To", "Date")
+    
+    # Maximum number of parsed messages kept in the message cache
+    MESSAGE_CACHE_SIZE = 256
+    
     def __init__(self, credentials_file: Optional[str] = None, token_file: Optional[str] = None):
         """
         Initialize Gmail provider.
@@ -47,6 +90,55 @@ class GmailProvider(MailProvider):
         self.credentials = None
         self.email = None
         self.api_base = "https://gmail.googleapis.com/gmail/v1"
+        self._client: Optional[httpx.AsyncClient] = None
+        self._msg_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._auth_lock = asyncio.Lock()
+        self._request_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        self._headers: Dict[str, str] = {}
+        self._headers_token: Optional[str] = None
+        self._page_tokens: Dict[Tuple[str, int], Dict[int, str]] = {}
+    
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                timeout=httpx.Timeout(30.0)
+            )
+        return self._client
+    
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request on the shared client with rate-limit aware retries.
+        
+        The cached auth headers are sent unless the caller passes its own.
+        """
+        client = await self._get_client()
+        kwargs.setdefault("headers", self._auth_headers())
+        return await request_with_retry(
+            client, method, url, semaphore=self._request_semaphore, **kwargs)
+    
+    def _auth_headers(self) -> Dict[str, str]:
+        """
+        Get the request headers for the current access token.
+        
+        The dict is cached and only rebuilt when the token changes, so every
+        request for a given token shares the same object.
+        
+        Returns:
+            Headers carrying the bearer token
+        """
+        token = self.credentials.token
+        if token != self._headers_token:
+            self._headers = {"Authorization": f"Bearer {token}"}
+            self._headers_token = token
+        return self._headers
+    
+    async def close(self) -> None:
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     async def authenticate(self) -> bool:
         """
@@ -56,19 +148,25 @@ class GmailProvider(MailProvider):
             True if authentication successful, False otherwise
         """
         try:
-            # Check if we already have a token
-            if os.path.exists(self.token_file):
-                with open(self.token_file, 'r') as token:
-                    creds_data = json.load(token)
-                    self.credentials = Credentials.from_authorized_user_info(
-                        creds_data, self.SCOPES)
-                    
-                    # If credentials expired, try to refresh
-                    if self.credentials and self.credentials.expired and self.credentials.refresh_token:
-                        self.credentials.refresh(Request())
-                        # Save refreshed credentials
-                        with open(self.token_file, 'w') as token:
-                            token.write(self.credentials.to_json())
+            # Nothing to do when the in-memory credentials are still usable
+            if self.credentials and self.credentials.valid and self.email:
+                return True
+            
+            # Token refresh and the OAuth flow do blocking I/O, so run them in the default executor
+            loop = asyncio.get_event_loop()
+            
+            # Only read the token file when nothing is loaded yet
+            if self.credentials is None and os.path.exists(self.token_file):
+                with open(self.token_file, 'rb') as token:
+                    creds_data = fast_json.loads(token.read())
+                self.credentials = Credentials.from_authorized_user_info(
+                    creds_data, self.SCOPES)
+            
+            # If credentials expired, try to refresh
+            if self.credentials and self.credentials.expired and self.credentials.refresh_token:
+                await loop.run_in_executor(None, self.credentials.refresh, Request())
+                # Save refreshed credentials
+                await self._save_credentials()
             
             # If no valid credentials, need to authenticate
             if not self.credentials or not self.credentials.valid:
@@ -79,99 +177,186 @@ class GmailProvider(MailProvider):
                 # Start OAuth flow
                 flow = InstalledAppFlow.from_client_secrets_file(
                     self.credentials_file, self.SCOPES)
-                self.credentials = flow.run_local_server(port=0)
+                self.credentials = await loop.run_in_executor(
+                    None, lambda: flow.run_local_server(port=0))
                 
                 # Save credentials
-                with open(self.token_file, 'w') as token:
-                    token.write(self.credentials.to_json())
+                await self._save_credentials()
             
             # Get user email address
-            async with httpx.AsyncClient() as client:
-                headers = {
-                    "Authorization": f"Bearer {self.credentials.token}"
-                }
-                response = await client.get(
-                    f"{self.api_base}/users/me/profile",
-                    headers=headers
-                )
-                
-                if response.status_code == 200:
-                    self.email = response.json().get("emailAddress")
-                    logger.info(f"Authenticated as {self.email}")
-                    return True
-                else:
-                    logger.error(f"Failed to get user profile: {response.text}")
-                    return False
-                
+            response = await self._request(
+                "GET",
+                f"{self.api_base}/users/me/profile"
+            )
+            
+            if response.status_code == 200:
+                self.email = fast_json.loads(response.content).get("emailAddress")
+                logger.info(f"Authenticated as {self.email}")
+                return True
+            else:
+                logger.error(f"Failed to get user profile: {response.text}")
+                return False
+            
         except Exception as e:
             logger.error(f"Gmail authentication error: {str(e)}")
             return False
     
-    async def get_inbox(self, limit: int = 20, page: int = 1) -> List[Dict[str, Any]]:
+    async def _ensure_token(self) -> bool:
+        """
+        Make sure valid credentials are available.
+        
+        Concurrent callers share a single refresh: the first one to find the
+        credentials invalid authenticates while the rest wait on the lock and
+        then reuse its result.
+        
+        Returns:
+            True if valid credentials are available, False otherwise
+        """
+        if self.credentials and self.credentials.valid:
+            return True
+        
+        async with self._auth_lock:
+            # Another coroutine may have refreshed while we were waiting
+            if self.credentials and self.credentials.valid:
+                return True
+            return await self.authenticate()
+    
+    async def _save_credentials(self) -> None:
+        """Write the current credentials to the token file without blocking the event loop."""
+        # to_json() already returns serialized text, so write it as-is
+        data = self.credentials.to_json()
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self._write_token_file, data)
+    
+    def _write_token_file(self, data: str) -> None:
+        """Write serialized credentials to the token file."""
+        with open(self.token_file, 'w') as token:
+            token.write(data)
+    
+    async def get_inbox(self, limit: int = 20, page: int = 1, full: bool = False) -> List[Dict[str, Any]]:
         """
         Get inbox messages.
         
         Args:
             limit: Maximum number of messages
             page: Page number (1-based)
+            full: Whether to fetch full message bodies; by default the
+                body is the message snippet
             
         Returns:
             List of message metadata
         """
-        if not self.credentials or not self.credentials.valid:
-            if not await self.authenticate():
-                return []
+        if not await self._ensure_token():
+            return []
         
         try:
-            async with httpx.AsyncClient() as client:
-                headers = {
-                    "Authorization": f"Bearer {self.credentials.token}"
-                }
-                
-                # Calculate pagination
-                max_results = min(limit, 100)  # Gmail API max is 100
-                page_token = None
-                
-                # Get message IDs first
-                query = {
-                    "maxResults": max_results,
-                    "labelIds": "INBOX"
-                }
-                
-                # Add page token if we have one and not on first page
-                if page > 1 and page_token:
-                    query["pageToken"] = page_token
-                
-                response = await client.get(
-                    f"{self.api_base}/users/me/messages",
-                    headers=headers,
-                    params=query
-                )
-                
-                if response.status_code != 200:
-                    logger.error(f"Failed to get inbox: {response.text}")
-                    return []
-                
-                response_data = response.json()
-                message_ids = [msg["id"] for msg in response_data.get("messages", [])]
-                
-                # If no messages
-                if not message_ids:
+            # Calculate pagination
+            max_results = min(limit, 100)  # Gmail API max is 100
+            label = "INBOX"
+            
+            # Get message IDs first
+            query = {
+                "maxResults": max_results,
+                "labelIds": label
+            }
+            
+            # Gmail pages with opaque cursors, so look up the token for this page
+            if page > 1:
+                page_token = await self._list_page_token(label, page, max_results)
+                if not page_token:
                     return []
-                
-                # Get message details (batch request would be better for production)
-                messages = []
-                for msg_id in message_ids:
-                    message = await self.get_message(msg_id)
-                    if message:
-                        messages.append(message)
-                
-                return messages
-                
+                query["pageToken"] = page_token
+            
+            response = await self._request(
+                "GET",
+                f"{self.api_base}/users/me/messages",
+                params=query
+            )
+            
+            if response.status_code != 200:
+                logger.error(f"Failed to get inbox: {response.text}")
+                return []
+            
+            response_data = fast_json.loads(response.content)
+            message_ids = [msg["id"] for msg in response_data.get("messages", [])]
+            self._record_page_token(label, page, max_results, response_data.get("nextPageToken"))
+            
+            # If no messages
+            if not message_ids:
+                return []
+            
+            # Get message details in a single batch request
+            return await self._batch_get_messages(message_ids, full=full)
+            
         except Exception as e:
             logger.error(f"Error getting inbox: {str(e)}")
             return []
     
+    def _record_page_token(self, label: str, page: int, max_results: int,
+                           next_page_token: Optional[str]) -> None:
+        """
+        Remember the cursor for the page after the one just fetched.
+        
+        Args:
+            label: Label the listing is filtered by
+            page: Page number that was fetched (1-based)
+            max_results: Page size used for the listing
+            next_page_token: nextPageToken from the list response
+        """
+        key = (label, max_results)
+        if page == 1:
+            # Starting over, so drop cursors that may have gone stale
+            self._page_tokens[key] = {}
+        if next_page_token:
+            self._page_tokens.setdefault(key, {})[page + 1] = next_page_token
+    
+    async def _list_page_token(self, label: str, page: int, max_results: int) -> Optional[str]:
+        """
+        Get the pageToken for a listing page, walking forward if needed.
+        
+        Pages that were not reached sequentially are resolved by requesting
+        only nextPageToken for each intermediate page.
+        
+        Args:
+            label: Label the listing is filtered by
+            page: Page number to fetch (1-based, greater than 1)
+            max_results: Page size used for the listing
+            
+        Returns:
+            The page token, or None if the listing has no such page
+        """
+        tokens = self._page_tokens.setdefault((label, max_results), {})
+        if page in tokens:
+            return tokens[page]
+        
+        current = max((known for known in tokens if known < page), default=1)
+        page_token = tokens.get(current)
+        while current < page:
+            params = {
+                "maxResults": max_results,
+                "labelIds": label,
+                "fields": "nextPageToken"
+            }
+            if page_token:
+                params["pageToken"] = page_token
+            
+            response = await self._request(
+                "GET",
+                f"{self.api_base}/users/me/messages",
+                params=params
+            )
+            if response.status_code != 200:
+                logger.error(f"Failed to page through {label}: {response.text}")
+                return None
+            
+            page_token = fast_json.loads(response.content).get("nextPageToken")
+            if not page_token:
+                return None
+            current += 1
+            tokens[current] = page_token
+        
+        return page_token
+    
     async def get_message(self, message_id: str) -> Dict[str, Any]:
         """
         Get a specific message by ID.
@@ -182,84 +367,268 @@ class GmailProvider(MailProvider):
         Returns:
             Message data with headers and body
         """
-        if not self.credentials or not self.credentials.valid:
-            if not await self.authenticate():
-                return {}
+        if not await self._ensure_token():
+            return {}
+        
+        return await self._get_message(message_id, full=True)
+    
+    async def _get_message(self, message_id: str, full: bool) -> Dict[str, Any]:
+        """
+        Fetch and format a single message.
         
+        Args:
+            message_id: Gmail message ID
+            full: Whether to fetch the full payload or only list-view headers
+            
+        Returns:
+            Message data, or an empty dict on failure
+        """
         try:
-            async with httpx.AsyncClient() as client:
-                headers = {
-                    "Authorization": f"Bearer {self.credentials.token}"
-                }
-                
-                response = await client.get(
-                    f"{self.api_base}/users/me/messages/{message_id}",
-                    headers=headers,
-                    params={"format": "full"}
-                )
-                
-                if response.status_code != 200:
-                    logger.error(f"Failed to get message {message_id}: {response.text}")
-                    return {}
-                
-                raw_message = response.json()
-                
-                # Extract headers
-                headers_dict = {}
-                for header in raw_message["payload"].get("headers", []):
-                    headers_dict[header["name"].lower()] = header["value"]
-                
-                # Extract body
-                body = self._extract_body(raw_message["payload"])
-                
-                # Format message
-                message = {
-                    "id": message_id,
-                    "thread_id": raw_message.get("threadId", ""),
-                    "subject": headers_dict.get("subject", "(No subject)"),
-                    "from": headers_dict.get("from", ""),
-                    "to": headers_dict.get("to", ""),
-                    "date": headers_dict.get("date", ""),
-                    "body": body,
-                    "snippet": raw_message.get("snippet", ""),
-                    "labels": raw_message.get("labelIds", [])
-                }
-                
-                return message
-                
+            response = await self._request(
+                "GET",
+                f"{self.api_base}/users/me/messages/{message_id}",
+                params=self._message_params(full)
+            )
+            
+            if response.status_code != 200:
+                logger.error(f"Failed to get message {message_id}: {response.text}")
+                return {}
+            
+            return self._cache_message(self._format_message(fast_json.loads(response.content), full=full))
+            
         except Exception as e:
             logger.error(f"Error getting message {message_id}: {str(e)}")
             return {}
     
+    async def get_messages(self, message_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Get several messages by ID.
+        
+        Args:
+            message_ids: Gmail message IDs
+            
+        Returns:
+            Message data in the same order as message_ids
+        """
+        if not await self._ensure_token():
+            return []
+        
+        try:
+            return await self._batch_get_messages(message_ids, full=True)
+        except Exception as e:
+            logger.error(f"Error getting messages: {str(e)}")
+            return []
+    
+    def _message_params(self, full: bool) -> List[tuple]:
+        """Build the query parameters for a messages.get call."""
+        if full:
+            return [("format", "full")]
+        return [("format", "metadata")] + [("metadataHeaders", name) for name in self.METADATA_HEADERS]
+    
+    async def _batch_get_messages(self, message_ids: List[str], full: bool = True) -> List[Dict[str, Any]]:
+        """
+        Get several messages using the Gmail batch endpoint.
+        
+        Sub-requests are sent in chunks of BATCH_SIZE, so N messages cost
+        one round trip per chunk instead of one per message. Sub-requests
+        that were rate limited or hit a server error are fetched again
+        individually, with retries.
+        
+        Args:
+            message_ids: Gmail message IDs
+            full: Whether to fetch full payloads or only list-view headers
+            
+        Returns:
+            Formatted messages in the same order as message_ids
+        """
+        messages = []
+        query = urlencode(self._message_params(full))
+        
+        for start in range(0, len(message_ids), self.BATCH_SIZE):
+            chunk = message_ids[start:start + self.BATCH_SIZE]
+            boundary = f"batch_{uuid.uuid4().hex}"
+            
+            # Build multipart/mixed body, one application/http part per message
+            parts = []
+            for index, msg_id in enumerate(chunk):
+                parts.append(
+                    f"--{boundary}\r\n"
+                    f"Content-Type: application/http\r\n"
+                    f"Content-ID: <item-{index}>\r\n\r\n"
+                    f"GET /gmail/v1/users/me/messages/{msg_id}?{query}\r\n\r\n"
+                )
+            parts.append(f"--{boundary}--\r\n")
+            
+            try:
+                response = await self._request(
+                    "POST",
+                    self.BATCH_URL,
+                    headers={
+                        **self._auth_headers(),
+                        "Content-Type": f"multipart/mixed; boundary={boundary}"
+                    },
+                    content="".join(parts).encode("utf-8")
+                )
+            except httpx.HTTPError as e:
+                logger.warning(f"Batch endpoint unavailable, fetching messages individually: {str(e)}")
+                messages.extend(await self._gather_get_messages(chunk, full))
+                continue
+            
+            if response.status_code != 200:
+                logger.warning(f"Batch request failed, fetching messages individually: {response.text}")
+                messages.extend(await self._gather_get_messages(chunk, full))
+                continue
+            
+            raw_messages, retry_indexes = self._parse_batch_response(
+                response.headers.get("content-type", ""), response.content)
+            
+            retried = {}
+            if retry_indexes:
+                retry_ids = [chunk[index] for index in retry_indexes if index < len(chunk)]
+                logger.warning(f"Refetching {len(retry_ids)} rate-limited or failed batch sub-requests individually")
+                retried = {
+                    message.get("id"): message
+                    for message in await self._gather_get_messages(retry_ids, full)
+                }
+            
+            # Keep request order across batched and refetched messages
+            for index, msg_id in enumerate(chunk):
+                if index in raw_messages:
+                    messages.append(self._cache_message(self._format_message(raw_messages[index], full=full)))
+                elif msg_id in retried:
+                    messages.append(retried[msg_id])
+        
+        return messages
+    
+    async def _gather_get_messages(self, message_ids: List[str], full: bool) -> List[Dict[str, Any]]:
+        """
+        Get several messages with concurrent individual GETs.
+        
+        Used as a fallback when the batch endpoint is unavailable, and to
+        refetch batch sub-requests that failed transiently.
+        
+        Args:
+            message_ids: Gmail message IDs
+            full: Whether to fetch full payloads or only list-view headers
+            
+        Returns:
+            Formatted messages in the same order as message_ids
+        """
+        results = await asyncio.gather(
+            *[self._get_message(msg_id, full) for msg_id in message_ids],
+            return_exceptions=True
+        )
+        
+        messages = []
+        for msg_id, result in zip(message_ids, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error getting message {msg_id}: {str(result)}")
+            elif result:
+                messages.append(result)
+        
+        return messages
+    
+    def _parse_batch_response(self, content_type: str, content: bytes) -> Tuple[Dict[int, Dict[str, Any]], List[int]]:
+        """
+        Parse a multipart/mixed batch response into raw message resources.
+        
+        Args:
+            content_type: Content-Type header of the batch response
+            content: Raw response body
+            
+        Returns:
+            Tuple of the decoded JSON bodies of the successful sub-responses
+            by request index, and the request indexes of sub-requests that
+            were rate limited or hit a server error and are worth retrying
+        """
+        envelope = BytesParser().parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode("utf-8") + content)
+        
+        results = {}
+        retry_indexes = []
+        for position, part in enumerate(envelope.get_payload()):
+            payload = part.get_payload(decode=True) or b""
+            
+            # Each part is an embedded HTTP response: status line, headers, blank line, body
+            status_and_headers, _, body = payload.partition(b"\r\n\r\n")
+            status_line = status_and_headers.split(b"\r\n", 1)[0]
+            status_fields = status_line.split()
+            
+            # Content-IDs come back as <response-item-N>; use them to preserve order
+            content_id = part.get("Content-ID", "")
+            try:
+                index = int(content_id.strip("<>").rsplit("-", 1)[-1])
+            except ValueError:
+                index = position
+            
+            status = int(status_fields[1]) if len(status_fields) >= 2 and status_fields[1].isdigit() else 0
+            if status == 200:
+                results[index] = fast_json.loads(body)
+            elif status in RATE_LIMIT_STATUS_CODES or status in TRANSIENT_STATUS_CODES:
+                retry_indexes.append(index)
+            else:
+                logger.error(f"Batch sub-request failed: {status_line.decode('utf-8', 'replace')}")
+        
+        return results, sorted(retry_indexes)
+    
+    def _cache_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Store a parsed message in the LRU message cache and return it."""
+        message_id = message.get("id")
+        if message_id:
+            self._msg_cache[message_id] = message
+            self._msg_cache.move_to_end(message_id)
+            while len(self._msg_cache) > self.MESSAGE_CACHE_SIZE:
+                self._msg_cache.popitem(last=False)
+        return message
+    
+    def _format_message(self, raw_message: Dict[str, Any], full: bool = True) -> Dict[str, Any]:
+        """Convert a raw Gmail message resource into our message format."""
+        # Extract headers
+        headers_dict = {}
+        for header in raw_message["payload"].get("headers", []):
+            headers_dict[header["name"].lower()] = header["value"]
+        
+        # Extract body; metadata-format messages carry none, so list views
+        # fall back to the snippet rather than an empty body
+        snippet = raw_message.get("snippet", "")
+        body = self._extract_body(raw_message["payload"]) if full else snippet
+        
+        return {
+            "id": raw_message.get("id", ""),
+            "thread_id": raw_message.get("threadId", ""),
+            "subject": headers_dict.get("subject", "(No subject)"),
+            "from": headers_dict.get("from", ""),
+            "to": headers_dict.get("to", ""),
+            "date": headers_dict.get("date", ""),
+            "body": body,
+            "snippet": snippet,
+            "labels": raw_message.get("labelIds", [])
+        }
+    
     def _extract_body(self, payload: Dict[str, Any]) -> str:
         """Extract body text from message payload."""
-        # Check if this part has a body
-        if "body" in payload and "data" in payload["body"]:
-            data = payload["body"]["data"]
-            decoded_data = base64.urlsafe_b64decode(data).decode("utf-8")
-            return decoded_data
-        
-        # If this is multipart, check parts
-        if "parts" in payload:
-            for part in payload["parts"]:
-                mime_type = part.get("mimeType", "")
-                # Prefer HTML content
-                if mime_type == "text/html":
-                    if "body" in part and "data" in part["body"]:
-                        data = part["body"]["data"]
-                        return base64.urlsafe_b64decode(data).decode("utf-8")
-                
-                # Fall back to text/plain
-                if mime_type == "text/plain":
-                    if "body" in part and "data" in part["body"]:
-                        data = part["body"]["data"]
-                        return base64.urlsafe_b64decode(data).decode("utf-8")
-                
-                # Recursively check nested parts
-                if "parts" in part:
-                    body = self._extract_body(part)
-                    if body:
-                        return body
+        # Breadth-first walk that stops at the first text/html part and
+        # otherwise falls back to the first text/plain part seen on the way
+        top_data = payload.get("body", {}).get("data")
+        if top_data and not payload.get("parts"):
+            return _decode_body(top_data)
+        
+        queue = deque([payload])
+        fallback = None
+        while queue:
+            part = queue.popleft()
+            mime_type = part.get("mimeType", "")
+            data = part.get("body", {}).get("data")
+            
+            if data and mime_type == "text/html":
+                return _decode_body(data)
+            if data and fallback is None and (mime_type == "text/plain" or part is payload):
+                fallback = data
+            
+            queue.extend(part.get("parts") or ())
+        
+        if fallback:
+            return _decode_body(fallback)
         
         return "(No body content)"
     
@@ -281,48 +650,36 @@ class GmailProvider(MailProvider):
         Returns:
             True if successful, False otherwise
         """
-        if not self.credentials or not self.credentials.valid:
-            if not await self.authenticate():
-                return False
+        if not await self._ensure_token():
+            return False
         
         try:
             # Build email message
-            message = f"From: {self.email}\r\n"
-            message += f"To: {', '.join(to)}\r\n"
+            mime_headers = {
+                "To": ", ".join(to),
+                "Cc": ", ".join(cc) if cc else None,
+                "Bcc": ", ".join(bcc) if bcc else None,
+                "Subject": subject
+            }
+            encoded_message = _encode_message(self._build_message(mime_headers, body, content_type))
             
-            if cc:
-                message += f"Cc: {', '.join(cc)}\r\n"
+            body_data = {
+                "raw": encoded_message
+            }
             
-            message += f"Subject: {subject}\r\n"
-            message += f"Content-Type: {content_type}; charset=utf-8\r\n\r\n"
-            message += body
+            response = await self._request(
+                "POST",
+                f"{self.api_base}/users/me/messages/send",
+                json=body_data
+            )
             
-            # Encode as base64url
-            encoded_message = base64.urlsafe_b64encode(message.encode("utf-8")).decode("utf-8")
+            if response.status_code == 200:
+                logger.info(f"Message sent successfully")
+                return True
+            else:
+                logger.error(f"Failed to send message: {response.text}")
+                return False
             
-            async with httpx.AsyncClient() as client:
-                headers = {
-                    "Authorization": f"Bearer {self.credentials.token}",
-                    "Content-Type": "application/json"
-                }
-                
-                body_data = {
-                    "raw": encoded_message
-                }
-                
-                response = await client.post(
-                    f"{self.api_base}/users/me/messages/send",
-                    headers=headers,
-                    json=body_data
-                )
-                
-                if response.status_code == 200:
-                    logger.info(f"Message sent successfully")
-                    return True
-                else:
-                    logger.error(f"Failed to send message: {response.text}")
-                    return False
-                
         except Exception as e:
             logger.error(f"Error sending message: {str(e)}")
             return False
@@ -339,13 +696,12 @@ class GmailProvider(MailProvider):
         Returns:
             True if successful, False otherwise
         """
-        if not self.credentials or not self.credentials.valid:
-            if not await self.authenticate():
-                return False
+        if not await self._ensure_token():
+            return False
         
         try:
-            # Get original message to extract headers
-            original = await self.get_message(message_id)
+            # Get original message to extract headers, preferring the cached copy
+            original = self._msg_cache.get(message_id) or await self.get_message(message_id)
             if not original:
                 logger.error(f"Could not find original message {message_id}")
                 return False
@@ -355,112 +711,110 @@ class GmailProvider(MailProvider):
             to_address = self._extract_reply_address(original.get("from", ""))
             subject = original.get("subject", "")
             
-            if not subject.startswith("Re:"):
-                subject = f"Re: {subject}"
+            # Normalise any existing reply prefix to a single "Re: "
+            subject = f"Re: {_RE_PREFIX.sub('', subject, count=1)}"
             
             # Build reply message
-            message = f"From: {self.email}\r\n"
-            message += f"To: {to_address}\r\n"
-            message += f"Subject: {subject}\r\n"
-            message += f"In-Reply-To: {message_id}\r\n"
-            message += f"References: {message_id}\r\n"
-            message += f"Content-Type: {content_type}; charset=utf-8\r\n\r\n"
-            message += body
-            
-            # Encode as base64url
-            encoded_message = base64.urlsafe_b64encode(message.encode("utf-8")).decode("utf-8")
-            
-            async with httpx.AsyncClient() as client:
-                headers = {
-                    "Authorization": f"Bearer {self.credentials.token}",
-                    "Content-Type": "application/json"
-                }
-                
-                body_data = {
-                    "raw": encoded_message,
-                    "threadId": thread_id
-                }
-                
-                response = await client.post(
-                    f"{self.api_base}/users/me/messages/send",
-                    headers=headers,
-                    json=body_data
-                )
-                
-                if response.status_code == 200:
-                    logger.info(f"Reply sent successfully")
-                    return True
-                else:
-                    logger.error(f"Failed to send reply: {response.text}")
-                    return False
-                
+            mime_headers = {
+                "To": to_address,
+                "Subject": subject,
+                "In-Reply-To": message_id,
+                "References": message_id
+            }
+            encoded_message = _encode_message(self._build_message(mime_headers, body, content_type))
+            
+            body_data = {
+                "raw": encoded_message,
+                "threadId": thread_id
+            }
+            
+            response = await self._request(
+                "POST",
+                f"{self.api_base}/users/me/messages/send",
+                json=body_data
+            )
+            
+            if response.status_code == 200:
+                logger.info(f"Reply sent successfully")
+                return True
+            else:
+                logger.error(f"Failed to send reply: {response.text}")
+                return False
+            
         except Exception as e:
             logger.error(f"Error sending reply: {str(e)}")
             return False
     
+    def _build_message(self, headers: Dict[str, Optional[str]], body: str,
+                       content_type: str) -> EmailMessage:
+        """
+        Assemble a MIME message from the sender, the given headers and a body.
+        
+        Args:
+            headers: Header values by name; None values are skipped
+            body: Message body
+            content_type: Content type of body (text/plain or text/html)
+            
+        Returns:
+            The assembled message
+        """
+        message = EmailMessage()
+        if self.email:
+            message["From"] = self.email
+        for name, value in headers.items():
+            if value:
+                message[name] = value
+        message.set_content(body, subtype=content_type.split("/", 1)[-1])
+        return message
+    
     def _extract_reply_address(self, from_header: str) -> str:
         """Extract email address from From header."""
-        # Simple extraction, would need more robust parsing in production
-        if "<" in from_header and ">" in from_header:
-            # Format: "Name <email@example.com>"
-            start = from_header.find("<") + 1
-            end = from_header.find(">")
-            return from_header[start:end]
-        return from_header
+        # parseaddr handles quoted display names and angle-addr edge cases
+        return parseaddr(from_header)[1] or from_header
     
-    async def search_messages(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+    async def search_messages(self, query: str, limit: int = 20, full: bool = False) -> List[Dict[str, Any]]:
         """
         Search for messages using Gmail query syntax.
         
         Args:
             query: Gmail search query string
             limit: Maximum number of results
+            full: Whether to fetch full message bodies; by default the
+                body is the message snippet
             
         Returns:
             List of matching messages
         """
-        if not self.credentials or not self.credentials.valid:
-            if not await self.authenticate():
-                return []
+        if not await self._ensure_token():
+            return []
         
         try:
-            async with httpx.AsyncClient() as client:
-                headers = {
-                    "Authorization": f"Bearer {self.credentials.token}"
-                }
-                
-                # Get message IDs matching query
-                params = {
-                    "q": query,
-                    "maxResults": min(limit, 100)  # Gmail API max is 100
-                }
-                
-                response = await client.get(
-                    f"{self.api_base}/users/me/messages",
-                    headers=headers,
-                    params=params
-                )
-                
-                if response.status_code != 200:
-                    logger.error(f"Failed to search messages: {response.text}")
-                    return []
-                
-                response_data = response.json()
-                message_ids = [msg["id"] for msg in response_data.get("messages", [])]
-                
-                # If no messages match
-                if not message_ids:
-                    return []
-                
-                # Get message details
-                messages = []
-                for msg_id in message_ids:
-                    message = await self.get_message(msg_id)
-                    if message:
-                        messages.append(message)
-                
-                return messages
-                
+            # Get message IDs matching query
+            params = {
+                "q": query,
+                "maxResults": min(limit, 100)  # Gmail API max is 100
+            }
+            
+            response = await self._request(
+                "GET",
+                f"{self.api_base}/users/me/messages",
+                params=params
+            )
+            
+            if response.status_code != 200:
+                logger.error(f"Failed to search messages: {response.text}")
+                return []
+            
+            response_data = fast_json.loads(response.content)
+            message_ids = [msg["id"] for msg in response_data.get("messages", [])]
+            
+            # If no messages match
+            if not message_ids:
+                return []
+            
+            # Get message details in a single batch request
+            return await self._batch_get_messages(message_ids, full=full)
+            
         except Exception as e:
             logger.error(f"Error searching messages: {str(e)}")
             return []
@@ -472,37 +826,25 @@ class GmailProvider(MailProvider):
         Returns:
             List of label metadata
         """
-        if not self.credentials or not self.credentials.valid:
-            if not await self.authenticate():
-                return []
+        if not await self._ensure_token():
+            return []
         
         try:
-            async with httpx.AsyncClient() as client:
-                headers = {
-                    "Authorization": f"Bearer {self.credentials.token}"
-                }
-                
-                response = await client.get(
-                    f"{self.api_base}/users/me/labels",
-                    headers=headers
-                )
-                
-                if response.status_code != 200:
-                    logger.error(f"Failed to get labels: {response.text}")
-                    return []
-                
-                response_data = response.json()
-                labels = []
-                
-                for label in response_data.get("labels", []):
-                    labels.append({
-                        "id": label["id"],
-                        "name": label["name"],
-                        "type": label["type"]
-                    })
-                
-                return labels
-                
+            response = await self._request(
+                "GET",
+                f"{self.api_base}/users/me/labels"
+            )
+            
+            if response.status_code != 200:
+                logger.error(f"Failed to get labels: {response.text}")
+                return []
+            
+            response_data = fast_json.loads(response.content)
+            return [
+                {"id": label["id"], "name": label["name"], "type": label["type"]}
+                for label in response_data.get("labels") or ()
+            ]
+            
         except Exception as e:
             logger.error(f"Error getting labels: {str(e)}")
             return []
\ No newline at end of file
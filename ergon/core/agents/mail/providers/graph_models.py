@@ -0,0 +1,78 @@
+"""
+Microsoft Graph Response Models
+
+Pydantic models for the Graph mail resources used by the Outlook provider.
+Responses are parsed and validated in one pass with model_validate_json,
+and fields the provider does not use are ignored.
+"""
+
+from typing import List, Dict, Any, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class GraphModel(BaseModel):
+    """Base model for Graph resources."""
+    model_config = ConfigDict(extra="ignore", populate_by_name=True)
+
+
+class GraphEmailAddress(GraphModel):
+    """Model for a Graph emailAddress."""
+    address: Optional[str] = ""
+    name: Optional[str] = ""
+
+
+class GraphRecipient(GraphModel):
+    """Model for a Graph recipient."""
+    emailAddress: Optional[GraphEmailAddress] = None
+
+
+class GraphItemBody(GraphModel):
+    """Model for a Graph itemBody."""
+    contentType: str = "text"
+    content: Optional[str] = ""
+
+
+class GraphMessage(GraphModel):
+    """Model for a Graph message."""
+    id: str = ""
+    conversationId: Optional[str] = ""
+    subject: Optional[str] = "(No subject)"
+    from_: Optional[GraphRecipient] = Field(None, alias="from")
+    toRecipients: List[GraphRecipient] = []
+    ccRecipients: List[GraphRecipient] = []
+    receivedDateTime: Optional[str] = ""
+    body: Optional[GraphItemBody] = None
+    bodyPreview: Optional[str] = ""
+    hasAttachments: bool = False
+
+
+class GraphMessageList(GraphModel):
+    """Model for a page of Graph messages."""
+    value: List[GraphMessage] = []
+    next_link: Optional[str] = Field(None, alias="@odata.nextLink")
+
+
+class GraphMailFolder(GraphModel):
+    """Model for a Graph mailFolder."""
+    id: str = ""
+    displayName: Optional[str] = ""
+    totalItemCount: int = 0
+    unreadItemCount: int = 0
+
+
+class GraphMailFolderList(GraphModel):
+    """Model for a list of Graph mailFolders."""
+    value: List[GraphMailFolder] = []
+
+
+class GraphBatchItem(GraphModel):
+    """Model for one sub-response of a Graph $batch call."""
+    id: str = ""
+    status: int = 0
+    body: Optional[Dict[str, Any]] = None
+
+
+class GraphBatchResponse(GraphModel):
+    """Model for a Graph $batch response."""
+    responses: List[GraphBatchItem] = []
@@ -0,0 +1,121 @@
+"""
+HTTP helpers shared by the REST-based mail providers.
+
+This module implements bounded retries with exponential backoff that
+honour rate-limit responses from the Gmail and Microsoft Graph APIs.
+"""
+
+import random
+import asyncio
+import logging
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional
+
+import httpx
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Maximum number of retries after the first attempt
+MAX_RETRIES = 4
+
+# Upper bound for a single backoff delay, in seconds
+MAX_RETRY_DELAY = 60.0
+
+# The request was rejected before being processed, so any method may be retried
+RATE_LIMIT_STATUS_CODES = frozenset({429, 503})
+
+# Transient server errors, only retried for idempotent methods
+TRANSIENT_STATUS_CODES = frozenset({500, 502, 504})
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """
+    Read the delay requested by a Retry-After header.
+    
+    Args:
+        response: HTTP response
+        
+    Returns:
+        Delay in seconds, or None if the header is missing or invalid
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    
+    # Retry-After is either a number of seconds or an HTTP date
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter for the given retry attempt."""
+    return min(MAX_RETRY_DELAY, 2 ** attempt + random.random())
+
+
+async def request_with_retry(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    max_retries: int = MAX_RETRIES,
+    **kwargs: Any
+) -> httpx.Response:
+    """
+    Send an HTTP request, retrying rate-limited and transient failures.
+    
+    Args:
+        client: HTTP client to send the request with
+        method: HTTP method
+        url: Request URL
+        semaphore: Optional semaphore bounding concurrent requests
+        max_retries: Maximum number of retries after the first attempt
+        **kwargs: Extra arguments passed to client.request
+        
+    Returns:
+        The last HTTP response received
+        
+    Raises:
+        httpx.TransportError: If a connection error persists after all retries
+    """
+    method = method.upper()
+    idempotent = method in IDEMPOTENT_METHODS
+    
+    attempt = 0
+    while True:
+        try:
+            if semaphore is not None:
+                async with semaphore:
+                    response = await client.request(method, url, **kwargs)
+            else:
+                response = await client.request(method, url, **kwargs)
+        except httpx.TransportError as e:
+            if not idempotent or attempt >= max_retries:
+                raise
+            delay = _backoff_delay(attempt)
+            logger.warning(f"{method} {url} failed ({str(e)}), retrying in {delay:.1f}s")
+        else:
+            retryable = (
+                response.status_code in RATE_LIMIT_STATUS_CODES or
+                (idempotent and response.status_code in TRANSIENT_STATUS_CODES)
+            )
+            if not retryable or attempt >= max_retries:
+                return response
+            
+            retry_after = _retry_after(response)
+            delay = min(MAX_RETRY_DELAY, retry_after) if retry_after is not None else _backoff_delay(attempt)
+            logger.warning(f"{method} {url} returned {response.status_code}, retrying in {delay:.1f}s")
+        
+        await asyncio.sleep(delay)
+        attempt += 1
@@ -5,27 +5,83 @@ This module implements the MailProvider interface for Microsoft Outlook/Microsof
 """
 
 import os
-import json
+import asyncio
 import logging
 import webbrowser
 import secrets
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from urllib.parse import urlparse, parse_qs
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Optional, Tuple, Type, TypeVar, AsyncIterator
 
 import httpx
+from pydantic import ValidationError
 from msal import PublicClientApplication, SerializableTokenCache
 
+from ergon.utils import fast_json
 from ergon.utils.config.settings import settings
 from ergon.core.agents.mail.providers.base import MailProvider
-from ergon.utils.tekton_integration import get_component_url
+from ergon.core.agents.mail.providers.http import request_with_retry
+from ergon.core.agents.mail.providers.graph_models import (
+    GraphModel, GraphRecipient, GraphMessage, GraphMessageList,
+    GraphMailFolderList, GraphBatchResponse
+)
 
 # Configure logger
 logger = logging.getLogger(__name__)
 logger.setLevel(getattr(logging, settings.log_level.value))
 
+GraphModelT = TypeVar("GraphModelT", bound=GraphModel)
+
+# Graph fields requested for full messages and for list views
+_MESSAGE_FIELDS = "id,subject,from,toRecipients,ccRecipients,receivedDateTime,body,bodyPreview,conversationId"
+_SUMMARY_FIELDS = "id,subject,from,toRecipients,receivedDateTime,bodyPreview,hasAttachments"
+
+# Constant query parameters, shared read-only across calls
+_GET_MESSAGE_PARAMS = MappingProxyType({"$select": _MESSAGE_FIELDS})
+_LIST_PARAMS_BASE = MappingProxyType({
+    "$orderby": "receivedDateTime desc",
+    "$select": _SUMMARY_FIELDS
+})
+
+# Failures expected from talking to Graph: transport/HTTP errors and malformed payloads
+_GRAPH_ERRORS = (httpx.HTTPError, ValidationError)
+
+
+def _address(recipient: Optional[GraphRecipient]) -> str:
+    """Get the email address from a Graph recipient."""
+    email_address = recipient.emailAddress if recipient else None
+    return (email_address.address or "") if email_address else ""
+
+
+def _join_addresses(recipients: Optional[List[GraphRecipient]]) -> str:
+    """Format a Graph recipient list as a comma-separated address string."""
+    return ", ".join([_address(r) for r in recipients or ()])
+
+
+def _error_detail(error: Exception) -> str:
+    """Describe a Graph failure, including the response body for HTTP status errors."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return f"{error.response.status_code} {error.response.text}"
+    return str(error)
+
+
+def _recipients(addresses: Optional[List[str]]) -> List[Dict[str, Any]]:
+    """Build the Graph recipient list for a list of email addresses."""
+    return [{"emailAddress": {"address": address}} for address in addresses or ()]
+
 
 class OutlookProvider(MailProvider):
     """Microsoft Outlook/Microsoft 365 implementation of MailProvider."""
     
+    __slots__ = (
+        "client_id", "token_file", "redirect_uri", "app", "token_cache",
+        "access_token", "email", "_token_expires_at", "_client", "_auth_lock",
+        "_request_semaphore", "_headers", "_headers_token", "_response_cache"
+    )
+    
     # Microsoft Graph API scopes for mail
     SCOPES = [
         "offline_access",  # For refresh tokens
@@ -39,6 +95,37 @@ class OutlookProvider(MailProvider):
     GRAPH_API_ENDPOINT = "https://graph.microsoft.com/v1.0"
     AUTHORITY = "https://login.microsoftonline.com/common"
     
+    # Microsoft Graph accepts at most 20 sub-requests per $batch call
+    BATCH_SIZE = 20
+    
+    # Cap on concurrent API requests, matching the connection pool size
+    MAX_CONCURRENT_REQUESTS = 64
+    
+    # Seconds to wait for the user to finish the OAuth consent in the browser
+    AUTH_TIMEOUT = 300
+    
+    # Loopback redirect captured by the local sign-in listener; without a port
+    # a free one is picked, which the Microsoft identity platform accepts for
+    # localhost redirects of desktop apps
+    DEFAULT_REDIRECT_URI = "http://localhost/auth/outlook/callback"
+    
+    # Hosts the sign-in listener may bind, and the address used for each
+    LOOPBACK_HOSTS = MappingProxyType({"localhost": "127.0.0.1", "127.0.0.1": "127.0.0.1", "::1": "::1"})
+    
+    # Seconds before expiry at which the access token is renewed
+    TOKEN_REFRESH_MARGIN = 60
+    
+    # Largest page requested from list endpoints
+    PAGE_SIZE = 50
+    
+    # Seconds a cached GET response stays fresh, and how many are kept
+    CACHE_TTL = 60.0
+    RESPONSE_CACHE_SIZE = 256
+    
+    # Parsed token caches shared across instances, keyed by token file path
+    _token_caches: Dict[str, Tuple[int, SerializableTokenCache]] = {}
+    _token_cache_lock = threading.Lock()
+    
     def __init__(self, 
                  client_id: Optional[str] = None, 
                  token_file: Optional[str] = None,
@@ -49,27 +136,195 @@ class OutlookProvider(MailProvider):
         Args:
             client_id: Microsoft application client ID
             token_file: Path to store/retrieve tokens
-            redirect_uri: OAuth redirect URI
+            redirect_uri: OAuth redirect URI; must be a loopback http URI for
+                the sign-in listener to capture the redirect
         """
         self.client_id = client_id or settings.outlook_client_id
         self.token_file = token_file or os.path.join(
             settings.config_path, "outlook_token.json")
-        self.redirect_uri = redirect_uri or f"{get_component_url('ergon', '/auth/outlook/callback')}"
+        self.redirect_uri = redirect_uri or self.DEFAULT_REDIRECT_URI
         self.app = None
-        self.token_cache = SerializableTokenCache()
         self.access_token = None
+        self._token_expires_at: Optional[float] = None
         self.email = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._auth_lock = asyncio.Lock()
+        self._request_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        self._headers: Dict[str, str] = {}
+        self._headers_token: Optional[str] = None
+        self._response_cache: "OrderedDict[Tuple[str, Tuple], Tuple[float, GraphModel]]" = OrderedDict()
         
         # Create config directory if it doesn't exist
         os.makedirs(os.path.dirname(self.token_file), exist_ok=True)
         
         # Load token cache if exists
-        if os.path.exists(self.token_file):
+        self.token_cache = self._load_token_cache(self.token_file)
+    
+    @classmethod
+    def _load_token_cache(cls, token_file: str) -> SerializableTokenCache:
+        """
+        Get the MSAL token cache for a token file, parsing it only when it changed.
+        
+        Parsed caches are shared between providers using the same token file
+        and keyed on the file's modification time.
+        
+        Args:
+            token_file: Path to the serialized token cache
+            
+        Returns:
+            Token cache, empty if the file does not exist or cannot be read
+        """
+        try:
+            mtime = os.stat(token_file).st_mtime_ns
+        except OSError:
+            return SerializableTokenCache()
+        
+        with cls._token_cache_lock:
+            cached = cls._token_caches.get(token_file)
+            if cached and cached[0] == mtime:
+                return cached[1]
+            
+            token_cache = SerializableTokenCache()
             try:
-                with open(self.token_file, 'r') as f:
-                    self.token_cache.deserialize(f.read())
+                with open(token_file, 'r') as f:
+                    token_cache.deserialize(f.read())
             except Exception as e:
                 logger.error(f"Error loading token cache: {str(e)}")
+                return token_cache
+            
+            cls._token_caches[token_file] = (mtime, token_cache)
+            return token_cache
+    
+    @classmethod
+    def _save_token_cache(cls, token_file: str, token_cache: SerializableTokenCache) -> None:
+        """
+        Write a token cache to disk and keep the shared copy current.
+        
+        Args:
+            token_file: Path to the serialized token cache
+            token_cache: Token cache to write
+        """
+        with cls._token_cache_lock:
+            with open(token_file, 'w') as f:
+                f.write(token_cache.serialize())
+            token_cache.has_state_changed = False
+            cls._token_caches[token_file] = (os.stat(token_file).st_mtime_ns, token_cache)
+    
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                timeout=httpx.Timeout(30.0)
+            )
+        return self._client
+    
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request on the shared client with rate-limit aware retries.
+        
+        The cached auth headers are sent unless the caller passes its own.
+        """
+        client = await self._get_client()
+        kwargs.setdefault("headers", self._auth_headers())
+        return await request_with_retry(
+            client, method, url, semaphore=self._request_semaphore, **kwargs)
+    
+    def _auth_headers(self) -> Dict[str, str]:
+        """
+        Get the Graph request headers for the current access token.
+        
+        The dict is cached and only rebuilt when the token changes, so every
+        request for a given token shares the same object.
+        
+        Returns:
+            Headers carrying the bearer token and JSON content type
+        """
+        if self.access_token != self._headers_token:
+            self._headers = {
+                "Authorization": f"Bearer {self.access_token}",
+                "Content-Type": "application/json"
+            }
+            self._headers_token = self.access_token
+        return self._headers
+    
+    async def _get_model(self, url: str, model: Type[GraphModelT],
+                         params: Optional[Mapping[str, Any]] = None,
+                         ttl: Optional[float] = None) -> GraphModelT:
+        """
+        GET a Graph resource and parse it into a model, reusing recent responses.
+        
+        Successful responses are cached per URL and query parameters for ttl
+        seconds so repeated lookups within a session skip the round trip.
+        
+        Args:
+            url: Absolute Graph URL
+            model: Model to parse the response body into
+            params: Query parameters
+            ttl: Seconds a cached response stays fresh (CACHE_TTL by default)
+            
+        Returns:
+            Parsed response
+            
+        Raises:
+            httpx.HTTPError: If the request fails or returns an error status
+            ValidationError: If the response body does not match the model
+        """
+        ttl = self.CACHE_TTL if ttl is None else ttl
+        cache_key = (url, model.__name__, tuple(sorted((params or {}).items())))
+        
+        cached = self._response_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < ttl:
+            self._response_cache.move_to_end(cache_key)
+            return cached[1]
+        
+        response = await self._request("GET", url, params=params)
+        response.raise_for_status()
+        
+        data = model.model_validate_json(response.content)
+        self._response_cache[cache_key] = (time.monotonic(), data)
+        self._response_cache.move_to_end(cache_key)
+        if len(self._response_cache) > self.RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+        return data
+    
+    def clear_cache(self) -> None:
+        """Drop all cached GET responses."""
+        self._response_cache.clear()
+    
+    async def close(self) -> None:
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def _ensure_token(self) -> bool:
+        """
+        Make sure an access token is available.
+        
+        Concurrent callers share a single token acquisition: the first one
+        authenticates while the rest wait on the lock and reuse its token.
+        Tokens are renewed shortly before they expire rather than after a
+        request fails with 401.
+        
+        Returns:
+            True if an access token is available, False otherwise
+        """
+        if self._token_is_fresh():
+            return True
+        
+        async with self._auth_lock:
+            # Another coroutine may have authenticated while we were waiting
+            if self._token_is_fresh():
+                return True
+            return await self.authenticate()
+    
+    def _token_is_fresh(self) -> bool:
+        """Check whether the access token exists and is not about to expire."""
+        if not self.access_token:
+            return False
+        # Tokens set without an expiry (e.g. injected by callers) are trusted as-is
+        return self._token_expires_at is None or time.monotonic() < self._token_expires_at
     
     async def authenticate(self) -> bool:
         """
@@ -79,21 +334,31 @@ class OutlookProvider(MailProvider):
             True if authentication successful, False otherwise
         """
         try:
-            # Initialize the MSAL app
-            self.app = PublicClientApplication(
-                client_id=self.client_id,
-                authority=self.AUTHORITY,
-                token_cache=self.token_cache
-            )
+            # MSAL performs blocking network I/O, so run it in the default executor
+            loop = asyncio.get_event_loop()
+            
+            # Initialize the MSAL app once (authority discovery hits the network)
+            if self.app is None:
+                self.app = await loop.run_in_executor(
+                    None,
+                    lambda: PublicClientApplication(
+                        client_id=self.client_id,
+                        authority=self.AUTHORITY,
+                        token_cache=self.token_cache
+                    )
+                )
             
             # Check if we already have accounts in the cache
             accounts = self.app.get_accounts()
             
             if accounts:
                 # Use the first account to acquire a token silently
-                result = self.app.acquire_token_silent(
-                    scopes=self.SCOPES,
-                    account=accounts[0]
+                result = await loop.run_in_executor(
+                    None,
+                    lambda: self.app.acquire_token_silent(
+                        scopes=self.SCOPES,
+                        account=accounts[0]
+                    )
                 )
             else:
                 # No accounts in cache, need interactive login
@@ -102,10 +367,14 @@ class OutlookProvider(MailProvider):
             # Check if we have a valid token
             if result and "access_token" in result:
                 self.access_token = result["access_token"]
+                if "expires_in" in result:
+                    self._token_expires_at = (
+                        time.monotonic() + int(result["expires_in"]) - self.TOKEN_REFRESH_MARGIN)
                 
-                # Save the token cache
-                with open(self.token_file, 'w') as f:
-                    f.write(self.token_cache.serialize())
+                # Save the token cache, but only when MSAL actually changed it
+                if self.token_cache.has_state_changed:
+                    await loop.run_in_executor(
+                        None, self._save_token_cache, self.token_file, self.token_cache)
                 
                 # Get user email address
                 await self._get_user_profile()
@@ -121,7 +390,10 @@ class OutlookProvider(MailProvider):
     
     async def _interactive_login(self) -> Dict[str, Any]:
         """
-        Perform interactive login using the device code flow.
+        Perform interactive login using the authorization code flow.
+        
+        A local listener on the redirect URI captures the authorization code,
+        so the event loop keeps running while the user signs in.
         
         Returns:
             Authentication result
@@ -129,10 +401,18 @@ class OutlookProvider(MailProvider):
         # Generate a random state for CSRF protection
         state = secrets.token_urlsafe(16)
         
+        # Start listening for the redirect before sending the user to the browser
+        redirect_uri = self.redirect_uri
+        try:
+            auth_code_future, server, redirect_uri = await self._start_redirect_listener(state)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not listen on {self.redirect_uri}: {str(e)}")
+            auth_code_future, server = None, None
+        
         # Get the authorization URL
         auth_url = self.app.get_authorization_request_url(
             scopes=self.SCOPES,
-            redirect_uri=self.redirect_uri,
+            redirect_uri=redirect_uri,
             state=state
         )
         
@@ -140,48 +420,129 @@ class OutlookProvider(MailProvider):
         print(f"Please authorize the application in your browser...")
         webbrowser.open(auth_url)
         
-        # Create a simple local HTTP server to handle the authorization response
-        auth_code = None
-        auth_state = None
+        loop = asyncio.get_event_loop()
+        if server is not None:
+            try:
+                auth_code = await asyncio.wait_for(auth_code_future, timeout=self.AUTH_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.error("Timed out waiting for the Outlook authorization redirect")
+                return {}
+            finally:
+                server.close()
+                await server.wait_closed()
+        else:
+            # No local listener, so ask for the code without blocking the event loop
+            print("\nAfter authentication, copy the authorization code from the URL.")
+            print("Look for 'code=' parameter in the redirected URL.")
+            auth_code = await loop.run_in_executor(
+                None, input, "Enter the authorization code: ")
         
-        # Set up a mock server to handle redirect
-        # In a real implementation, we would need a proper local server
-        # For demonstration, use a simpler approach with manual code input
-        print("\nAfter authentication, copy the authorization code from the URL.")
-        print("Look for 'code=' parameter in the redirected URL.")
-        auth_code = input("Enter the authorization code: ")
+        if not auth_code:
+            return {}
         
         # Acquire token with the authorization code
-        result = self.app.acquire_token_by_authorization_code(
-            code=auth_code,
-            scopes=self.SCOPES,
-            redirect_uri=self.redirect_uri
+        result = await loop.run_in_executor(
+            None,
+            lambda: self.app.acquire_token_by_authorization_code(
+                code=auth_code,
+                scopes=self.SCOPES,
+                redirect_uri=redirect_uri
+            )
         )
         
         return result
     
+    async def _start_redirect_listener(self, state: str):
+        """
+        Start a one-shot local HTTP server for the OAuth redirect.
+        
+        Args:
+            state: Expected OAuth state value
+            
+        Returns:
+            Tuple of (future resolving to the authorization code, server,
+            redirect URI including the port the server listens on)
+            
+        Raises:
+            ValueError: If the redirect URI is not a loopback http URI
+            OSError: If the listener cannot bind its port
+        """
+        redirect = urlparse(self.redirect_uri)
+        bind_host = self.LOOPBACK_HOSTS.get(redirect.hostname or "")
+        if redirect.scheme != "http" or bind_host is None:
+            raise ValueError("not a loopback http redirect URI")
+        callback_path = redirect.path or "/"
+        
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        
+        async def handle_redirect(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            try:
+                request_line = (await reader.readline()).decode("latin-1").split()
+                target = urlparse(request_line[1]) if len(request_line) > 1 else None
+                if target is None or target.path != callback_path:
+                    # Only the callback path carries the redirect; ignore favicons and the like
+                    writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                    await writer.drain()
+                    return
+                
+                query = parse_qs(target.query)
+                code = query.get("code", [None])[0]
+                error = query.get("error", [None])[0]
+                
+                if code and query.get("state", [None])[0] != state:
+                    # Reject redirects that do not carry our state (CSRF)
+                    logger.warning("Ignoring Outlook redirect with mismatched state")
+                    code = None
+                    message = "Authentication failed: invalid state."
+                elif code:
+                    message = "Authentication complete. You can close this window."
+                else:
+                    message = f"Authentication failed: {error}." if error else "Waiting for authorization."
+                
+                body = f"<html><body><p>{message}</p></body></html>".encode("utf-8")
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    b"Content-Type: text/html; charset=utf-8\r\n"
+                    b"Content-Length: " + str(len(body)).encode("ascii") + b"\r\n"
+                    b"Connection: close\r\n\r\n" + body
+                )
+                await writer.drain()
+                
+                if not future.done():
+                    if code:
+                        future.set_result(code)
+                    elif error:
+                        logger.error(f"Outlook authorization failed: {error}")
+                        future.set_result(None)
+            except Exception as e:
+                logger.error(f"Error handling Outlook redirect: {str(e)}")
+            finally:
+                writer.close()
+        
+        server = await asyncio.start_server(handle_redirect, host=bind_host, port=redirect.port or 0)
+        
+        # Advertise the port actually bound, which differs when none was configured
+        port = server.sockets[0].getsockname()[1]
+        host = f"[{redirect.hostname}]" if ":" in redirect.hostname else redirect.hostname
+        return future, server, redirect._replace(netloc=f"{host}:{port}").geturl()
+    
     async def _get_user_profile(self) -> None:
         """Get the user's profile information."""
         if not self.access_token:
             return
         
-        async with httpx.AsyncClient() as client:
-            headers = {
-                "Authorization": f"Bearer {self.access_token}",
-                "Content-Type": "application/json"
-            }
-            
-            response = await client.get(
-                f"{self.GRAPH_API_ENDPOINT}/me",
-                headers=headers
-            )
-            
-            if response.status_code == 200:
-                profile = response.json()
-                self.email = profile.get("mail") or profile.get("userPrincipalName")
-                logger.info(f"Authenticated as {self.email}")
-            else:
-                logger.error(f"Failed to get user profile: {response.text}")
+        response = await self._request(
+            "GET",
+            f"{self.GRAPH_API_ENDPOINT}/me"
+        )
+        
+        if response.status_code == 200:
+            profile = fast_json.loads(response.content)
+            self.email = profile.get("mail") or profile.get("userPrincipalName")
+            logger.info(f"Authenticated as {self.email}")
+        else:
+            logger.error(f"Failed to get user profile: {response.text}")
     
     async def get_inbox(self, limit: int = 20, page: int = 1) -> List[Dict[str, Any]]:
         """
@@ -194,56 +555,27 @@ class OutlookProvider(MailProvider):
         Returns:
             List of message metadata
         """
-        if not self.access_token:
-            if not await self.authenticate():
-                return []
+        if not await self._ensure_token():
+            return []
         
         try:
-            async with httpx.AsyncClient() as client:
-                headers = {
-                    "Authorization": f"Bearer {self.access_token}",
-                    "Content-Type": "application/json"
-                }
-                
-                # Calculate skip for pagination
-                skip = (page - 1) * limit
-                
-                # Get messages from inbox
-                response = await client.get(
-                    f"{self.GRAPH_API_ENDPOINT}/me/mailFolders/inbox/messages",
-                    headers=headers,
-                    params={
-                        "$top": limit,
-                        "$skip": skip,
-                        "$orderby": "receivedDateTime desc",
-                        "$select": "id,subject,from,toRecipients,receivedDateTime,bodyPreview"
-                    }
-                )
-                
-                if response.status_code != 200:
-                    logger.error(f"Failed to get inbox: {response.text}")
-                    return []
-                
-                data = response.json()
-                messages = []
-                
-                for msg_data in data.get("value", []):
-                    # Format the message data
-                    messages.append({
-                        "id": msg_data.get("id", ""),
-                        "subject": msg_data.get("subject", "(No subject)"),
-                        "from": msg_data.get("from", {}).get("emailAddress", {}).get("address", ""),
-                        "to": ", ".join([r.get("emailAddress", {}).get("address", "") 
-                                         for r in msg_data.get("toRecipients", [])]),
-                        "date": msg_data.get("receivedDateTime", ""),
-                        "snippet": msg_data.get("bodyPreview", ""),
-                        "has_attachments": msg_data.get("hasAttachments", False)
-                    })
-                
-                return messages
-                
-        except Exception as e:
-            logger.error(f"Error getting inbox: {str(e)}")
+            # Calculate skip for pagination
+            skip = (page - 1) * limit
+            
+            # Get messages from inbox
+            response = await self._request(
+                "GET",
+                f"{self.GRAPH_API_ENDPOINT}/me/mailFolders/inbox/messages",
+                params={**_LIST_PARAMS_BASE, "$top": limit, "$skip": skip}
+            )
+            
+            response.raise_for_status()
+            
+            data = GraphMessageList.model_validate_json(response.content)
+            return [self._format_summary(msg) for msg in data.value]
+            
+        except _GRAPH_ERRORS as e:
+            logger.error(f"Failed to get inbox: {_error_detail(e)}")
             return []
     
     async def get_message(self, message_id: str) -> Dict[str, Any]:
@@ -256,54 +588,132 @@ class OutlookProvider(MailProvider):
         Returns:
             Message data
         """
-        if not self.access_token:
-            if not await self.authenticate():
-                return {}
+        if not await self._ensure_token():
+            return {}
         
         try:
-            async with httpx.AsyncClient() as client:
-                headers = {
-                    "Authorization": f"Bearer {self.access_token}",
-                    "Content-Type": "application/json"
-                }
-                
-                # Get the message with full content
-                response = await client.get(
-                    f"{self.GRAPH_API_ENDPOINT}/me/messages/{message_id}",
-                    headers=headers,
-                    params={
-                        "$select": "id,subject,from,toRecipients,ccRecipients,receivedDateTime,body,bodyPreview,conversationId"
-                    }
-                )
-                
-                if response.status_code != 200:
-                    logger.error(f"Failed to get message {message_id}: {response.text}")
-                    return {}
-                
-                msg_data = response.json()
-                
-                # Format the message
-                message = {
-                    "id": msg_data.get("id", ""),
-                    "thread_id": msg_data.get("conversationId", ""),
-                    "subject": msg_data.get("subject", "(No subject)"),
-                    "from": msg_data.get("from", {}).get("emailAddress", {}).get("address", ""),
-                    "to": ", ".join([r.get("emailAddress", {}).get("address", "") 
-                                     for r in msg_data.get("toRecipients", [])]),
-                    "cc": ", ".join([r.get("emailAddress", {}).get("address", "") 
-                                     for r in msg_data.get("ccRecipients", [])]),
-                    "date": msg_data.get("receivedDateTime", ""),
-                    "body": msg_data.get("body", {}).get("content", ""),
-                    "content_type": msg_data.get("body", {}).get("contentType", "text"),
-                    "snippet": msg_data.get("bodyPreview", "")
-                }
-                
-                return message
-                
-        except Exception as e:
-            logger.error(f"Error getting message {message_id}: {str(e)}")
+            # Get the message with full content
+            msg = await self._get_model(
+                f"{self.GRAPH_API_ENDPOINT}/me/messages/{message_id}",
+                GraphMessage,
+                params=_GET_MESSAGE_PARAMS
+            )
+            
+            return self._format_message(msg)
+            
+        except _GRAPH_ERRORS as e:
+            logger.error(f"Failed to get message {message_id}: {_error_detail(e)}")
             return {}
     
+    async def get_messages(self, message_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Get several messages by ID using the Microsoft Graph $batch endpoint.
+        
+        Args:
+            message_ids: Message IDs
+            
+        Returns:
+            Message data in the same order as message_ids
+        """
+        if not await self._ensure_token():
+            return []
+        
+        try:
+            return await self._batch_get_messages(message_ids)
+        except _GRAPH_ERRORS as e:
+            logger.error(f"Failed to get messages: {_error_detail(e)}")
+            return []
+    
+    async def _batch_get_messages(self, message_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch messages in chunks of BATCH_SIZE, sending the $batch requests concurrently.
+        
+        Args:
+            message_ids: Message IDs
+            
+        Returns:
+            Formatted messages in the same order as message_ids
+        """
+        chunks = [
+            message_ids[start:start + self.BATCH_SIZE]
+            for start in range(0, len(message_ids), self.BATCH_SIZE)
+        ]
+        results = await asyncio.gather(*(self._batch_get_chunk(chunk) for chunk in chunks))
+        return [message for chunk_messages in results for message in chunk_messages]
+    
+    async def _batch_get_chunk(self, chunk: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch up to BATCH_SIZE messages with a single $batch request.
+        
+        Args:
+            chunk: Message IDs
+            
+        Returns:
+            Formatted messages in the same order as chunk
+        """
+        batch = {
+            "requests": [
+                {
+                    "id": str(index),
+                    "method": "GET",
+                    "url": f"/me/messages/{msg_id}?$select={_MESSAGE_FIELDS}"
+                }
+                for index, msg_id in enumerate(chunk)
+            ]
+        }
+        
+        response = await self._request(
+            "POST",
+            f"{self.GRAPH_API_ENDPOINT}/$batch",
+            content=fast_json.dumps_bytes(batch)
+        )
+        
+        if response.status_code != 200:
+            logger.error(f"Failed to batch get messages: {response.text}")
+            return []
+        
+        # Responses may come back in any order; restore request order by id
+        responses = {
+            item.id: item
+            for item in GraphBatchResponse.model_validate_json(response.content).responses
+        }
+        messages = []
+        for index, msg_id in enumerate(chunk):
+            item = responses.get(str(index))
+            if item is None or item.status != 200:
+                logger.error(f"Failed to get message {msg_id} in batch: {item}")
+                continue
+            messages.append(self._format_message(GraphMessage.model_validate(item.body or {})))
+        
+        return messages
+    
+    def _format_summary(self, msg: GraphMessage) -> Dict[str, Any]:
+        """Convert a Microsoft Graph message into our list-view message format."""
+        return {
+            "id": msg.id,
+            "subject": msg.subject,
+            "from": _address(msg.from_),
+            "to": _join_addresses(msg.toRecipients),
+            "date": msg.receivedDateTime,
+            "snippet": msg.bodyPreview,
+            "has_attachments": msg.hasAttachments
+        }
+    
+    def _format_message(self, msg: GraphMessage) -> Dict[str, Any]:
+        """Convert a Microsoft Graph message into our message format."""
+        return {
+            "id": msg.id,
+            "thread_id": msg.conversationId,
+            "subject": msg.subject,
+            "from": _address(msg.from_),
+            "to": _join_addresses(msg.toRecipients),
+            "cc": _join_addresses(msg.ccRecipients),
+            "date": msg.receivedDateTime,
+            "body": msg.body.content if msg.body else "",
+            "content_type": msg.body.contentType if msg.body else "text",
+            "snippet": msg.bodyPreview
+        }
+    
     async def send_message(self, to: List[str], subject: str, body: str, 
                            cc: Optional[List[str]] = None,
                            bcc: Optional[List[str]] = None) -> bool:
@@ -320,16 +730,10 @@ class OutlookProvider(MailProvider):
         Returns:
             True if successful, False otherwise
         """
-        if not self.access_token:
-            if not await self.authenticate():
-                return False
+        if not await self._ensure_token():
+            return False
         
         try:
-            # Format recipients
-            to_recipients = [{"emailAddress": {"address": email}} for email in to]
-            cc_recipients = [{"emailAddress": {"address": email}} for email in cc] if cc else []
-            bcc_recipients = [{"emailAddress": {"address": email}} for email in bcc] if bcc else []
-            
             # Create message payload
             message = {
                 "message": {
@@ -338,34 +742,28 @@ class OutlookProvider(MailProvider):
                         "contentType": "text",
                         "content": body
                     },
-                    "toRecipients": to_recipients,
-                    "ccRecipients": cc_recipients,
-                    "bccRecipients": bcc_recipients
+                    "toRecipients": _recipients(to),
+                    "ccRecipients": _recipients(cc),
+                    "bccRecipients": _recipients(bcc)
                 }
             }
             
-            async with httpx.AsyncClient() as client:
-                headers = {
-                    "Authorization": f"Bearer {self.access_token}",
-                    "Content-Type": "application/json"
-                }
-                
-                # Send the message
-                response = await client.post(
-                    f"{self.GRAPH_API_ENDPOINT}/me/sendMail",
-                    headers=headers,
-                    json=message
-                )
-                
-                if response.status_code in (202, 204):  # Success codes for sendMail
-                    logger.info("Message sent successfully")
-                    return True
-                else:
-                    logger.error(f"Failed to send message: {response.text}")
-                    return False
-                
-        except Exception as e:
-            logger.error(f"Error sending message: {str(e)}")
+            # Send the message, serialized up front (headers carry the JSON content type)
+            response = await self._request(
+                "POST",
+                f"{self.GRAPH_API_ENDPOINT}/me/sendMail",
+                content=fast_json.dumps_bytes(message)
+            )
+            
+            response.raise_for_status()
+            
+            logger.info("Message sent successfully")
+            # Sent items and folder counts changed, so cached views are stale
+            self.clear_cache()
+            return True
+            
+        except _GRAPH_ERRORS as e:
+            logger.error(f"Failed to send message: {_error_detail(e)}")
             return False
     
     async def reply_to_message(self, message_id: str, body: str) -> bool:
@@ -379,17 +777,10 @@ class OutlookProvider(MailProvider):
         Returns:
             True if successful, False otherwise
         """
-        if not self.access_token:
-            if not await self.authenticate():
-                return False
+        if not await self._ensure_token():
+            return False
         
         try:
-            # Get the original message first to extract necessary data
-            original = await self.get_message(message_id)
-            if not original:
-                logger.error(f"Could not find original message {message_id}")
-                return False
-            
             # Create reply payload
             reply = {
                 "message": {
@@ -400,28 +791,26 @@ class OutlookProvider(MailProvider):
                 }
             }
             
-            async with httpx.AsyncClient() as client:
-                headers = {
-                    "Authorization": f"Bearer {self.access_token}",
-                    "Content-Type": "application/json"
-                }
-                
-                # Create a reply
-                response = await client.post(
-                    f"{self.GRAPH_API_ENDPOINT}/me/messages/{message_id}/reply",
-                    headers=headers,
-                    json=reply
-                )
-                
-                if response.status_code in (202, 204):  # Success codes for reply
-                    logger.info("Reply sent successfully")
-                    return True
-                else:
-                    logger.error(f"Failed to send reply: {response.text}")
-                    return False
-                
-        except Exception as e:
-            logger.error(f"Error sending reply: {str(e)}")
+            # Create a reply
+            response = await self._request(
+                "POST",
+                f"{self.GRAPH_API_ENDPOINT}/me/messages/{message_id}/reply",
+                content=fast_json.dumps_bytes(reply)
+            )
+            
+            # Graph answers 404 for unknown ids, so no existence prefetch is needed
+            if response.status_code == 404:
+                logger.error(f"Could not find original message {message_id}")
+                return False
+            response.raise_for_status()
+            
+            logger.info("Reply sent successfully")
+            # Sent items and folder counts changed, so cached views are stale
+            self.clear_cache()
+            return True
+            
+        except _GRAPH_ERRORS as e:
+            logger.error(f"Failed to send reply: {_error_detail(e)}")
             return False
     
     async def search_messages(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
@@ -435,55 +824,54 @@ class OutlookProvider(MailProvider):
         Returns:
             List of matching messages
         """
-        if not self.access_token:
-            if not await self.authenticate():
-                return []
+        if not await self._ensure_token():
+            return []
         
         try:
-            async with httpx.AsyncClient() as client:
-                headers = {
-                    "Authorization": f"Bearer {self.access_token}",
-                    "Content-Type": "application/json"
-                }
-                
-                # Search messages using Microsoft Graph search syntax
-                # https://docs.microsoft.com/en-us/graph/search-query-parameter
-                response = await client.get(
-                    f"{self.GRAPH_API_ENDPOINT}/me/messages",
-                    headers=headers,
-                    params={
-                        "$search": f'"{query}"',
-                        "$top": limit,
-                        "$orderby": "receivedDateTime desc",
-                        "$select": "id,subject,from,toRecipients,receivedDateTime,bodyPreview"
-                    }
-                )
-                
-                if response.status_code != 200:
-                    logger.error(f"Failed to search messages: {response.text}")
-                    return []
-                
-                data = response.json()
-                messages = []
-                
-                for msg_data in data.get("value", []):
-                    # Format the message data
-                    messages.append({
-                        "id": msg_data.get("id", ""),
-                        "subject": msg_data.get("subject", "(No subject)"),
-                        "from": msg_data.get("from", {}).get("emailAddress", {}).get("address", ""),
-                        "to": ", ".join([r.get("emailAddress", {}).get("address", "") 
-                                         for r in msg_data.get("toRecipients", [])]),
-                        "date": msg_data.get("receivedDateTime", ""),
-                        "snippet": msg_data.get("bodyPreview", "")
-                    })
-                
-                return messages
-                
-        except Exception as e:
-            logger.error(f"Error searching messages: {str(e)}")
+            return [msg async for msg in self.iter_search_messages(query, limit)]
+            
+        except _GRAPH_ERRORS as e:
+            logger.error(f"Failed to search messages: {_error_detail(e)}")
             return []
     
+    async def iter_search_messages(self, query: str, limit: int = 20) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Search for messages, yielding results one page at a time.
+        
+        Pages are followed through @odata.nextLink, so only the current page
+        is held in memory and the first results arrive after one round trip.
+        
+        Args:
+            query: Search query
+            limit: Maximum number of results
+            
+        Yields:
+            Matching messages
+            
+        Raises:
+            httpx.HTTPError: If a page request fails
+        """
+        if not await self._ensure_token():
+            return
+        
+        # Search messages using Microsoft Graph search syntax
+        # https://docs.microsoft.com/en-us/graph/search-query-parameter
+        url = f"{self.GRAPH_API_ENDPOINT}/me/messages"
+        params = {**_LIST_PARAMS_BASE, "$search": f'"{query}"', "$top": min(limit, self.PAGE_SIZE)}
+        
+        yielded = 0
+        while url and yielded < limit:
+            data = await self._get_model(url, GraphMessageList, params=params)
+            
+            for msg in data.value:
+                yield self._format_summary(msg)
+                yielded += 1
+                if yielded >= limit:
+                    return
+            
+            # The next link already carries every query parameter
+            url, params = data.next_link, None
+    
     async def get_folders(self) -> List[Dict[str, Any]]:
         """
         Get mail folders.
@@ -491,40 +879,24 @@ class OutlookProvider(MailProvider):
         Returns:
             List of folder metadata
         """
-        if not self.access_token:
-            if not await self.authenticate():
-                return []
+        if not await self._ensure_token():
+            return []
         
         try:
-            async with httpx.AsyncClient() as client:
-                headers = {
-                    "Authorization": f"Bearer {self.access_token}",
-                    "Content-Type": "application/json"
+            # Get mail folders
+            data = await self._get_model(
+                f"{self.GRAPH_API_ENDPOINT}/me/mailFolders", GraphMailFolderList)
+            
+            return [
+                {
+                    "id": folder.id,
+                    "name": folder.displayName,
+                    "total_items": folder.totalItemCount,
+                    "unread_items": folder.unreadItemCount
                 }
-                
-                # Get mail folders
-                response = await client.get(
-                    f"{self.GRAPH_API_ENDPOINT}/me/mailFolders",
-                    headers=headers
-                )
-                
-                if response.status_code != 200:
-                    logger.error(f"Failed to get folders: {response.text}")
-                    return []
-                
-                data = response.json()
-                folders = []
-                
-                for folder_data in data.get("value", []):
-                    folders.append({
-                        "id": folder_data.get("id", ""),
-                        "name": folder_data.get("displayName", ""),
-                        "total_items": folder_data.get("totalItemCount", 0),
-                        "unread_items": folder_data.get("unreadItemCount", 0)
-                    })
-                
-                return folders
-                
-        except Exception as e:
-            logger.error(f"Error getting folders: {str(e)}")
+                for folder in data.value
+            ]
+            
+        except _GRAPH_ERRORS as e:
+            logger.error(f"Failed to get folders: {_error_detail(e)}")
             return []
\ No newline at end of file
@@ -12,6 +12,7 @@ import json
 from pathlib import Path
 import webbrowser
 import asyncio
+import weakref
 
 from ergon.utils.config.settings import settings
 from ergon.core.agents.mail.providers import get_mail_provider, MailProvider
@@ -294,14 +295,43 @@ class MailService:
         except Exception as e:
             logger.error(f"Error getting folders: {str(e)}")
             return []
+    
+    async def close(self) -> None:
+        """Release the provider's pooled HTTP connections."""
+        if self.provider:
+            await self.provider.close()
+
 
+# Mail services of each event loop, keyed by provider type, with the
+# current service under None. Providers hold HTTP clients, locks and
+# semaphores bound to the loop that first used them, so loops never share them
+_mail_services: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Optional[str], MailService]]" = weakref.WeakKeyDictionary()
 
-# Singleton instance
-_mail_service_instance = None
+def _loop_mail_services() -> Dict[Optional[str], MailService]:
+    """
+    Get the mail services cached for the running event loop.
+    
+    Services of closed loops are dropped when a new loop asks for its first
+    service. Without a running loop nothing is cached.
+    
+    Returns:
+        Mail services by provider type, with the current one under None
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return {}
+    
+    services = _mail_services.get(loop)
+    if services is None:
+        for closed_loop in [other for other in _mail_services if other.is_closed()]:
+            del _mail_services[closed_loop]
+        services = _mail_services[loop] = {}
+    return services
 
 def get_mail_service(provider_type: str = None) -> MailService:
     """
-    Get the mail service singleton instance.
+    Get the mail service instance for the running event loop.
     
     Args:
         provider_type: Optional provider type to override default
@@ -309,9 +339,11 @@ def get_mail_service(provider_type: str = None) -> MailService:
     Returns:
         Mail service instance
     """
-    global _mail_service_instance
+    services = _loop_mail_services()
+    current = services.get(None)
     
-    if _mail_service_instance is None or provider_type is not None:
+    if current is None or (
+            provider_type is not None and provider_type != current.provider_type):
         # Load config to determine default provider if not specified
         config_path = os.path.join(settings.config_path, "mail", "config.json")
         
@@ -324,10 +356,12 @@ def get_mail_service(provider_type: str = None) -> MailService:
                 provider_type = "gmail"  # Fallback to Gmail
         elif provider_type is None:
             provider_type = "gmail"  # Default to Gmail
-            
-        _mail_service_instance = MailService(provider_type=provider_type)
+        
+        if provider_type not in services:
+            services[provider_type] = MailService(provider_type=provider_type)
+        current = services[None] = services[provider_type]
     
-    return _mail_service_instance
+    return current
 
 
 async def setup_mail_provider(provider_type: str = "gmail") -> bool:
@@ -12,7 +12,6 @@ import asyncio
 from typing import Dict, Any, Optional
 
 from ergon.utils.config.settings import settings
-from ergon.utils.tekton_integration import get_component_url
 
 # Import providers
 from ergon.core.agents.mail.providers import get_mail_provider
@@ -249,8 +248,8 @@ async def setup_outlook_oauth() -> Dict[str, Any]:
         print("\nInstructions:")
         print("1. Go to https://portal.azure.com/#blade/Microsoft_AAD_RegisteredApps/ApplicationsListBlade")
         print("2. Register a new application")
-        redirect_uri = f"{get_component_url('ergon', '/auth/outlook/callback')}"
-        print(f"3. Add redirect URI: {redirect_uri}")
+        from ergon.core.agents.mail.providers import OutlookProvider
+        print(f"3. Add a 'Mobile and desktop applications' redirect URI: {OutlookProvider.DEFAULT_REDIRECT_URI}")
         print("4. Add Microsoft Graph permissions: Mail.Read, Mail.Send, Mail.ReadWrite")
         print("5. Get the client ID (Application ID)")
         
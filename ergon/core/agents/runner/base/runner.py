@@ -4,28 +4,32 @@ Base agent runner implementation.
 
 import os
 import sys
-import json
 import logging
+import atexit
 import asyncio
-from datetime import datetime
-from typing import Dict, Any, List, Optional, Union, Tuple, AsyncGenerator
+import functools
+import threading
+import time
+from contextlib import AsyncExitStack
+from typing import Dict, Any, List, Optional, Union, Tuple, AsyncGenerator, Callable, Set
 
 from ergon.core.database.engine import get_db_session
 from ergon.core.database.models import Agent, AgentExecution, AgentMessage, AgentTool
 from ergon.core.llm.client import LLMClient
+from ergon.utils import fast_json
 from ergon.utils.config.settings import settings
 
-from ..utils.environment import setup_agent_environment, cleanup_agent_environment
+from ..utils.environment import setup_agent_environment, cleanup_agent_environment, touch_agent_environment
 from ..utils.logging import log_agent_start, log_agent_success, log_agent_error
 from ..memory.operations import add_memory_context_to_messages, store_conversation
 from ..memory.service import close_memory_service
 from ..execution.timeout import run_with_timeout
 from ..execution.streaming import stream_response
 from ..execution.db import (
-    record_execution_error, record_execution_success, 
-    record_assistant_message, record_tool_call, record_tool_result
+    record_execution_error, record_execution_success, record_execution_status,
+    record_assistant_message, record_tool_call, RecordWriter
 )
-from ..tools.loader import load_agent_tools
+from ..tools.loader import load_agent_tools, get_tool_definitions
 from ..tools.mock import mock_tool_calling
 from ..tools.registry import register_special_tools
 from ..handlers.browser import handle_browser_direct_workflow
@@ -37,6 +41,38 @@ from .exceptions import AgentException, AgentTimeoutException
 logger = logging.getLogger(__name__)
 logger.setLevel(getattr(logging, settings.log_level.value))
 
+# Greeting and memory terms that send Nexus agents to a simple completion
+NEXUS_SIMPLE_TERMS = (
+    "hello", "hi", "hey", "greetings", "who are you",
+    "remember", "memory", "recall", "forgot", "know about me", "know about us"
+)
+
+# Runs started by AgentRunner.submit(), referenced until they finish
+_background_runs: Set[asyncio.Task] = set()
+
+# Event loop reused by run_sync() calls on the same thread
+_thread_state = threading.local()
+
+def _close_loop(loop: asyncio.AbstractEventLoop) -> None:
+    """Close a run_sync() event loop at interpreter exit."""
+    if not loop.is_closed() and not loop.is_running():
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+def _get_thread_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the persistent event loop for the current thread.
+    
+    Returns:
+        Event loop created on first use and reused afterwards
+    """
+    loop = getattr(_thread_state, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _thread_state.loop = loop
+        atexit.register(_close_loop, loop)
+    return loop
+
 class AgentRunner:
     """
     Runner for executing AI agents.
@@ -45,6 +81,13 @@ class AgentRunner:
     handling their interactions.
     """
     
+    __slots__ = (
+        "agent", "execution_id", "model_name", "temperature", "timeout",
+        "timeout_action", "llm_client", "working_dir", "agent_type",
+        "is_mail_agent", "is_github_agent", "is_nexus_agent", "_active_runs",
+        "_tools"
+    )
+    
     def __init__(
         self,
         agent: Agent,
@@ -77,8 +120,8 @@ class AgentRunner:
             logger.warning(f"Invalid timeout action '{timeout_action}'. Using 'log' instead.")
             self.timeout_action = "log"
         
-        # Initialize LLM client
-        self.llm_client = LLMClient(model_name=self.model_name, temperature=self.temperature)
+        # Use the LLM client shared by runners with the same model settings
+        self.llm_client = LLMClient.get(model_name=self.model_name, temperature=self.temperature)
         
         # Create working directory if it doesn't exist
         self.working_dir = setup_agent_environment(self.agent)
@@ -88,6 +131,17 @@ class AgentRunner:
         
         # Check if mail agent
         self.is_mail_agent = setup_mail_agent(self.agent.name)
+        
+        # Resolve the name-based agent kinds once rather than on every run
+        agent_name = self.agent.name.lower()
+        self.is_github_agent = "github" in agent_name
+        self.is_nexus_agent = self.agent_type == "nexus" or "nexus" in agent_name
+        
+        # Number of run() calls in flight, so shared resources outlive concurrent runs
+        self._active_runs = 0
+        
+        # Agent tool rows, loaded on the first run
+        self._tools: Optional[List[AgentTool]] = None
     
     async def run(self, input_text: str) -> str:
         """
@@ -99,7 +153,8 @@ class AgentRunner:
         Returns:
             Agent's response
         """
-        start_time = datetime.now()
+        start_time = time.perf_counter()
+        self._active_runs += 1
         
         # Log agent execution with name for better traceability
         log_agent_start(self.agent.name, self.agent.id, self.timeout)
@@ -116,17 +171,17 @@ class AgentRunner:
                         timeout=self.timeout,
                         timeout_action=self.timeout_action,
                         execution_id=self.execution_id,
-                        on_timeout=record_execution_error
+                        on_timeout=self._record_timeout
                     )
                 except asyncio.TimeoutError:
-                    elapsed_time = (datetime.now() - start_time).total_seconds()
+                    elapsed_time = time.perf_counter() - start_time
                     error_msg = f"Agent '{self.agent.name}' execution timed out after {elapsed_time:.2f} seconds (timeout: {self.timeout}s)"
                     
                     # Log the timeout with agent name
                     logger.warning(error_msg)
                     
                     # Record the timeout in the database if execution_id is provided
-                    record_execution_error(self.execution_id, error_msg)
+                    record_execution_error(self.execution_id, error_msg, status="timed_out")
                     
                     # Return appropriate message based on timeout action
                     if self.timeout_action == "alarm":
@@ -140,13 +195,13 @@ class AgentRunner:
                 response = await self.arun(input_text)
                 
                 # Log successful completion with timing
-                elapsed_time = (datetime.now() - start_time).total_seconds()
+                elapsed_time = time.perf_counter() - start_time
                 log_agent_success(self.agent.name, self.agent.id, elapsed_time)
                 
                 return response
         except Exception as e:
             # Handle other exceptions with agent name
-            elapsed_time = (datetime.now() - start_time).total_seconds()
+            elapsed_time = time.perf_counter() - start_time
             error_msg = f"Error in agent '{self.agent.name}' after {elapsed_time:.2f} seconds: {str(e)}"
             
             # Log the error
@@ -157,8 +212,108 @@ class AgentRunner:
             
             return f"I encountered an error while processing your request: {str(e)}"
         finally:
-            # Close memory service if needed
-            await close_memory_service(self.agent.id)
+            # Close memory service once the last concurrent run has finished
+            self._active_runs -= 1
+            if self._active_runs == 0:
+                await close_memory_service(self.agent.id)
+    
+    def _record_timeout(self, execution_id: Optional[int], agent_name: str, elapsed_time: float) -> None:
+        """
+        Record a timed-out execution, as the on_timeout callback of run_with_timeout.
+        
+        Args:
+            execution_id: Execution ID (if None, no record is made)
+            agent_name: Name of the agent
+            elapsed_time: Execution time in seconds
+        """
+        error_msg = f"Agent '{agent_name}' execution timed out after {elapsed_time:.2f} seconds (timeout: {self.timeout}s)"
+        record_execution_error(execution_id, error_msg, status="timed_out")
+    
+    async def submit(self, input_text: str) -> asyncio.Task:
+        """
+        Start a run in the background without waiting for it to finish.
+        
+        The execution moves to 'running' before this returns and to
+        'completed', 'failed' or 'timed_out' when the run ends, so callers
+        can hand back the execution ID and poll its status instead of
+        holding a request open for the whole run.
+        
+        Args:
+            input_text: Input to send to the agent
+        
+        Returns:
+            Task resolving to the agent's response
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, record_execution_status, self.execution_id, "running")
+        
+        task = asyncio.create_task(self.run(input_text))
+        _background_runs.add(task)
+        task.add_done_callback(_background_runs.discard)
+        return task
+    
+    def run_sync(self, input_text: str) -> str:
+        """
+        Run the agent from synchronous code.
+        
+        Uses a persistent per-thread event loop instead of asyncio.run(), so
+        repeated calls skip loop setup and teardown and keep pooled clients
+        bound to a live loop. Must not be called from a running event loop;
+        use run() there instead.
+        
+        Args:
+            input_text: Input to send to the agent
+        
+        Returns:
+            Agent's response
+        """
+        return _get_thread_loop().run_until_complete(self.run(input_text))
+    
+    async def run_many(self, inputs: List[str], concurrency: Optional[int] = None) -> List[str]:
+        """
+        Run the agent on several inputs concurrently.
+        
+        Args:
+            inputs: Inputs to send to the agent
+            concurrency: Optional maximum number of runs in flight at once
+        
+        Returns:
+            Agent's responses, in the same order as inputs
+        """
+        if not concurrency:
+            return list(await asyncio.gather(*(self.run(input_text) for input_text in inputs)))
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def run_one(input_text: str) -> str:
+            async with semaphore:
+                return await self.run(input_text)
+        
+        return list(await asyncio.gather(*(run_one(input_text) for input_text in inputs)))
+    
+    async def run_batch(self, inputs: List[str]) -> List[Optional[str]]:
+        """
+        Answer many inputs with one provider batch request.
+        
+        For offline, non-interactive work such as bulk labelling, where
+        waiting on the provider's batch queue is acceptable. Inputs get a
+        plain completion with the agent's system prompt, without tools,
+        memory or execution records.
+        
+        Args:
+            inputs: Inputs to send to the agent
+        
+        Returns:
+            Agent's responses, in the same order as inputs, None where a request failed
+        """
+        conversations = [
+            [
+                {"role": "system", "content": self.agent.system_prompt},
+                {"role": "user", "content": input_text}
+            ]
+            for input_text in inputs
+        ]
+        return await self.llm_client.acomplete_batch(conversations)
     
     async def arun(self, input_text: str) -> str:
         """
@@ -171,24 +326,77 @@ class AgentRunner:
             Agent's response
         """
         # Check for greeting or memory-related queries for Nexus agents - use simple completion
-        if ((self.agent_type == "nexus" or "nexus" in self.agent.name.lower()) and 
-            (any(greeting in input_text.lower() for greeting in ["hello", "hi", "hey", "greetings", "who are you"]) or
-             any(memory_term in input_text.lower() for memory_term in ["remember", "memory", "recall", "forgot", "know about me", "know about us"]))):
+        lowered_input = input_text.lower()
+        if self.is_nexus_agent and any(term in lowered_input for term in NEXUS_SIMPLE_TERMS):
             logger.info("Nexus agent greeting or memory query detected, using simple completion")
             return await self._run_simple(input_text)
             
-        # Check if agent has tools
-        with get_db_session() as db:
+        # One private session for the whole run: the tool lookup here and
+        # every record written along the way by the background writer
+        with get_db_session(scoped=False) as db:
+            # Check if agent has tools
+            tools = self._get_tools(db)
+            
+            writer = RecordWriter(db)
+            try:
+                if tools:
+                    # Agent has tools, use function calling; resources the
+                    # tools hold for this run, such as a browser, are
+                    # released when it ends
+                    async with AsyncExitStack() as resources:
+                        return await self._run_with_tools(input_text, tools, writer, resources)
+                else:
+                    # Simple agent, just use completion
+                    return await self._run_simple(input_text, writer)
+            finally:
+                await writer.aclose()
+    
+    def _get_tools(self, db) -> List[AgentTool]:
+        """
+        Get the agent's tools, querying the database only on the first call.
+        
+        The rows are detached from the session so they stay readable after
+        it commits and closes.
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            List of the agent's tool rows
+        """
+        if self._tools is None:
             tools = db.query(AgentTool).filter(AgentTool.agent_id == self.agent.id).all()
+            for tool in tools:
+                db.expunge(tool)
+            self._tools = tools
+        return self._tools
+    
+    def _record(self, writer: Optional[RecordWriter], record: Callable[..., None], *args: Any) -> None:
+        """
+        Write an execution record, in the background when a writer is given.
         
-        if tools:
-            # Agent has tools, use function calling
-            return await self._run_with_tools(input_text, tools)
+        Args:
+            writer: Record writer for the current run, or None
+            record: One of the record_* functions
+            *args: Arguments for the record function
+        """
+        if writer is not None:
+            writer.submit(record, *args)
         else:
-            # Simple agent, just use completion
-            return await self._run_simple(input_text)
+            record(*args)
     
-    async def _run_simple(self, input_text: str) -> str:
+    def _record_response(self, writer: Optional[RecordWriter], response: str) -> None:
+        """
+        Record the agent's final response and mark the execution completed.
+        
+        Args:
+            writer: Record writer for the current run, or None
+            response: Final response returned to the caller
+        """
+        self._record(writer, record_assistant_message, self.execution_id, response)
+        self._record(writer, record_execution_success, self.execution_id)
+    
+    async def _run_simple(self, input_text: str, writer: Optional[RecordWriter] = None) -> str:
         """Run a simple agent without tools."""
         # Prepare messages
         messages = [
@@ -215,17 +423,21 @@ class AgentRunner:
             agent_type=self.agent_type
         )
         
-        # Record in database if execution_id provided
-        record_assistant_message(self.execution_id, response)
-        
-        # Mark execution as successful
-        record_execution_success(self.execution_id)
+        # Record in database and mark execution as successful
+        self._record_response(writer, response)
         
         return response
     
-    async def _run_with_tools(self, input_text: str, tools: List[AgentTool]) -> str:
+    async def _run_with_tools(
+        self,
+        input_text: str,
+        tools: List[AgentTool],
+        writer: Optional[RecordWriter] = None,
+        resources: Optional[AsyncExitStack] = None
+    ) -> str:
         """Run an agent with tools."""
-        # Load tool functions
+        # Load tool functions, keeping the environment from being evicted as superseded
+        touch_agent_environment(self.working_dir)
         tool_funcs = load_agent_tools(self.agent.id, self.working_dir)
         
         # Register special tools
@@ -233,37 +445,32 @@ class AgentRunner:
             agent_type=self.agent_type,
             agent_id=self.agent.id,
             agent_name=self.agent.name,
-            tools_dict=tool_funcs
+            tools_dict=tool_funcs,
+            resources=resources
         )
         
         # Handle GitHub agent (or other agents with non-LLM implementation)
-        if "github" in self.agent.name.lower():
+        if self.is_github_agent:
             github_response = handle_github_agent(input_text, tool_funcs)
             if github_response:
+                self._record_response(writer, github_response)
                 return github_response
         
         # Handle browser agent direct workflow
         if self.agent_type == "browser":
             browser_response = await handle_browser_direct_workflow(input_text, tool_funcs)
             if browser_response:
+                self._record_response(writer, browser_response)
                 return browser_response
         
         # Standard LLM-based agent path
-        # Prepare tool definitions for the LLM
-        tool_definitions = []
-        for tool in tools:
-            try:
-                tool_def = json.loads(tool.function_def)
-                tool_definitions.append({
-                    "type": "function",
-                    "function": {
-                        "name": tool.name,
-                        "description": tool.description,
-                        "parameters": tool_def
-                    }
-                })
-            except (json.JSONDecodeError, KeyError) as e:
-                logger.warning(f"Failed to parse tool definition for {tool.name}: {str(e)}")
+        # Prepare tool definitions for the LLM (cached per agent)
+        tool_definitions = get_tool_definitions(self.agent.id, tools)
+        
+        # Without any usable tool definitions there is nothing to call
+        if not tool_definitions:
+            logger.warning(f"No valid tool definitions for agent '{self.agent.name}', using simple completion")
+            return await self._run_simple(input_text, writer)
         
         # OpenAI-style messages with tool calling
         messages = [
@@ -280,9 +487,9 @@ class AgentRunner:
         )
         
         # Simulate a conversation with tools
-        for _ in range(5):  # Maximum 5 tool calls per conversation
+        for _ in range(5):  # Maximum 5 tool-calling turns per conversation
             try:
-                # Get response from LLM that may include a tool call
+                # Get response from LLM that may include tool calls
                 response = await mock_tool_calling(
                     self.llm_client,
                     messages,
@@ -290,47 +497,20 @@ class AgentRunner:
                     input_text
                 )
                 
-                # Check if response includes a tool call
-                if "function_call" in response:
-                    function_call = response["function_call"]
-                    tool_name = function_call["name"]
-                    tool_arguments = json.loads(function_call["arguments"])
-                    
-                    # Record tool call in database
-                    record_tool_call(self.execution_id, tool_name, tool_arguments)
-                    
-                    # Execute tool if available
-                    if tool_name in tool_funcs:
-                        # Call the tool function - handle both async and sync functions
-                        tool_func = tool_funcs[tool_name]
-                        if asyncio.iscoroutinefunction(tool_func):
-                            tool_result = await tool_func(**tool_arguments)
-                        else:
-                            # Handle synchronous function
-                            tool_result = tool_func(**tool_arguments)
-                    else:
-                        tool_result = f"Tool {tool_name} not found"
-                    
-                    # Record tool result in database
-                    record_tool_result(self.execution_id, tool_name, tool_result)
-                    
-                    # Add tool result to messages
-                    # Convert tool result to string if it's a dict or list
-                    if isinstance(tool_result, (dict, list)):
-                        messages.append({
-                            "role": "function",
-                            "name": tool_name,
-                            "content": json.dumps(tool_result)
-                        })
-                    else:
-                        messages.append({
-                            "role": "function",
-                            "name": tool_name,
-                            "content": str(tool_result)
-                        })
+                # Check if response includes tool calls; independent calls
+                # requested in one turn run concurrently
+                tool_calls = response.get("tool_calls")
+                if tool_calls is None and "function_call" in response:
+                    tool_calls = [response["function_call"]]
+                
+                if tool_calls:
+                    messages.extend(await asyncio.gather(*(
+                        self._call_tool(tool_funcs, tool_call, writer)
+                        for tool_call in tool_calls
+                    )))
                 else:
                     # Final response without tool call
-                    record_assistant_message(self.execution_id, response["content"])
+                    self._record_response(writer, response["content"])
                     
                     # Store in memory if agent supports it
                     await store_conversation(
@@ -340,19 +520,19 @@ class AgentRunner:
                         agent_type=self.agent_type
                     )
                     
-                    # Mark execution as successful
-                    record_execution_success(self.execution_id)
-                    
                     return response["content"]
             
             except Exception as e:
                 logger.error(f"Error in agent tool execution: {str(e)}")
-                return f"Error executing agent: {str(e)}"
+                error_msg = f"Error executing agent: {str(e)}"
+                self._record(writer, record_execution_error, self.execution_id, error_msg)
+                return error_msg
         
         # If we reach here, we've hit the maximum number of tool calls
         logger.warning(f"Maximum tool calls reached. Tool calls made: {len(messages) - 2}")
-        for i, msg in enumerate(messages[2:]):
-            logger.warning(f"Tool call {i+1}: {json.dumps(msg)}")
+        if logger.isEnabledFor(logging.WARNING):
+            for i, msg in enumerate(messages[2:]):
+                logger.warning("Tool call %d: %r", i + 1, msg)
         
         # Even for error cases, store in memory if this is a Nexus agent
         error_message = "I've made too many tool calls without reaching a conclusion. Please try a more specific query."
@@ -365,8 +545,64 @@ class AgentRunner:
             agent_type=self.agent_type
         )
         
+        # Mark execution as failed
+        self._record(writer, record_execution_error, self.execution_id, error_message)
+        
         return error_message
     
+    async def _call_tool(
+        self,
+        tool_funcs: Dict[str, Callable],
+        function_call: Dict[str, Any],
+        writer: Optional[RecordWriter] = None
+    ) -> Dict[str, str]:
+        """
+        Execute one tool call requested by the LLM.
+        
+        Args:
+            tool_funcs: Available tool functions by name
+            function_call: Call with the tool name and JSON-encoded arguments
+            writer: Record writer for the current run, or None
+        
+        Returns:
+            Function message with the tool output for the conversation
+        """
+        tool_name = function_call["name"]
+        tool_arguments = fast_json.loads(function_call["arguments"])
+        
+        tool_output = None
+        try:
+            # Execute tool if available
+            if tool_name in tool_funcs:
+                # Call the tool function - handle both async and sync functions
+                tool_func = tool_funcs[tool_name]
+                if asyncio.iscoroutinefunction(tool_func):
+                    tool_result = await tool_func(**tool_arguments)
+                else:
+                    # Run synchronous functions in the default executor so a
+                    # blocking tool does not stall the event loop
+                    loop = asyncio.get_running_loop()
+                    tool_result = await loop.run_in_executor(
+                        None, functools.partial(tool_func, **tool_arguments)
+                    )
+            else:
+                tool_result = f"Tool {tool_name} not found"
+            
+            # Convert tool result to string if it's a dict or list
+            if isinstance(tool_result, (dict, list)):
+                tool_output = fast_json.dumps(tool_result)
+            else:
+                tool_output = str(tool_result)
+        finally:
+            # Record the tool call together with its output, if any
+            self._record(writer, record_tool_call, self.execution_id, tool_name, tool_arguments, tool_output)
+        
+        return {
+            "role": "function",
+            "name": tool_name,
+            "content": tool_output
+        }
+    
     async def arun_stream(self, input_text: str) -> AsyncGenerator[str, None]:
         """
         Run the agent with streaming response.
@@ -391,18 +627,21 @@ class AgentRunner:
             agent_type=self.agent_type
         )
         
-        # Stream the response
-        async for chunk in stream_response(self.llm_client, messages, self.execution_id):
-            yield chunk
-        
-        # Store in memory if agent supports it (use the last chunk as the full response)
-        if hasattr(self, '_last_chunk'):
-            await store_conversation(
-                agent_id=self.agent.id,
-                user_input=input_text,
-                assistant_output=self._last_chunk,
-                agent_type=self.agent_type
-            )
+        # Stream the response, keeping the chunks to rebuild the full text
+        parts = []
+        try:
+            async for chunk in stream_response(self.llm_client, messages, self.execution_id):
+                parts.append(chunk)
+                yield chunk
+        finally:
+            # Store in memory if agent supports it, also after an early close
+            if parts:
+                await store_conversation(
+                    agent_id=self.agent.id,
+                    user_input=input_text,
+                    assistant_output="".join(parts),
+                    agent_type=self.agent_type
+                )
     
     async def cleanup(self):
         """Clean up agent resources."""
@@ -2,20 +2,201 @@
 Database interactions for agent runner.
 """
 
+import asyncio
 import logging
-import json
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Union, Tuple
+from typing import Dict, Any, List, Optional, Union, Tuple, Iterator, Callable
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
 
 from ergon.core.database.engine import get_db_session
 from ergon.core.database.models import AgentExecution, AgentMessage
+from ergon.utils import fast_json
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+def _update_execution(db: Session, execution_id: int, **values: Any) -> bool:
+    """
+    Update an execution row in one UPDATE statement, without loading it.
+    
+    Args:
+        db: Session to execute in
+        execution_id: Execution ID
+        **values: Column values to set
+        
+    Returns:
+        True if the execution exists
+    """
+    result = db.execute(
+        update(AgentExecution).where(AgentExecution.id == execution_id).values(**values)
+    )
+    return result.rowcount > 0
+
+
+@contextmanager
+def _session_scope(db: Optional[Session]) -> Iterator[Session]:
+    """
+    Use a caller's session or open one for a single write.
+    
+    A caller's session is only flushed, leaving the commit to its owner;
+    a session opened here is committed and closed.
+    
+    Args:
+        db: Session shared by the caller, or None
+        
+    Yields:
+        Session to write to
+    """
+    if db is not None:
+        yield db
+        db.flush()
+        return
+    
+    with get_db_session() as session:
+        yield session
+        session.commit()
+
+
+class RecordWriter:
+    """
+    Background writer for the database records of one agent run.
+    
+    Record calls are queued instead of running on the event loop. A single
+    drain task applies whatever has queued up to the run's session in an
+    executor thread and commits each batch before waiting for more, so the
+    database write lock is never held while the run awaits the LLM or tools.
+    """
+    
+    def __init__(self, db: Session):
+        """
+        Initialize the record writer.
+        
+        Args:
+            db: Session owned by the run; only the drain task may use it
+                once records have been submitted
+        """
+        self.db = db
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+    
+    def submit(self, record: Callable[..., None], *args: Any) -> None:
+        """
+        Queue a record call to be written in the background.
+        
+        Args:
+            record: One of the record_* functions in this module
+            *args: Arguments for the call; the session is passed as db
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._drain())
+        self._queue.put_nowait((record, args))
+    
+    async def aclose(self) -> None:
+        """Wait until every submitted record has been written and committed."""
+        if self._task is None:
+            return
+        self._queue.put_nowait(None)
+        await self._task
+        self._task = None
+    
+    async def _drain(self) -> None:
+        """Write queued records in batches until closed."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            
+            records = [item for item in batch if item is not None]
+            if records:
+                await loop.run_in_executor(None, self._write_batch, records)
+            if len(records) < len(batch):
+                return
+    
+    def _write_batch(self, records: List[Tuple[Callable[..., None], Tuple]]) -> None:
+        """
+        Write a batch of record calls in one transaction.
+        
+        If a record fails, the batch is rolled back and its records are
+        retried one transaction each, so only the failing record is lost.
+        
+        Args:
+            records: (record function, arguments) pairs in submission order
+        """
+        if self._apply(records) and self._commit():
+            return
+        
+        if len(records) > 1:
+            for record in records:
+                if self._apply([record]):
+                    self._commit()
+    
+    def _apply(self, records: List[Tuple[Callable[..., None], Tuple]]) -> bool:
+        """
+        Apply record calls to the session without committing.
+        
+        Args:
+            records: (record function, arguments) pairs in submission order
+            
+        Returns:
+            True if every record was flushed, False if the session was rolled back
+        """
+        for record, args in records:
+            record(*args, db=self.db)
+            
+            # A failed flush leaves the transaction unusable for later records
+            if not self.db.is_active:
+                self.db.rollback()
+                return False
+        return True
+    
+    def _commit(self) -> bool:
+        """
+        Commit the records applied since the last commit.
+        
+        Returns:
+            True if the commit succeeded
+        """
+        try:
+            self.db.commit()
+            return True
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error committing agent records: {str(e)}")
+            return False
+
+
+def record_execution_status(
+    execution_id: Optional[int],
+    status: str,
+    db: Optional[Session] = None
+) -> None:
+    """
+    Record an execution status transition in database.
+    
+    Args:
+        execution_id: Execution ID (if None, no record is made)
+        status: New status, such as 'running'
+        db: Optional session to write to instead of opening a new one
+    """
+    if not execution_id:
+        return
+    
+    try:
+        with _session_scope(db) as db:
+            _update_execution(db, execution_id, status=status)
+    except Exception as e:
+        logger.error(f"Error recording execution status: {str(e)}")
+
+
 def record_execution_error(
     execution_id: Optional[int],
-    error_msg: str
+    error_msg: str,
+    db: Optional[Session] = None,
+    status: str = "failed"
 ) -> None:
     """
     Record execution error in database.
@@ -23,19 +204,18 @@ def record_execution_error(
     Args:
         execution_id: Execution ID (if None, no record is made)
         error_msg: Error message to record
+        db: Optional session to write to instead of opening a new one
+        status: Final status of the execution ('failed' or 'timed_out')
     """
     if not execution_id:
         return
     
     try:
-        with get_db_session() as db:
-            execution = db.query(AgentExecution).filter(AgentExecution.id == execution_id).first()
-            if execution:
-                execution.success = False
-                execution.error = error_msg
-                execution.completed_at = datetime.now()
-                db.commit()
-                
+        with _session_scope(db) as db:
+            if _update_execution(
+                db, execution_id,
+                status=status, error=error_msg, end_time=datetime.now()
+            ):
                 # Add error message to the conversation
                 message = AgentMessage(
                     execution_id=execution_id,
@@ -43,37 +223,35 @@ def record_execution_error(
                     content=error_msg
                 )
                 db.add(message)
-                db.commit()
     except Exception as e:
         logger.error(f"Error recording execution error: {str(e)}")
 
 
 def record_execution_success(
-    execution_id: Optional[int]
+    execution_id: Optional[int],
+    db: Optional[Session] = None
 ) -> None:
     """
     Record execution success in database.
     
     Args:
         execution_id: Execution ID (if None, no record is made)
+        db: Optional session to write to instead of opening a new one
     """
     if not execution_id:
         return
     
     try:
-        with get_db_session() as db:
-            execution = db.query(AgentExecution).filter(AgentExecution.id == execution_id).first()
-            if execution:
-                execution.success = True
-                execution.completed_at = datetime.now()
-                db.commit()
+        with _session_scope(db) as db:
+            _update_execution(db, execution_id, status="completed", end_time=datetime.now())
     except Exception as e:
         logger.error(f"Error recording execution success: {str(e)}")
 
 
 def record_assistant_message(
     execution_id: Optional[int],
-    content: str
+    content: str,
+    db: Optional[Session] = None
 ) -> None:
     """
     Record assistant message in database.
@@ -81,19 +259,19 @@ def record_assistant_message(
     Args:
         execution_id: Execution ID (if None, no record is made)
         content: Message content
+        db: Optional session to write to instead of opening a new one
     """
     if not execution_id:
         return
     
     try:
-        with get_db_session() as db:
+        with _session_scope(db) as db:
             message = AgentMessage(
                 execution_id=execution_id,
                 role="assistant",
                 content=content
             )
             db.add(message)
-            db.commit()
     except Exception as e:
         logger.error(f"Error recording assistant message: {str(e)}")
 
@@ -101,7 +279,9 @@ def record_assistant_message(
 def record_tool_call(
     execution_id: Optional[int],
     tool_name: str,
-    tool_arguments: Dict[str, Any]
+    tool_arguments: Dict[str, Any],
+    tool_output: Optional[str] = None,
+    db: Optional[Session] = None
 ) -> None:
     """
     Record tool call in database.
@@ -110,54 +290,22 @@ def record_tool_call(
         execution_id: Execution ID (if None, no record is made)
         tool_name: Name of the tool called
         tool_arguments: Arguments passed to the tool
+        tool_output: Tool output, when the call is recorded after it ran
+        db: Optional session to write to instead of opening a new one
     """
     if not execution_id:
         return
     
     try:
-        with get_db_session() as db:
+        with _session_scope(db) as db:
             message = AgentMessage(
                 execution_id=execution_id,
                 role="tool",
                 content="",
                 tool_name=tool_name,
-                tool_input=json.dumps(tool_arguments)
+                tool_input=fast_json.dumps(tool_arguments),
+                tool_output=tool_output
             )
             db.add(message)
-            db.commit()
     except Exception as e:
         logger.error(f"Error recording tool call: {str(e)}")
-
-
-def record_tool_result(
-    execution_id: Optional[int],
-    tool_name: str,
-    tool_result: Any
-) -> None:
-    """
-    Record tool result in database.
-    
-    Args:
-        execution_id: Execution ID (if None, no record is made)
-        tool_name: Name of the tool
-        tool_result: Result returned by the tool
-    """
-    if not execution_id:
-        return
-    
-    try:
-        with get_db_session() as db:
-            message = db.query(AgentMessage).filter(
-                AgentMessage.execution_id == execution_id,
-                AgentMessage.tool_name == tool_name
-            ).order_by(AgentMessage.id.desc()).first()
-            
-            if message:
-                # Make sure tool_output is stored as a string
-                if isinstance(tool_result, (dict, list)):
-                    message.tool_output = json.dumps(tool_result)
-                else:
-                    message.tool_output = str(tool_result)
-                db.commit()
-    except Exception as e:
-        logger.error(f"Error recording tool result: {str(e)}")
\ No newline at end of file
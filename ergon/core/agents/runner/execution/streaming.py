@@ -6,8 +6,7 @@ import logging
 import asyncio
 from typing import Dict, Any, List, AsyncGenerator, Optional
 
-from ergon.core.database.engine import get_db_session
-from ergon.core.database.models import AgentMessage
+from .db import record_assistant_message
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -20,6 +19,9 @@ async def stream_response(
     """
     Stream a response from the LLM.
     
+    Chunks are yielded as they arrive; the complete response is written
+    to the database once, after the stream ends or is closed.
+    
     Args:
         llm_client: LLM client
         messages: Messages to send to the LLM
@@ -28,30 +30,19 @@ async def stream_response(
     Yields:
         Chunks of the response
     """
+    parts = []
     try:
-        # Record in database if execution_id provided
-        if execution_id:
-            full_response = ""
-            async for chunk in llm_client.acomplete_stream(messages):
-                full_response += chunk
-                yield chunk
-            
-            # Record the complete response
-            try:
-                with get_db_session() as db:
-                    message = AgentMessage(
-                        execution_id=execution_id,
-                        role="assistant",
-                        content=full_response
-                    )
-                    db.add(message)
-                    db.commit()
-            except Exception as e:
-                logger.error(f"Error recording streamed response: {str(e)}")
-        else:
-            # Just stream the response without recording
-            async for chunk in llm_client.acomplete_stream(messages):
-                yield chunk
+        async for chunk in llm_client.acomplete_stream(messages):
+            parts.append(chunk)
+            yield chunk
     except Exception as e:
         logger.error(f"Error streaming response: {str(e)}")
-        yield f"Error streaming response: {str(e)}"
\ No newline at end of file
+        yield f"Error streaming response: {str(e)}"
+    finally:
+        # Record the response off the event loop, including what was
+        # streamed before a consumer stopped early
+        if execution_id and parts:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                None, record_assistant_message, execution_id, "".join(parts)
+            )
@@ -4,7 +4,7 @@ Timeout handling for agent runner.
 
 import asyncio
 import logging
-from datetime import datetime
+import time
 from typing import Dict, Any, Optional, Callable, Awaitable
 
 from ..utils.logging import log_agent_timeout, format_timeout_message
@@ -42,23 +42,21 @@ async def run_with_timeout(
     Raises:
         asyncio.TimeoutError: If the execution exceeds the timeout and on_timeout is None
     """
-    start_time = datetime.now()
-    
-    # Create a task for running the function
-    task = asyncio.create_task(agent_func(input_text))
+    start_time = time.perf_counter()
     
     try:
-        # Wait for the task to complete or timeout
-        response = await asyncio.wait_for(task, timeout=timeout)
+        # Wait for the function to complete or timeout; wait_for runs it as
+        # a task of the current loop and cancels it on timeout
+        response = await asyncio.wait_for(agent_func(input_text), timeout=timeout)
         
         # Calculate elapsed time
-        elapsed_time = (datetime.now() - start_time).total_seconds()
+        elapsed_time = time.perf_counter() - start_time
         logger.info(f"Agent '{agent_name}' (ID: {agent_id}) completed successfully within timeout period ({elapsed_time:.2f}s)")
         
         return response
     except asyncio.TimeoutError:
         # Calculate elapsed time
-        elapsed_time = (datetime.now() - start_time).total_seconds()
+        elapsed_time = time.perf_counter() - start_time
         
         # Log the timeout
         log_agent_timeout(agent_name, agent_id, timeout, elapsed_time)
@@ -5,11 +5,44 @@ Browser agent handler.
 import re
 import logging
 import asyncio
+from functools import lru_cache
 from typing import Dict, Any, List, Optional, Callable, Union
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# URL following "go to" in a navigation request
+NAVIGATE_URL_RE = re.compile(r"go to\s+([a-zA-Z0-9.-]+\.[a-zA-Z]{2,}(?:\/[^\s]*)?)", re.IGNORECASE)
+
+# Page title in fetched HTML, allowing attributes on the tag
+_TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+
+# Leading HTML characters searched for the title before the whole page
+TITLE_SCAN_LIMIT = 8192
+
+@lru_cache(maxsize=128)
+def extract_navigate_url(text: str) -> Optional[str]:
+    """
+    Extract the URL to navigate to from a "go to" request.
+    
+    Results are cached, since the same input is checked by the direct
+    workflow and again on every tool-calling turn.
+    
+    Args:
+        text: User input text
+        
+    Returns:
+        URL with a scheme, or None if the input names no URL
+    """
+    url_match = NAVIGATE_URL_RE.search(text)
+    if not url_match:
+        return None
+    
+    url = url_match.group(1)
+    if not url.startswith("http"):
+        url = "https://" + url
+    return url
+
 async def handle_browser_direct_workflow(
     input_text: str,
     tool_funcs: Dict[str, Callable]
@@ -24,35 +57,40 @@ async def handle_browser_direct_workflow(
     Returns:
         Response if handled directly, None otherwise
     """
-    if "go to" not in input_text.lower() or not any(x in input_text.lower() for x in ["title", "text", "content"]):
+    lowered_input = input_text.lower()
+    if "go to" not in lowered_input or not any(x in lowered_input for x in ["title", "text", "content"]):
         return None
     
     try:
         # Extract URL from input
-        url_pattern = r"go to\s+([a-zA-Z0-9.-]+\.[a-zA-Z]{2,}(?:\/[^\s]*)?)"
-        url_match = re.search(url_pattern, input_text, re.IGNORECASE)
+        url = extract_navigate_url(input_text)
         
-        if url_match and "browse_navigate" in tool_funcs and "browse_get_text" in tool_funcs:
-            url = url_match.group(1)
-            if not url.startswith("http"):
-                url = "https://" + url
-            
+        if url and "browse_navigate" in tool_funcs and "browse_get_text" in tool_funcs:
             # First, navigate to the URL
             logger.info(f"Direct browser workflow: navigating to {url}")
             navigate_result = await tool_funcs["browse_navigate"](url=url)
             logger.info(f"Navigation result: {navigate_result}")
             
-            # Then get the page text
+            # Then get the page text, and the HTML alongside it when the
+            # title is wanted; both only read the loaded page
+            want_title = "title" in lowered_input and "browse_get_html" in tool_funcs
             logger.info("Direct browser workflow: getting page text")
-            text_result = await tool_funcs["browse_get_text"]()
+            if want_title:
+                text_result, html_result = await asyncio.gather(
+                    tool_funcs["browse_get_text"](),
+                    tool_funcs["browse_get_html"]()
+                )
+            else:
+                text_result = await tool_funcs["browse_get_text"]()
             logger.info(f"Got page text (first 100 chars): {text_result[:100] if isinstance(text_result, str) else 'Not a string'}")
             
             # Check if we need the title specifically
-            if "title" in input_text.lower() and "browse_get_html" in tool_funcs:
-                # Get HTML to extract title
-                html_result = await tool_funcs["browse_get_html"]()
-                title_pattern = r"<title>(.*?)</title>"
-                title_match = re.search(title_pattern, html_result if isinstance(html_result, str) else "")
+            if want_title:
+                # Extract title from the HTML, looking in the head first
+                html = html_result if isinstance(html_result, str) else ""
+                title_match = _TITLE_RE.search(html[:TITLE_SCAN_LIMIT])
+                if not title_match and len(html) > TITLE_SCAN_LIMIT:
+                    title_match = _TITLE_RE.search(html)
                 if title_match:
                     title = title_match.group(1)
                     return f"The title of the page at {url} is: {title}"
@@ -5,6 +5,8 @@ Mail agent handler.
 import logging
 from typing import Dict, Any, Optional, Callable
 
+from ..tools.registry import HAS_MAIL_TOOLS
+
 # Configure logger
 logger = logging.getLogger(__name__)
 
@@ -21,11 +23,9 @@ def setup_mail_agent(agent_name: str) -> bool:
     if "mail" not in agent_name.lower() and "email" not in agent_name.lower():
         return False
     
-    try:
-        # Import mail module to ensure it's available
-        from ergon.core.agents.mail import tools
-        logger.info("Mail agent detected, mail module is available")
-        return True
-    except ImportError as e:
-        logger.error(f"Mail agent detected but mail module not available: {str(e)}")
-        return False
\ No newline at end of file
+    if not HAS_MAIL_TOOLS:
+        logger.error("Mail agent detected but mail module not available")
+        return False
+    
+    logger.info("Mail agent detected, mail module is available")
+    return True
\ No newline at end of file
@@ -1,6 +1,6 @@
 """Tool loading and execution functionality."""
 
-from .loader import load_agent_tools
+from .loader import load_agent_tools, get_tool_definitions
 from .registry import register_special_tools
 
-__all__ = ["load_agent_tools", "register_special_tools"]
\ No newline at end of file
+__all__ = ["load_agent_tools", "get_tool_definitions", "register_special_tools"]
\ No newline at end of file
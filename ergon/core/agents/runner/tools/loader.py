@@ -4,17 +4,29 @@ Tool loading functionality for agent runner.
 
 import os
 import sys
+import json
 import logging
 import importlib.util
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, Tuple
+
+from ergon.utils import fast_json
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Loaded tool functions per agent_tools.py path, stored with the file's mtime
+_tool_function_cache: Dict[str, Tuple[int, Dict[str, Callable]]] = {}
+
+# Parsed tool definitions per agent, stored with the tool rows they were built from
+_tool_definition_cache: Dict[int, Tuple[Tuple, List[Dict[str, Any]]]] = {}
+
 def load_agent_tools(agent_id: int, working_dir: str) -> Dict[str, Callable]:
     """
     Load tool functions from agent files.
     
+    The module is executed once per version of agent_tools.py; later calls
+    reuse the loaded functions until the file's modification time changes.
+    
     Args:
         agent_id: ID of the agent
         working_dir: Path to the agent's working directory
@@ -27,10 +39,17 @@ def load_agent_tools(agent_id: int, working_dir: str) -> Dict[str, Callable]:
     try:
         # Check if agent_tools.py exists
         tools_path = os.path.join(working_dir, "agent_tools.py")
-        if not os.path.exists(tools_path):
+        try:
+            mtime = os.stat(tools_path).st_mtime_ns
+        except FileNotFoundError:
             logger.info(f"No agent_tools.py found in {working_dir}")
             return tools
         
+        # Reuse the functions loaded from this version of the file
+        cached = _tool_function_cache.get(tools_path)
+        if cached is not None and cached[0] == mtime:
+            return dict(cached[1])
+        
         # Load the module
         spec = importlib.util.spec_from_file_location("agent_tools", tools_path)
         if spec is None or spec.loader is None:
@@ -50,7 +69,63 @@ def load_agent_tools(agent_id: int, working_dir: str) -> Dict[str, Callable]:
                 tools[name] = func
                 logger.debug(f"Loaded tool function: {name}")
         
-        return tools
+        _tool_function_cache[tools_path] = (mtime, tools)
+        return dict(tools)
     except Exception as e:
         logger.error(f"Error loading tool functions: {str(e)}")
-        return {}
\ No newline at end of file
+        return {}
+
+def _build_tool_definitions(tools: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Parse tool rows into OpenAI-style function definitions.
+    
+    Args:
+        tools: Tool rows with name, description and a JSON function_def
+        
+    Returns:
+        List of tool definitions for the LLM
+    """
+    tool_definitions = []
+    for tool in tools:
+        try:
+            tool_def = fast_json.loads(tool.function_def)
+            tool_definitions.append({
+                "type": "function",
+                "function": {
+                    "name": tool.name,
+                    "description": tool.description,
+                    "parameters": tool_def
+                }
+            })
+        except (json.JSONDecodeError, KeyError) as e:
+            logger.warning(f"Failed to parse tool definition for {tool.name}: {str(e)}")
+    
+    return tool_definitions
+
+def get_tool_definitions(agent_id: int, tools: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Get the LLM tool definitions for an agent's tools.
+    
+    Definitions are cached per agent and rebuilt only when the tool rows
+    change, so repeated runs skip the JSON parsing. The returned list is
+    shared and must not be modified.
+    
+    Args:
+        agent_id: ID of the agent
+        tools: Tool rows with name, description and a JSON function_def
+        
+    Returns:
+        List of tool definitions for the LLM
+    """
+    signature = tuple(
+        (tool.id, tool.name, tool.description, tool.function_def)
+        for tool in tools
+    )
+    
+    cached = _tool_definition_cache.get(agent_id)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    
+    tool_definitions = _build_tool_definitions(tools)
+    _tool_definition_cache[agent_id] = (signature, tool_definitions)
+    return tool_definitions
@@ -2,15 +2,46 @@
 Mock function calling implementation.
 """
 
-import os
 import re
-import json
 import logging
-from typing import Dict, List, Any, Optional
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, FrozenSet, Tuple
+
+from ergon.utils import fast_json
+from ..handlers.browser import extract_navigate_url
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Name following "called" in a create-repository request
+_NAME_RE = re.compile(r"called\s+(\S+)", re.IGNORECASE)
+
+# Repository name following "repo" in lowercased input
+_REPO_RE = re.compile(r"repo\s+(\S+)")
+
+# Words in user input and tool descriptions
+_WORD_RE = re.compile(r"\w+")
+
+@lru_cache(maxsize=128)
+def _tool_keywords(tools: Tuple[Tuple[str, str], ...]) -> Tuple[FrozenSet[str], ...]:
+    """
+    Build the keyword set of each tool.
+    
+    A tool's keywords are its lowercased name parts and description words,
+    matched against the words of the input with one set intersection.
+    
+    Args:
+        tools: (name, description) pairs in tool order
+        
+    Returns:
+        Keyword sets in the same order
+    """
+    return tuple(
+        frozenset(part for part in name.lower().split("_") if part)
+        | frozenset(_WORD_RE.findall(description.lower()))
+        for name, description in tools
+    )
+
 async def mock_tool_calling(
     llm_client: Any,
     messages: List[Dict[str, str]],
@@ -31,24 +62,6 @@ async def mock_tool_calling(
     Returns:
         Response with optional function call
     """
-    # Extract tool names for the prompt
-    tool_names = [tool["function"]["name"] for tool in tool_definitions]
-    tool_descriptions = [f"{tool['function']['name']}: {tool['function']['description']}" for tool in tool_definitions]
-    
-    tool_prompt = f"""Available tools: {', '.join(tool_names)}
-
-Tool descriptions:
-{os.linesep.join(tool_descriptions)}
-
-To use a tool, respond with a JSON object with this format: 
-{{"function_call": {{"name": "tool_name", "arguments": {{"arg1": "value1"}}}}}}
-
-If you don't need to use a tool, respond with your regular text answer."""
-    
-    # Add tool instructions to the system message
-    system_message_with_tools = f"{messages[0]['content']}\n\n{tool_prompt}"
-    messages_with_tools = [{"role": "system", "content": system_message_with_tools}] + messages[1:]
-    
     # Check if we're dealing with a GitHub agent request
     if any(tool["function"]["name"].startswith("list_repositories") for tool in tool_definitions):
         github_tool = handle_github_tools(tool_definitions, user_input)
@@ -62,12 +75,18 @@ If you don't need to use a tool, respond with your regular text answer."""
             return browser_tool
     
     # Generic approach for other tools
-    for tool in tool_definitions:
+    # Tool set key for the cached keyword matchers
+    tools_key = tuple(
+        (tool["function"]["name"], tool["function"]["description"])
+        for tool in tool_definitions
+    )
+    lowered_input = user_input.lower()
+    input_words = set(_WORD_RE.findall(lowered_input))
+    for tool, keywords in zip(tool_definitions, _tool_keywords(tools_key)):
         tool_name = tool["function"]["name"]
-        tool_desc = tool["function"]["description"]
         
         # Simple heuristic to decide if tool might be needed
-        if any(kw.lower() in user_input.lower() for kw in tool_name.split("_") + tool_desc.split()):
+        if not keywords.isdisjoint(input_words):
             # Simulate a function call response
             arguments = {}
             for param_name, param_def in tool["function"]["parameters"].get("properties", {}).items():
@@ -77,11 +96,10 @@ If you don't need to use a tool, respond with your regular text answer."""
                     arguments[param_name] = user_input
                 else:
                     # For repo_name, try to extract from the input
-                    if param_name == "repo_name" and "repo" in user_input.lower():
-                        parts = user_input.lower().split("repo ")
-                        if len(parts) > 1:
-                            repo_name = parts[1].split()[0].strip()
-                            arguments[param_name] = repo_name
+                    if param_name == "repo_name" and "repo" in lowered_input:
+                        repo_match = _REPO_RE.search(lowered_input)
+                        if repo_match:
+                            arguments[param_name] = repo_match.group(1)
                     else:
                         # Use default for required parameters
                         if param_name in tool["function"]["parameters"].get("required", []):
@@ -90,7 +108,7 @@ If you don't need to use a tool, respond with your regular text answer."""
             return {
                 "function_call": {
                     "name": tool_name,
-                    "arguments": json.dumps(arguments)
+                    "arguments": fast_json.dumps(arguments)
                 }
             }
     
@@ -114,23 +132,25 @@ def handle_github_tools(tool_definitions: List[Dict[str, Any]], user_input: str)
     Returns:
         Function call response or None
     """
+    lowered_input = user_input.lower()
     for tool in tool_definitions:
         tool_name = tool["function"]["name"]
         
-        if "list" in user_input.lower() and "repositories" in user_input.lower() and tool_name == "list_repositories":
+        if "list" in lowered_input and "repositories" in lowered_input and tool_name == "list_repositories":
             return {
                 "function_call": {
                     "name": tool_name,
-                    "arguments": json.dumps({"visibility": "all", "sort": "updated"})
+                    "arguments": fast_json.dumps({"visibility": "all", "sort": "updated"})
                 }
             }
-        elif "create" in user_input.lower() and "repository" in user_input.lower() and tool_name == "create_repository":
+        elif "create" in lowered_input and "repository" in lowered_input and tool_name == "create_repository":
             # Try to extract name from input
-            name = user_input.split("called ")[-1].split()[0].strip() if "called " in user_input else "new-repo"
+            name_match = _NAME_RE.search(user_input)
+            name = name_match.group(1) if name_match else "new-repo"
             return {
                 "function_call": {
                     "name": tool_name,
-                    "arguments": json.dumps({"name": name, "private": "private" in user_input.lower()})
+                    "arguments": fast_json.dumps({"name": name, "private": "private" in lowered_input})
                 }
             }
     
@@ -148,34 +168,30 @@ def handle_browser_tools(tool_definitions: List[Dict[str, Any]], user_input: str
     Returns:
         Function call response or None
     """
+    lowered_input = user_input.lower()
     for tool in tool_definitions:
         tool_name = tool["function"]["name"]
         
         # Handle browse_navigate for URL navigation
-        if tool_name == "browse_navigate" and "go to" in user_input.lower():
+        if tool_name == "browse_navigate" and "go to" in lowered_input:
             # Extract URL from input
-            url_pattern = r"go to\s+([a-zA-Z0-9.-]+\.[a-zA-Z]{2,}(?:\/[^\s]*)?)"
-            url_match = re.search(url_pattern, user_input, re.IGNORECASE)
+            url = extract_navigate_url(user_input)
             
-            if url_match:
-                url = url_match.group(1)
-                if not url.startswith("http"):
-                    url = "https://" + url
-                
+            if url:
                 logger.info(f"Extracted URL for navigation: {url}")
                 return {
                     "function_call": {
                         "name": tool_name,
-                        "arguments": json.dumps({"url": url})
+                        "arguments": fast_json.dumps({"url": url})
                     }
                 }
         
         # Handle get_text after navigation
-        if tool_name == "browse_get_text" and any(x in user_input.lower() for x in ["content", "text", "title"]):
+        if tool_name == "browse_get_text" and any(x in lowered_input for x in ["content", "text", "title"]):
             return {
                 "function_call": {
                     "name": tool_name,
-                    "arguments": json.dumps({})
+                    "arguments": fast_json.dumps({})
                 }
             }
     
@@ -4,16 +4,28 @@ Tool registry for special agent types.
 
 import logging
 import asyncio
+from contextlib import AsyncExitStack
 from typing import Dict, Any, List, Optional, Callable, Union
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Check if mail tools are available
+HAS_MAIL_TOOLS = False
+_register_mail_tools = None
+
+try:
+    from ergon.core.agents.mail.tools import register_mail_tools as _register_mail_tools
+    HAS_MAIL_TOOLS = True
+except ImportError as e:
+    logger.warning(f"Mail tools not available: {str(e)}")
+
 async def register_special_tools(
     agent_type: Optional[str],
     agent_id: str,
     agent_name: str,
-    tools_dict: Dict[str, Callable]
+    tools_dict: Dict[str, Callable],
+    resources: Optional[AsyncExitStack] = None
 ) -> Dict[str, Callable]:
     """
     Register special tools based on agent type.
@@ -23,6 +35,8 @@ async def register_special_tools(
         agent_id: Agent ID
         agent_name: Agent name
         tools_dict: Existing tools dictionary to add to
+        resources: Optional exit stack of the run, which releases
+            resources held by the tools, such as a browser, when it closes
         
     Returns:
         Updated tools dictionary
@@ -39,7 +53,7 @@ async def register_special_tools(
     
     # Register browser tools
     if "browser" in agent_name.lower() or agent_type == "browser":
-        tools = await register_browser_tools(tools)
+        tools = await register_browser_tools(tools, resources)
     
     # Register Nexus memory tools
     if agent_type == "nexus" or "nexus" in agent_name.lower():
@@ -58,23 +72,31 @@ async def register_mail_tools(tools_dict: Dict[str, Callable]) -> Dict[str, Call
     Returns:
         Updated tools dictionary
     """
-    try:
-        from ergon.core.agents.mail.tools import register_mail_tools as _register_mail_tools
-        mail_tools = _register_mail_tools({})
-        tools_dict.update(mail_tools)
-        logger.info(f"Registered mail tools: {list(mail_tools.keys())}")
-    except ImportError as e:
-        logger.error(f"Failed to import mail tools: {str(e)}")
+    if not HAS_MAIL_TOOLS:
+        logger.error("Failed to register mail tools: mail module not available")
+        return tools_dict
+    
+    mail_tools = _register_mail_tools({})
+    tools_dict.update(mail_tools)
+    logger.info(f"Registered mail tools: {list(mail_tools.keys())}")
     
     return tools_dict
 
 
-async def register_browser_tools(tools_dict: Dict[str, Callable]) -> Dict[str, Callable]:
+async def register_browser_tools(
+    tools_dict: Dict[str, Callable],
+    resources: Optional[AsyncExitStack] = None
+) -> Dict[str, Callable]:
     """
     Register browser tools.
     
+    Each call gets its own browser handler, so concurrent runs never drive
+    the same page.
+    
     Args:
         tools_dict: Existing tools dictionary to add to
+        resources: Optional exit stack of the run; the browser is closed
+            when it closes
         
     Returns:
         Updated tools dictionary
@@ -85,6 +107,8 @@ async def register_browser_tools(tools_dict: Dict[str, Callable]) -> Dict[str, C
         
         # Initialize browser tool handler
         browser_handler = BrowserToolHandler()
+        if resources is not None:
+            resources.push_async_callback(browser_handler.cleanup)
         
         # Create async wrapper function for each browser tool
         for tool in BROWSER_TOOLS:
@@ -1,6 +1,6 @@
 """Utility functions."""
 
-from .environment import setup_agent_environment, cleanup_agent_environment
+from .environment import setup_agent_environment, cleanup_agent_environment, touch_agent_environment
 from .logging import log_agent_start, log_agent_success, log_agent_error, log_agent_timeout
 
-__all__ = ["setup_agent_environment", "cleanup_agent_environment", "log_agent_start", "log_agent_success", "log_agent_error", "log_agent_timeout"]
\ No newline at end of file
+__all__ = ["setup_agent_environment", "cleanup_agent_environment", "touch_agent_environment", "log_agent_start", "log_agent_success", "log_agent_error", "log_agent_timeout"]
\ No newline at end of file
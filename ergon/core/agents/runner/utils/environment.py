@@ -3,39 +3,237 @@ Environment setup utilities for agent runner.
 """
 
 import os
+import time
+import hashlib
 import tempfile
 import logging
-from typing import List, Dict, Any
+import py_compile
+import shutil
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Tuple
 
 from ergon.core.database.engine import get_db_session
 from ergon.core.database.models import Agent, AgentFile
+from ergon.utils.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on threads used to write an agent's files
+MAX_WRITE_WORKERS = 32
+
+# Prefix of the shared, content-addressed agent environment directories,
+# named <prefix><agent id>_<files digest>
+CACHED_ENV_PREFIX = "ergon_agent_"
+
+# Permissions of shared environments once written, so no runner can change
+# files that other runners are using
+READ_ONLY_FILE_MODE = 0o444
+READ_ONLY_DIR_MODE = 0o555
+
+# Seconds a superseded environment is kept after its last use, so runners in
+# other processes do not lose their working directory while still active
+ENV_EVICTION_GRACE_PERIOD = 24 * 60 * 60
+
+# Environments held by live runners in this process, with their runner counts
+_environments_in_use: Counter = Counter()
+_environments_lock = threading.Lock()
+
+def _write_file(file_path: str, content: str) -> None:
+    """
+    Write one agent file to disk.
+    
+    Args:
+        file_path: Destination path; its directory must already exist
+        content: File content
+    """
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def _files_digest(files: List[Tuple[str, str]]) -> str:
+    """
+    Hash an agent's files into a stable environment key.
+    
+    Args:
+        files: (filename, content) pairs
+        
+    Returns:
+        Hex SHA-256 digest of the sorted files
+    """
+    digest = hashlib.sha256()
+    for filename, content in sorted(files):
+        digest.update(filename.encode("utf-8") + b"\0")
+        digest.update(content.encode("utf-8") + b"\0")
+    return digest.hexdigest()
+
+
+def _write_files(working_dir: str, files: List[Tuple[str, str]]) -> None:
+    """
+    Write an agent's files into a directory.
+    
+    Args:
+        working_dir: Directory to write into
+        files: (filename, content) pairs
+    """
+    paths = [(os.path.join(working_dir, filename), content) for filename, content in files]
+    
+    # Create each directory once
+    for directory in {os.path.dirname(file_path) for file_path, _ in paths}:
+        os.makedirs(directory, exist_ok=True)
+    
+    # Write files to disk, in parallel when there are several
+    if len(paths) > 1:
+        with ThreadPoolExecutor(max_workers=min(MAX_WRITE_WORKERS, len(paths))) as executor:
+            list(executor.map(lambda file: _write_file(*file), paths))
+    else:
+        for file_path, content in paths:
+            _write_file(file_path, content)
+    
+    # Compile the tool module up front so loads can use the cached bytecode
+    tools_path = os.path.join(working_dir, "agent_tools.py")
+    if os.path.exists(tools_path):
+        try:
+            py_compile.compile(tools_path, doraise=True)
+        except py_compile.PyCompileError as e:
+            logger.warning(f"Failed to compile {tools_path}: {str(e)}")
+
+
+def _set_permissions(path: str, dir_mode: int, file_mode: int) -> None:
+    """
+    Set the permissions of a directory tree.
+    
+    Args:
+        path: Root of the tree
+        dir_mode: Mode for the root and every directory below it
+        file_mode: Mode for every file
+    """
+    # Bottom-up, so each directory is listed before its mode changes
+    for root, dirs, files in os.walk(path, topdown=False):
+        for filename in files:
+            os.chmod(os.path.join(root, filename), file_mode)
+        os.chmod(root, dir_mode)
+
+
+def _remove_environment(working_dir: str) -> None:
+    """
+    Delete a shared environment, read-only files included.
+    
+    Args:
+        working_dir: Environment directory
+    """
+    try:
+        # Files can only be unlinked from writable directories
+        os.chmod(working_dir, 0o755)
+        for root, dirs, _ in os.walk(working_dir):
+            for dirname in dirs:
+                os.chmod(os.path.join(root, dirname), 0o755)
+    except OSError as e:
+        logger.warning(f"Failed to make {working_dir} writable: {str(e)}")
+    shutil.rmtree(working_dir, ignore_errors=True)
+
+
+def touch_agent_environment(working_dir: str) -> None:
+    """
+    Record a use of a shared environment, which delays its eviction.
+    
+    Args:
+        working_dir: Environment directory
+    """
+    try:
+        os.utime(working_dir)
+    except OSError as e:
+        logger.debug(f"Failed to update the last use of {working_dir}: {str(e)}")
+
+
+def _acquire_environment(working_dir: str) -> None:
+    """Mark an environment as used by a runner in this process."""
+    with _environments_lock:
+        _environments_in_use[working_dir] += 1
+    touch_agent_environment(working_dir)
+
+
+def _release_environment(working_dir: str) -> None:
+    """Drop a runner's hold on an environment taken by _acquire_environment()."""
+    with _environments_lock:
+        _environments_in_use[working_dir] -= 1
+        if _environments_in_use[working_dir] <= 0:
+            del _environments_in_use[working_dir]
+
+
+def _evict_superseded_environments(env_root: str, agent_id: int, working_dir: str) -> None:
+    """
+    Remove an agent's environments for earlier versions of its files.
+    
+    Environments held by a runner in this process, or used by any runner
+    within ENV_EVICTION_GRACE_PERIOD, are kept.
+    
+    Args:
+        env_root: Directory holding the environments
+        agent_id: Agent ID
+        working_dir: The agent's current environment, which is kept
+    """
+    prefix = f"{CACHED_ENV_PREFIX}{agent_id}_"
+    cutoff = time.time() - ENV_EVICTION_GRACE_PERIOD
+    for entry in os.scandir(env_root):
+        if not entry.name.startswith(prefix) or entry.path == working_dir or not entry.is_dir():
+            continue
+        
+        with _environments_lock:
+            in_use = entry.path in _environments_in_use
+        if in_use or entry.stat().st_mtime > cutoff:
+            continue
+        
+        _remove_environment(entry.path)
+        logger.info(f"Removed superseded environment: {entry.path}")
+
+
 def setup_agent_environment(agent: Agent) -> str:
     """
     Set up the agent's execution environment.
     
+    Environments are content-addressed: agents whose files are unchanged
+    reuse the directory written by an earlier run instead of writing and
+    compiling the same files again. Shared directories are read-only, and
+    writing a new version of an agent's files removes old versions that no
+    runner has used for ENV_EVICTION_GRACE_PERIOD. The returned directory
+    is held until cleanup_agent_environment() is called for it.
+    
     Args:
         agent: Agent to set up environment for
         
     Returns:
         Path to the agent's working directory
     """
-    # Create temporary directory for agent
-    working_dir = tempfile.mkdtemp(prefix=f"ergon_{agent.name}_")
-    
     # Get agent files from database
     with get_db_session() as db:
-        files = db.query(AgentFile).filter(AgentFile.agent_id == agent.id).all()
-        
-        # Write files to disk
-        for file in files:
-            file_path = os.path.join(working_dir, file.filename)
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(file.content)
+        files = db.query(AgentFile.filename, AgentFile.content).filter(
+            AgentFile.agent_id == agent.id
+        ).all()
+    files = [(filename, content) for filename, content in files]
+    
+    env_root = os.path.join(settings.data_dir, "agent_environments")
+    working_dir = os.path.join(env_root, f"{CACHED_ENV_PREFIX}{agent.id}_{_files_digest(files)}")
+    if os.path.isdir(working_dir):
+        _acquire_environment(working_dir)
+        logger.info(f"Reusing environment for agent '{agent.name}' in '{working_dir}'")
+        return working_dir
+    
+    # Write into a private directory and move it into place in one step, so
+    # other runners never see a partially written environment
+    os.makedirs(env_root, exist_ok=True)
+    staging_dir = tempfile.mkdtemp(prefix=f"ergon_{agent.name}_", dir=env_root)
+    _write_files(staging_dir, files)
+    _set_permissions(staging_dir, READ_ONLY_DIR_MODE, READ_ONLY_FILE_MODE)
+    try:
+        os.rename(staging_dir, working_dir)
+    except OSError:
+        # Another runner created the same environment first
+        _remove_environment(staging_dir)
+    
+    _acquire_environment(working_dir)
+    _evict_superseded_environments(env_root, agent.id, working_dir)
     
     logger.info(f"Set up environment for agent '{agent.name}' in '{working_dir}'")
     return working_dir
@@ -45,11 +243,16 @@ def cleanup_agent_environment(working_dir: str) -> None:
     """
     Clean up the agent's execution environment.
     
+    Shared content-addressed environments are left in place for other
+    runners of the same agent files; the runner's hold on them is released.
+    
     Args:
         working_dir: Path to the agent's working directory
     """
-    if os.path.exists(working_dir):
-        import shutil
+    if os.path.basename(working_dir).startswith(CACHED_ENV_PREFIX):
+        _release_environment(working_dir)
+        logger.debug(f"Keeping shared working directory: {working_dir}")
+    elif os.path.exists(working_dir):
         shutil.rmtree(working_dir)
         logger.info(f"Removed working directory: {working_dir}")
     else:
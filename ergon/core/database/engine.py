@@ -2,11 +2,12 @@
 Database engine and session management for Ergon.
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.ext.declarative import declarative_base
 from contextlib import contextmanager
-from typing import Generator, Any
+from typing import Generator, Any, Dict
 import os
 
 from ergon.utils.config.settings import settings
@@ -14,13 +15,66 @@ from ergon.utils.config.settings import settings
 # Import Base from base module
 from ergon.core.database.base import Base
 
-# Create engine
-engine = create_engine(
-    settings.database_url,
-    echo=settings.debug,
-    connect_args={"check_same_thread": False} if settings.database_url.startswith("sqlite") else {}
+# Connection pool sizing for concurrent agent runs
+DB_POOL_SIZE = 10
+DB_MAX_OVERFLOW = 20
+
+# Pragmas applied to each new SQLite connection: write-ahead logging with
+# fsync only at checkpoints, in-memory temp tables, 256 MB of memory-mapped
+# I/O and a 64 MB page cache
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "mmap_size=268435456",
+    "cache_size=-65536",
 )
 
+
+def _engine_options(database_url: str) -> Dict[str, Any]:
+    """
+    Build create_engine options for a database URL.
+    
+    File and server databases get a sized QueuePool with pre-ping, so
+    sessions reuse live connections; in-memory SQLite keeps its default
+    single-connection pool.
+    
+    Args:
+        database_url: SQLAlchemy database URL
+        
+    Returns:
+        Keyword arguments for create_engine
+    """
+    options: Dict[str, Any] = {"echo": settings.debug}
+    
+    if database_url.startswith("sqlite"):
+        options["connect_args"] = {"check_same_thread": False}
+        if ":memory:" in database_url or database_url.rstrip("/") == "sqlite:":
+            return options
+    
+    options.update(
+        poolclass=QueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_pre_ping=True
+    )
+    return options
+
+
+# Create engine
+engine = create_engine(settings.database_url, **_engine_options(settings.database_url))
+
+if settings.database_url.startswith("sqlite"):
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+        """Tune each new SQLite connection for concurrent writes."""
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in SQLITE_PRAGMAS:
+                cursor.execute(f"PRAGMA {pragma}")
+        finally:
+            cursor.close()
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 ScopedSession = scoped_session(SessionLocal)
@@ -36,9 +90,15 @@ def get_db() -> Generator:
 
 
 @contextmanager
-def get_db_session():
-    """Context manager for database session."""
-    session = ScopedSession()
+def get_db_session(scoped: bool = True):
+    """
+    Context manager for database session.
+    
+    Args:
+        scoped: Use the thread's scoped session; pass False for a private
+            session that is not shared with other code on the same thread
+    """
+    session = ScopedSession() if scoped else SessionLocal()
     try:
         yield session
     finally:
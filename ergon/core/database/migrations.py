@@ -29,6 +29,9 @@ from ergon.utils.config.settings import settings
 logger = logging.getLogger(__name__)
 logger.setLevel(getattr(logging, settings.log_level.value))
 
+# Revisions shipped with Ergon, applied together with locally created ones
+PACKAGED_VERSIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "versions")
+
 
 class MigrationManager:
     """
@@ -261,6 +264,28 @@ else:
         with open(env_py_path, "w") as f:
             f.write(env_py_template)
     
+    def _get_config(self) -> Config:
+        """
+        Load the Alembic configuration.
+        
+        Revisions are read from the packaged versions directory as well as
+        the local one; new revisions are only ever written locally.
+        
+        Returns:
+            Alembic configuration
+        """
+        alembic_cfg = Config(self.alembic_ini_path)
+        alembic_cfg.set_main_option("version_path_separator", "os")
+        alembic_cfg.set_main_option(
+            "version_locations",
+            os.pathsep.join([PACKAGED_VERSIONS_DIR, self._local_versions_dir()])
+        )
+        return alembic_cfg
+    
+    def _local_versions_dir(self) -> str:
+        """Get the directory of locally created revisions."""
+        return os.path.join(self.migrations_dir, "versions")
+    
     def init(self) -> bool:
         """
         Initialize migrations.
@@ -269,7 +294,7 @@ else:
             True if successful
         """
         try:
-            alembic_cfg = Config(self.alembic_ini_path)
+            alembic_cfg = self._get_config()
             command.init(alembic_cfg, self.migrations_dir, template='generic')
             return True
         except Exception as e:
@@ -280,6 +305,9 @@ else:
         """
         Create a new migration.
         
+        The revision is based on every current head, so it also merges the
+        packaged revisions with any local ones and leaves a single head.
+        
         Args:
             message: Migration message
             
@@ -287,8 +315,14 @@ else:
             Migration revision ID
         """
         try:
-            alembic_cfg = Config(self.alembic_ini_path)
-            revision = command.revision(alembic_cfg, message=message, autogenerate=True)
+            alembic_cfg = self._get_config()
+            revision = command.revision(
+                alembic_cfg,
+                message=message,
+                autogenerate=True,
+                head="heads",
+                version_path=self._local_versions_dir()
+            )
             return revision.revision
         except Exception as e:
             logger.error(f"Error creating migration: {e}")
@@ -299,14 +333,15 @@ else:
         Upgrade database to revision.
         
         Args:
-            revision: Target revision
+            revision: Target revision; "head" upgrades both the packaged
+                and the local revisions to their latest
             
         Returns:
             True if successful
         """
         try:
-            alembic_cfg = Config(self.alembic_ini_path)
-            command.upgrade(alembic_cfg, revision)
+            alembic_cfg = self._get_config()
+            command.upgrade(alembic_cfg, "heads" if revision == "head" else revision)
             return True
         except Exception as e:
             logger.error(f"Error upgrading database: {e}")
@@ -323,7 +358,7 @@ else:
             True if successful
         """
         try:
-            alembic_cfg = Config(self.alembic_ini_path)
+            alembic_cfg = self._get_config()
             command.downgrade(alembic_cfg, revision)
             return True
         except Exception as e:
@@ -335,16 +370,18 @@ else:
         Get current database revision.
         
         Returns:
-            Current revision
+            Current revision, or the current heads separated by commas
+            while the packaged and local revisions are not yet merged
         """
         try:
-            alembic_cfg = Config(self.alembic_ini_path)
+            alembic_cfg = self._get_config()
             script = ScriptDirectory.from_config(alembic_cfg)
             
             with EnvironmentContext(alembic_cfg, script) as env:
                 conn = engine.connect()
                 env.configure(connection=conn, target_metadata=None)
-                return env.get_current_revision() or "None"
+                heads = env.get_context().get_current_heads()
+                return ",".join(sorted(heads)) or "None"
         except Exception as e:
             logger.error(f"Error getting current revision: {e}")
             return "Unknown"
@@ -357,9 +394,9 @@ else:
             List of migration data
         """
         try:
-            alembic_cfg = Config(self.alembic_ini_path)
+            alembic_cfg = self._get_config()
             script = ScriptDirectory.from_config(alembic_cfg)
-            current = self.get_current_revision()
+            current = set(self.get_current_revision().split(","))
             
             migrations = []
             for sc in script.walk_revisions():
@@ -367,7 +404,7 @@ else:
                     "revision": sc.revision,
                     "down_revision": sc.down_revision,
                     "message": sc.doc,
-                    "is_current": sc.revision == current,
+                    "is_current": sc.revision in current,
                     "date": sc.date,
                 })
             
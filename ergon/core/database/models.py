@@ -1,7 +1,8 @@
 """Database models for Ergon."""
+import re
 import enum
 from sqlalchemy import Column, Integer, String, ForeignKey, Text, Boolean, DateTime, JSON, Enum, Table, Float
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 
 # Import Base from the base module
@@ -38,6 +39,31 @@ class ComponentType(enum.Enum):
     TOOL = "tool"
     WORKFLOW = "workflow"
 
+# Name keywords that mark an agent as a special type
+AGENT_NAME_TYPE_RE = re.compile(r"e?mail|browser|github|nexus")
+
+# Agent type for each name keyword
+AGENT_NAME_TYPES = {
+    "mail": "mail",
+    "email": "mail",
+    "browser": "browser",
+    "github": "github",
+    "nexus": "nexus",
+}
+
+def infer_agent_type(name: str) -> str:
+    """
+    Infer an agent type from keywords in the agent name.
+    
+    Args:
+        name: Agent name
+        
+    Returns:
+        Agent type, or "standard" if the name has no type keyword
+    """
+    match = AGENT_NAME_TYPE_RE.search(name.lower())
+    return AGENT_NAME_TYPES[match.group()] if match else "standard"
+
 class Agent(Base):
     """Agent model representing an AI agent instance."""
     __tablename__ = 'agents'
@@ -46,6 +72,7 @@ class Agent(Base):
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     agent_type = Column(Enum(AgentType), default=AgentType.CUSTOM)
+    type = Column(String(32), nullable=False, default="standard", server_default="standard", index=True)
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
     
@@ -57,6 +84,12 @@ class Agent(Base):
     tools = relationship("Tool", secondary=agent_tool, back_populates="agents")
     components = relationship("Component", secondary=agent_component, back_populates="agents")
     memories = relationship("Memory", back_populates="agent")
+    
+    def __init__(self, **kwargs):
+        # Infer the type from the name once, so reads never rescan it
+        if kwargs.get("type") is None:
+            kwargs["type"] = infer_agent_type(kwargs.get("name") or "")
+        super().__init__(**kwargs)
 
 class Tool(Base):
     """Tool model representing a function an agent can use."""
@@ -79,7 +112,7 @@ class AgentFile(Base):
     id = Column(Integer, primary_key=True)
     agent_id = Column(Integer, ForeignKey('agents.id'))
     filename = Column(String(255), nullable=False)
-    content = Column(Text, nullable=False)
+    content = deferred(Column(Text, nullable=False))  # Loaded on access or with undefer()
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -128,6 +161,11 @@ class AgentMessage(Base):
     content = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    # Tool call details, for messages with the tool role
+    tool_name = Column(String(255), nullable=True)
+    tool_input = Column(Text, nullable=True)
+    tool_output = Column(Text, nullable=True)
+    
     # Relationships
     execution = relationship("AgentExecution", back_populates="messages")
 
@@ -163,7 +201,7 @@ class DocumentationPage(Base):
     
     id = Column(Integer, primary_key=True)
     title = Column(String(255), nullable=False)
-    content = Column(Text, nullable=False)
+    content = deferred(Column(Text, nullable=False))  # Loaded on access or with undefer()
     source = Column(String(255), nullable=True)
     url = Column(String(1024), nullable=True)
     category = Column(String(255), nullable=True)
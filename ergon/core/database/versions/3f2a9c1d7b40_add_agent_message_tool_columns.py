@@ -0,0 +1,51 @@
+"""
+Add tool call columns to agent messages.
+
+Revision ID: 3f2a9c1d7b40
+Revises:
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f2a9c1d7b40'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# Columns recording a tool call on its agent message
+TOOL_COLUMNS = (
+    ('tool_name', sa.String(255)),
+    ('tool_input', sa.Text()),
+    ('tool_output', sa.Text()),
+)
+
+
+def upgrade():
+    # Tables not created yet get the columns from init_db()
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('agent_messages'):
+        return
+    
+    # Databases created by init_db() already have the columns
+    existing = {column['name'] for column in inspector.get_columns('agent_messages')}
+    with op.batch_alter_table('agent_messages') as batch_op:
+        for name, type_ in TOOL_COLUMNS:
+            if name not in existing:
+                batch_op.add_column(sa.Column(name, type_, nullable=True))
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('agent_messages'):
+        return
+    
+    existing = {column['name'] for column in inspector.get_columns('agent_messages')}
+    with op.batch_alter_table('agent_messages') as batch_op:
+        for name, _ in reversed(TOOL_COLUMNS):
+            if name in existing:
+                batch_op.drop_column(name)
@@ -0,0 +1,88 @@
+"""
+Add the stored agent type column.
+
+Revision ID: 8b61d0e4c5a2
+Revises: 3f2a9c1d7b40
+Create Date: 2026-10-17 12:30:00.000000
+
+"""
+
+import re
+from collections import defaultdict
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b61d0e4c5a2'
+down_revision = '3f2a9c1d7b40'
+branch_labels = None
+depends_on = None
+
+# Name keywords and their agent types as of this revision, frozen here so
+# the backfill does not change with ergon.core.database.models
+AGENT_NAME_TYPE_RE = re.compile(r"e?mail|browser|github|nexus")
+AGENT_NAME_TYPES = {
+    "mail": "mail",
+    "email": "mail",
+    "browser": "browser",
+    "github": "github",
+    "nexus": "nexus",
+}
+
+# Lightweight view of the agents table for the backfill
+agents = sa.table(
+    'agents',
+    sa.column('id', sa.Integer),
+    sa.column('name', sa.String),
+    sa.column('type', sa.String),
+)
+
+
+def infer_agent_type(name):
+    match = AGENT_NAME_TYPE_RE.search(name.lower())
+    return AGENT_NAME_TYPES[match.group()] if match else 'standard'
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    
+    # Tables not created yet get the column from init_db()
+    if not inspector.has_table('agents'):
+        return
+    
+    # Databases created by init_db() already have the column
+    if 'type' in {column['name'] for column in inspector.get_columns('agents')}:
+        return
+    
+    with op.batch_alter_table('agents') as batch_op:
+        batch_op.add_column(
+            sa.Column('type', sa.String(32), nullable=False, server_default='standard')
+        )
+        batch_op.create_index('ix_agents_type', ['type'])
+    
+    # Infer the type of existing agents from their names, one UPDATE per type
+    ids_by_type = defaultdict(list)
+    for agent_id, name in bind.execute(sa.select(agents.c.id, agents.c.name)):
+        agent_type = infer_agent_type(name or "")
+        if agent_type != 'standard':
+            ids_by_type[agent_type].append(agent_id)
+    
+    for agent_type, ids in ids_by_type.items():
+        bind.execute(agents.update().where(agents.c.id.in_(ids)).values(type=agent_type))
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('agents'):
+        return
+    if 'type' not in {column['name'] for column in inspector.get_columns('agents')}:
+        return
+    
+    indexes = {index['name'] for index in inspector.get_indexes('agents')}
+    with op.batch_alter_table('agents') as batch_op:
+        if 'ix_agents_type' in indexes:
+            batch_op.drop_index('ix_agents_type')
+        batch_op.drop_column('type')
@@ -0,0 +1 @@
+"""Alembic revisions shipped with Ergon, see MigrationManager."""
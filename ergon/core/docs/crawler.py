@@ -19,6 +19,8 @@ import logging
 from urllib.parse import urljoin, urlparse
 from pathlib import Path
 
+from sqlalchemy import insert
+
 from ergon.core.database.engine import get_db_session
 from ergon.core.database.models import DocumentationPage
 from ergon.core.vector_store.faiss_store import FAISSDocumentStore
@@ -28,6 +30,9 @@ from ergon.utils.config.settings import settings
 logger = logging.getLogger(__name__)
 logger.setLevel(getattr(logging, settings.log_level.value))
 
+# Pages written to the database and vector store per batch
+INSERT_BATCH_SIZE = 500
+
 
 class DocumentationCrawler:
     """
@@ -327,34 +332,41 @@ class DocumentationCrawler:
         # Crawl pages
         crawled_pages = await self.crawl()
         
-        # Store in database and vector store
+        # Store in database and vector store, a batch of pages at a time
         with get_db_session() as db:
-            for page_data in crawled_pages:
-                # Create database record
-                doc_page = DocumentationPage(
-                    title=page_data["title"],
-                    content=page_data["content"],
-                    url=page_data["url"],
-                    source=page_data["source"],
-                )
-                db.add(doc_page)
+            for start in range(0, len(crawled_pages), INSERT_BATCH_SIZE):
+                batch = crawled_pages[start:start + INSERT_BATCH_SIZE]
+                
+                # Insert the batch in one multi-row INSERT, getting the IDs back in order
+                page_ids = db.scalars(
+                    insert(DocumentationPage).returning(
+                        DocumentationPage.id, sort_by_parameter_order=True
+                    ),
+                    [
+                        {
+                            "title": page_data["title"],
+                            "content": page_data["content"],
+                            "url": page_data["url"],
+                            "source": page_data["source"],
+                        }
+                        for page_data in batch
+                    ]
+                ).all()
                 db.commit()
-                db.refresh(doc_page)
                 
                 # Add to vector store
-                doc_id = self.vector_store.add_documents([{
-                    "id": f"doc_{doc_page.id}",
-                    "content": page_data["content"],
-                    "metadata": {
-                        "title": page_data["title"],
-                        "url": page_data["url"],
-                        "source": page_data["source"],
+                self.vector_store.add_documents([
+                    {
+                        "id": f"doc_{page_id}",
+                        "content": page_data["content"],
+                        "metadata": {
+                            "title": page_data["title"],
+                            "url": page_data["url"],
+                            "source": page_data["source"],
+                        }
                     }
-                }])[0]
-                
-                # Update database record with vector ID
-                doc_page.embedding_id = doc_id
-                db.commit()
+                    for page_id, page_data in zip(page_ids, batch)
+                ])
         
         return len(crawled_pages)
 
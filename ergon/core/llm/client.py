@@ -8,15 +8,28 @@ LLM providers through the Rhetor LLM adapter.
 import os
 import json
 import asyncio
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional, Union, Callable, AsyncGenerator
+import threading
+import weakref
+from collections import OrderedDict
+from functools import lru_cache, partial
+from typing import Dict, Any, List, Optional, Union, Callable, AsyncGenerator, Tuple
 from enum import Enum
 import httpx
 
 from ergon.utils.config.settings import settings
+from ergon.utils import fast_json
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 support in httpx needs the optional h2 package
+try:
+    import h2
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
 class LLMProvider(str, Enum):
     """Enum for supported LLM providers."""
     OPENAI = "openai"
@@ -42,6 +55,53 @@ class Message:
         return cls(data["role"], data["content"])
 
 
+# Direct implementations of complete, _send_completion and _send_stream per provider
+PROVIDER_METHODS = {
+    LLMProvider.OPENAI: ("_openai_complete", "_openai_acomplete", "_openai_stream"),
+    LLMProvider.ANTHROPIC: ("_anthropic_complete", "_anthropic_acomplete", "_anthropic_stream"),
+    LLMProvider.OLLAMA: ("_ollama_complete", "_ollama_acomplete", "_ollama_stream"),
+}
+
+# Prefixes marking each role in the single prompt sent to Ollama
+OLLAMA_ROLE_PREFIXES = {
+    "user": "User: ",
+    "assistant": "Assistant: ",
+    "system": "System: ",
+}
+
+# Connection pool and timeouts for Ollama; reads are unbounded because
+# local generations can legitimately take minutes
+OLLAMA_LIMITS = httpx.Limits(max_keepalive_connections=64, max_connections=128)
+OLLAMA_TIMEOUT = httpx.Timeout(connect=5.0, read=None, write=10.0, pool=5.0)
+OLLAMA_CONNECT_RETRIES = 2
+
+# Seconds between status checks of a provider batch, see acomplete_batch()
+BATCH_POLL_INTERVAL = 30.0
+
+
+@lru_cache(maxsize=256)
+def _detect_provider(model_name: str) -> Tuple[LLMProvider, str]:
+    """
+    Determine the provider of a model from its name.
+    
+    Args:
+        model_name: Model name, optionally prefixed with the provider
+        
+    Returns:
+        Provider and the model name to send to it
+    """
+    lowered_name = model_name.lower()
+    if "gpt" in lowered_name or model_name.startswith("openai/"):
+        return LLMProvider.OPENAI, model_name
+    if "claude" in lowered_name or model_name.startswith("anthropic/"):
+        return LLMProvider.ANTHROPIC, model_name
+    if "ollama" in lowered_name or "/" in model_name:
+        if model_name.startswith("ollama/"):
+            model_name = model_name.replace("ollama/", "")
+        return LLMProvider.OLLAMA, model_name
+    return LLMProvider.UNKNOWN, model_name
+
+
 class LLMClient:
     """
     Unified client for interacting with LLM providers through Rhetor.
@@ -50,6 +110,100 @@ class LLMClient:
     prompts to various LLM providers via the Rhetor adapter.
     """
     
+    # Maximum number of deterministic responses kept per client by acomplete()
+    RESPONSE_CACHE_SIZE = 512
+    
+    # Clients shared through get(), keyed by (model_name, temperature, max_tokens)
+    _shared_clients: Dict[Tuple[str, float, Optional[int]], "LLMClient"] = {}
+    
+    # Synchronous OpenAI and Anthropic SDK clients shared by all instances,
+    # keyed by (provider, API key)
+    _sdk_clients: Dict[Tuple[LLMProvider, str], Any] = {}
+    
+    # Async provider clients per event loop, shared by all instances on that
+    # loop and keyed by (provider, API key or server URL), see _loop_client()
+    _async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[LLMProvider, str], Any]]" = weakref.WeakKeyDictionary()
+    
+    # Per event loop limits on concurrent backend requests, see _request_limit()
+    _request_limits: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+    
+    @classmethod
+    def _request_limit(cls) -> asyncio.Semaphore:
+        """
+        Get the semaphore bounding concurrent backend requests.
+        
+        All clients running on an event loop share one limit of
+        settings.max_concurrent_llm_requests, so bursts of runners queue
+        locally instead of tripping provider rate limits.
+        
+        Returns:
+            Semaphore for the running event loop
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = cls._request_limits.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(settings.max_concurrent_llm_requests)
+            cls._request_limits[loop] = semaphore
+        return semaphore
+    
+    @classmethod
+    def _loop_client(cls, key: Tuple[LLMProvider, str], factory: Callable[[], Any]) -> Any:
+        """
+        Get the shared async client for a backend on the running event loop.
+        
+        Connection pools cannot move between event loops, so each loop gets
+        its own client, reused by every instance on that loop. Clients of
+        closed loops are dropped when a new loop asks for its first client.
+        
+        Args:
+            key: (provider, API key or server URL) identifying the backend
+            factory: Callable creating a new client for the backend
+            
+        Returns:
+            Async client bound to the running event loop
+        """
+        loop = asyncio.get_running_loop()
+        clients = cls._async_clients.get(loop)
+        if clients is None:
+            for closed_loop in [other for other in cls._async_clients if other.is_closed()]:
+                del cls._async_clients[closed_loop]
+            clients = cls._async_clients[loop] = {}
+        
+        # A closed httpx client is replaced; SDK clients are never closed here
+        client = clients.get(key)
+        if client is None or (isinstance(client, httpx.AsyncClient) and client.is_closed):
+            client = clients[key] = factory()
+        return client
+    
+    @classmethod
+    def get(
+        cls,
+        model_name: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> "LLMClient":
+        """
+        Get a shared client for the given model settings.
+        
+        Callers with the same settings reuse one client, and with it the
+        provider connections and Rhetor adapter, instead of each setting
+        up their own.
+        
+        Args:
+            model_name: Name of the model to use
+            temperature: Temperature for generation (0-1)
+            max_tokens: Maximum tokens to generate
+            
+        Returns:
+            Shared LLM client
+        """
+        key = (model_name or settings.default_model, temperature, max_tokens)
+        client = cls._shared_clients.get(key)
+        if client is None:
+            client = cls(model_name=model_name, temperature=temperature, max_tokens=max_tokens)
+            cls._shared_clients[key] = client
+        return client
+    
     def __init__(
         self, 
         model_name: Optional[str] = None,
@@ -72,17 +226,22 @@ class LLMClient:
         self.use_rhetor = use_rhetor
         self.rhetor_adapter = None
         
+        # Async client set on this instance, or how to get the shared one
+        # for the running event loop, see the async_client property
+        self._async_client = None
+        self._async_client_key: Optional[Tuple[LLMProvider, str]] = None
+        self._async_client_factory: Optional[Callable[[], Any]] = None
+        
+        # In-flight deterministic completions per event loop, and recent ones
+        # by request, see acomplete(); the cache is shared by every loop using
+        # this client, so it is only touched under its lock
+        self._inflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Future]]" = weakref.WeakKeyDictionary()
+        self._response_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._response_cache_lock = threading.Lock()
+        
         # Determine provider from model name
-        if "gpt" in self.model_name.lower() or self.model_name.startswith("openai/"):
-            self.provider = LLMProvider.OPENAI
-        elif "claude" in self.model_name.lower() or self.model_name.startswith("anthropic/"):
-            self.provider = LLMProvider.ANTHROPIC
-        elif "ollama" in self.model_name.lower() or "/" in self.model_name:
-            self.provider = LLMProvider.OLLAMA
-            if self.model_name.startswith("ollama/"):
-                self.model_name = self.model_name.replace("ollama/", "")
-        else:
-            self.provider = LLMProvider.UNKNOWN
+        self.provider, self.model_name = _detect_provider(self.model_name)
+        self._bind_provider()
         
         # Initialize clients
         if self.use_rhetor:
@@ -151,8 +310,13 @@ class LLMClient:
             if not settings.openai_api_key:
                 raise ValueError("OpenAI API key not configured.")
             
-            self.client = OpenAI(api_key=settings.openai_api_key)
-            self.async_client = AsyncOpenAI(api_key=settings.openai_api_key)
+            # Reuse the SDK clients, and their connection pools, across instances
+            key = (LLMProvider.OPENAI, settings.openai_api_key)
+            if key not in self._sdk_clients:
+                self._sdk_clients[key] = OpenAI(api_key=settings.openai_api_key)
+            self.client = self._sdk_clients[key]
+            self._async_client_key = key
+            self._async_client_factory = partial(AsyncOpenAI, api_key=settings.openai_api_key)
         except ImportError:
             raise ImportError("OpenAI package not installed. Install with 'pip install openai'.")
     
@@ -164,16 +328,65 @@ class LLMClient:
             if not settings.anthropic_api_key:
                 raise ValueError("Anthropic API key not configured.")
             
-            self.client = Anthropic(api_key=settings.anthropic_api_key)
-            self.async_client = AsyncAnthropic(api_key=settings.anthropic_api_key)
+            # Reuse the SDK clients, and their connection pools, across instances
+            key = (LLMProvider.ANTHROPIC, settings.anthropic_api_key)
+            if key not in self._sdk_clients:
+                self._sdk_clients[key] = Anthropic(api_key=settings.anthropic_api_key)
+            self.client = self._sdk_clients[key]
+            self._async_client_key = key
+            self._async_client_factory = partial(AsyncAnthropic, api_key=settings.anthropic_api_key)
         except ImportError:
             raise ImportError("Anthropic package not installed. Install with 'pip install anthropic'.")
     
     def _create_ollama_client(self):
         """Create Ollama client."""
         # For Ollama, we'll use httpx directly since there's no official Python client
-        self.client = httpx.Client(base_url=settings.ollama_base_url)
-        self.async_client = httpx.AsyncClient(base_url=settings.ollama_base_url)
+        self.client = httpx.Client(base_url=settings.ollama_base_url, timeout=OLLAMA_TIMEOUT)
+        self._async_client_key = (LLMProvider.OLLAMA, settings.ollama_base_url)
+        self._async_client_factory = partial(self._new_ollama_async_client, settings.ollama_base_url)
+    
+    @staticmethod
+    def _new_ollama_async_client(base_url: str) -> httpx.AsyncClient:
+        """
+        Create an async Ollama client with a keep-alive connection pool.
+        
+        Args:
+            base_url: Ollama server URL
+            
+        Returns:
+            Async HTTP client
+        """
+        return httpx.AsyncClient(
+            base_url=base_url,
+            timeout=OLLAMA_TIMEOUT,
+            transport=httpx.AsyncHTTPTransport(
+                http2=HAS_HTTP2,
+                limits=OLLAMA_LIMITS,
+                retries=OLLAMA_CONNECT_RETRIES
+            )
+        )
+    
+    @property
+    def async_client(self) -> Any:
+        """
+        Async provider client for the running event loop.
+        
+        Returns:
+            Client set on this instance, else the client shared on the running loop
+        """
+        if self._async_client is not None or self._async_client_factory is None:
+            return self._async_client
+        return self._loop_client(self._async_client_key, self._async_client_factory)
+    
+    @async_client.setter
+    def async_client(self, client: Any) -> None:
+        """
+        Set an async client for this instance only.
+        
+        Args:
+            client: Async provider client
+        """
+        self._async_client = client
     
     def _format_messages_for_provider(self, messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
         """Format messages for the specific provider."""
@@ -197,19 +410,10 @@ class LLMClient:
         elif self.provider == LLMProvider.OLLAMA:
             # Ollama doesn't distinguish between roles in its simplest API
             # We'll use the approach of prefixing messages with User: or Assistant:
-            combined_prompt = ""
-            for message in messages:
-                role_prefix = ""
-                if message["role"] == "user":
-                    role_prefix = "User: "
-                elif message["role"] == "assistant":
-                    role_prefix = "Assistant: "
-                elif message["role"] == "system":
-                    role_prefix = "System: "
-                
-                combined_prompt += f"{role_prefix}{message['content']}\n\n"
-            
-            return combined_prompt
+            return "".join(
+                f"{OLLAMA_ROLE_PREFIXES.get(message['role'], '')}{message['content']}\n\n"
+                for message in messages
+            )
     
     def complete(self, messages: List[Dict[str, str]]) -> str:
         """
@@ -227,52 +431,86 @@ class LLMClient:
             return asyncio.run(self.rhetor_adapter.complete(messages))
         
         # Legacy direct provider implementation, used as fallback
-        if self.provider == LLMProvider.OPENAI:
-            formatted_messages = self._format_messages_for_provider(messages)
-            
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=formatted_messages,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-            )
-            
-            return response.choices[0].message.content
-        
-        elif self.provider == LLMProvider.ANTHROPIC:
-            formatted_messages, system = self._format_messages_for_provider(messages)
-            
-            response = self.client.messages.create(
-                model=self.model_name,
-                messages=formatted_messages,
-                system=system,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-            )
-            
-            return response.content[0].text
-        
-        elif self.provider == LLMProvider.OLLAMA:
-            prompt = self._format_messages_for_provider(messages)
-            
-            response = self.client.post(
-                "/api/generate",
-                json={
-                    "model": self.model_name,
-                    "prompt": prompt,
-                    "temperature": self.temperature,
-                    "max_tokens": self.max_tokens,
-                    "stream": False,
-                },
-            )
-            
-            response.raise_for_status()
-            return response.json()["response"]
+        return self._provider_complete(messages)
     
     async def acomplete(self, messages: List[Dict[str, str]]) -> str:
         """
         Complete a conversation with the LLM (async).
         
+        At temperature 0, identical messages always get the same response,
+        so repeats are answered from an LRU cache of recent responses, and
+        concurrent identical calls on one event loop, such as runners of
+        the same agent sharing this client, are coalesced into a single
+        backend request.
+        
+        Args:
+            messages: List of message dictionaries
+        
+        Returns:
+            Generated text response
+        """
+        # Sampled completions are independent, so only deterministic ones are shared
+        if self.temperature != 0:
+            return await self._acomplete(messages)
+        
+        key = hashlib.sha256(fast_json.dumps_bytes(messages)).hexdigest()
+        with self._response_cache_lock:
+            cached = self._response_cache.get(key)
+            if cached is not None:
+                self._response_cache.move_to_end(key)
+        if cached is not None:
+            return cached
+        
+        # Futures are bound to their loop, so each loop coalesces its own requests
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight.get(loop)
+        if inflight is None:
+            inflight = self._inflight[loop] = {}
+        
+        future = inflight.get(key)
+        if future is None:
+            future = loop.create_task(self._acomplete(messages))
+            inflight[key] = future
+            future.add_done_callback(lambda done: self._finish_request(inflight, key, done))
+        
+        # Shield the shared request so one cancelled caller does not cancel it for the rest
+        return await asyncio.shield(future)
+    
+    def _finish_request(self, inflight: Dict[str, asyncio.Future], key: str, future: asyncio.Future) -> None:
+        """
+        Retire a deterministic request and cache its response.
+        
+        Args:
+            inflight: In-flight requests of the loop that ran the request
+            key: Request key
+            future: Completed backend request
+        """
+        inflight.pop(key, None)
+        if future.cancelled() or future.exception() is not None:
+            return
+        
+        with self._response_cache_lock:
+            self._response_cache[key] = future.result()
+            if len(self._response_cache) > self.RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+    
+    async def _acomplete(self, messages: List[Dict[str, str]]) -> str:
+        """
+        Send one completion request to the LLM backend.
+        
+        Args:
+            messages: List of message dictionaries
+        
+        Returns:
+            Generated text response
+        """
+        async with self._request_limit():
+            return await self._send_completion(messages)
+    
+    async def _send_completion(self, messages: List[Dict[str, str]]) -> str:
+        """
+        Send one completion request to the provider.
+        
         Args:
             messages: List of message dictionaries
         
@@ -284,137 +522,454 @@ class LLMClient:
             return await self.rhetor_adapter.acomplete(messages)
         
         # Legacy direct provider implementation, used as fallback
-        if self.provider == LLMProvider.OPENAI:
-            formatted_messages = self._format_messages_for_provider(messages)
-            
-            response = await self.async_client.chat.completions.create(
-                model=self.model_name,
-                messages=formatted_messages,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-            )
-            
-            return response.choices[0].message.content
+        return await self._provider_acomplete(messages)
+    
+    async def acomplete_batch(
+        self,
+        conversations: List[List[Dict[str, str]]],
+        poll_interval: float = BATCH_POLL_INTERVAL
+    ) -> List[Optional[str]]:
+        """
+        Complete many independent conversations as one provider batch (async).
         
-        elif self.provider == LLMProvider.ANTHROPIC:
+        For offline work such as bulk labelling or evaluations, where
+        results may take minutes to hours. With the direct OpenAI or
+        Anthropic clients the conversations go through the provider's batch
+        API, which is billed at a discount; otherwise they are sent as
+        ordinary concurrent completions.
+        
+        Args:
+            conversations: Message lists, one per completion
+            poll_interval: Seconds between batch status checks
+        
+        Returns:
+            Responses in the order of conversations, None where a request failed
+        """
+        if not conversations:
+            return []
+        
+        if not (self.use_rhetor and self.rhetor_adapter):
+            if self.provider == LLMProvider.ANTHROPIC:
+                return await self._anthropic_batch(conversations, poll_interval)
+            if self.provider == LLMProvider.OPENAI:
+                return await self._openai_batch(conversations, poll_interval)
+        
+        results = await asyncio.gather(
+            *(self.acomplete(messages) for messages in conversations),
+            return_exceptions=True
+        )
+        return [None if isinstance(result, BaseException) else result for result in results]
+    
+    async def _anthropic_batch(
+        self,
+        conversations: List[List[Dict[str, str]]],
+        poll_interval: float
+    ) -> List[Optional[str]]:
+        """
+        Run conversations through the Anthropic Message Batches API.
+        
+        Args:
+            conversations: Message lists, one per completion
+            poll_interval: Seconds between batch status checks
+        
+        Returns:
+            Responses in the order of conversations, None where a request failed
+        """
+        requests = []
+        for index, messages in enumerate(conversations):
             formatted_messages, system = self._format_messages_for_provider(messages)
+            params = {
+                "model": self.model_name,
+                "messages": formatted_messages,
+                "temperature": self.temperature,
+                "max_tokens": self.max_tokens or 4096,
+            }
             
-            response = await self.async_client.messages.create(
-                model=self.model_name,
-                messages=formatted_messages,
-                system=system,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens or 4096,
-            )
-            
-            return response.content[0].text
+            # The Messages API rejects a null system prompt
+            if system:
+                params["system"] = system
+            requests.append({"custom_id": str(index), "params": params})
         
-        elif self.provider == LLMProvider.OLLAMA:
-            prompt = self._format_messages_for_provider(messages)
-            
-            response = await self.async_client.post(
-                "/api/generate",
-                json={
+        batch = await self.async_client.messages.batches.create(requests=requests)
+        while batch.processing_status != "ended":
+            await asyncio.sleep(poll_interval)
+            batch = await self.async_client.messages.batches.retrieve(batch.id)
+        
+        responses: List[Optional[str]] = [None] * len(conversations)
+        async for entry in await self.async_client.messages.batches.results(batch.id):
+            if entry.result.type == "succeeded":
+                responses[int(entry.custom_id)] = entry.result.message.content[0].text
+            else:
+                logger.warning(f"Batch request {entry.custom_id} did not succeed: {entry.result.type}")
+        return responses
+    
+    async def _openai_batch(
+        self,
+        conversations: List[List[Dict[str, str]]],
+        poll_interval: float
+    ) -> List[Optional[str]]:
+        """
+        Run conversations through the OpenAI Batch API.
+        
+        Args:
+            conversations: Message lists, one per completion
+            poll_interval: Seconds between batch status checks
+        
+        Returns:
+            Responses in the order of conversations, None where a request failed
+        """
+        lines = []
+        for index, messages in enumerate(conversations):
+            lines.append(fast_json.dumps({
+                "custom_id": str(index),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
                     "model": self.model_name,
-                    "prompt": prompt,
+                    "messages": self._format_messages_for_provider(messages),
                     "temperature": self.temperature,
                     "max_tokens": self.max_tokens,
-                    "stream": False,
-                },
-            )
-            
-            response.raise_for_status()
-            return response.json()["response"]
+                }
+            }))
+        
+        input_file = await self.async_client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = await self.async_client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(poll_interval)
+            batch = await self.async_client.batches.retrieve(batch.id)
+        
+        responses: List[Optional[str]] = [None] * len(conversations)
+        if not batch.output_file_id:
+            logger.error(f"OpenAI batch {batch.id} ended with status '{batch.status}' and no output")
+            return responses
+        
+        output = await self.async_client.files.content(batch.output_file_id)
+        for line in output.text.splitlines():
+            if not line:
+                continue
+            entry = fast_json.loads(line)
+            response = entry.get("response") or {}
+            if response.get("status_code") == 200:
+                responses[int(entry["custom_id"])] = response["body"]["choices"][0]["message"]["content"]
+            else:
+                logger.warning(f"Batch request {entry['custom_id']} failed: {entry.get('error')}")
+        return responses
     
     async def acomplete_stream(
         self, 
         messages: List[Dict[str, str]], 
-        callback: Optional[Callable[[str], None]] = None
+        callback: Optional[Callable[[str], None]] = None,
+        batch_interval_ms: float = 50,
+        batch_max_chars: int = 512
     ) -> AsyncGenerator[str, None]:
         """
         Stream a completion from the LLM (async).
         
+        Provider tokens are coalesced into larger chunks, so consumers pay
+        their per-chunk overhead once per batch instead of once per token.
+        A batch is emitted batch_interval_ms after its first token, even if
+        the model pauses, or earlier once it reaches batch_max_chars, and at
+        the end of the stream. The provider stream is read by a background
+        task, so the request limit is released as soon as the provider is
+        done, however slowly the chunks are consumed.
+        
         Args:
             messages: List of message dictionaries
             callback: Optional callback function to receive chunks
+            batch_interval_ms: Longest time to hold tokens back, in milliseconds
+            batch_max_chars: Size at which a batch is emitted early
         
         Yields:
             Generated text chunks
         """
+        loop = asyncio.get_running_loop()
+        interval = batch_interval_ms / 1000
+        buffer: List[str] = []
+        buffered_chars = 0
+        deadline = 0.0
+        
+        tokens: asyncio.Queue = asyncio.Queue()
+        reader = asyncio.create_task(self._read_stream(messages, tokens))
+        try:
+            while True:
+                if not tokens.empty():
+                    token = tokens.get_nowait()
+                elif buffer:
+                    try:
+                        token = await asyncio.wait_for(tokens.get(), deadline - loop.time())
+                    except asyncio.TimeoutError:
+                        token = ""
+                else:
+                    token = await tokens.get()
+                
+                if token is None:
+                    break
+                if token:
+                    if not buffer:
+                        deadline = loop.time() + interval
+                    buffer.append(token)
+                    buffered_chars += len(token)
+                if not buffer or (buffered_chars < batch_max_chars and loop.time() < deadline):
+                    continue
+                
+                chunk = "".join(buffer)
+                buffer.clear()
+                buffered_chars = 0
+                if callback:
+                    callback(chunk)
+                yield chunk
+            
+            if buffer:
+                chunk = "".join(buffer)
+                if callback:
+                    callback(chunk)
+                yield chunk
+            
+            # Raise any error that ended the provider stream
+            await reader
+        finally:
+            if not reader.done():
+                reader.cancel()
+                await asyncio.gather(reader, return_exceptions=True)
+    
+    async def _read_stream(self, messages: List[Dict[str, str]], tokens: asyncio.Queue) -> None:
+        """
+        Read a provider stream into a queue within the request limit.
+        
+        Args:
+            messages: List of message dictionaries
+            tokens: Queue receiving each token, then None when the stream ends
+        """
+        try:
+            async with self._request_limit():
+                async for token in self._send_stream(messages):
+                    tokens.put_nowait(token)
+        finally:
+            tokens.put_nowait(None)
+    
+    def _send_stream(
+        self, 
+        messages: List[Dict[str, str]], 
+        callback: Optional[Callable[[str], None]] = None
+    ) -> AsyncGenerator[str, None]:
+        """
+        Stream a completion from the provider.
+        
+        Args:
+            messages: List of message dictionaries
+            callback: Optional callback function to receive chunks
+        
+        Returns:
+            Async generator of text chunks
+        """
         # Use Rhetor adapter if available
         if self.use_rhetor and self.rhetor_adapter:
-            async for chunk in self.rhetor_adapter.acomplete_stream(messages, callback):
-                yield chunk
-            return
+            return self.rhetor_adapter.acomplete_stream(messages, callback)
         
         # Legacy direct provider implementation, used as fallback
-        if self.provider == LLMProvider.OPENAI:
-            formatted_messages = self._format_messages_for_provider(messages)
-            
-            stream = await self.async_client.chat.completions.create(
-                model=self.model_name,
-                messages=formatted_messages,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-                stream=True,
-            )
-            
-            async for chunk in stream:
-                if chunk.choices and chunk.choices[0].delta.content:
-                    content = chunk.choices[0].delta.content
-                    if callback:
-                        callback(content)
-                    yield content
+        return self._provider_stream(messages, callback)
+    
+    def _bind_provider(self) -> None:
+        """
+        Bind the direct provider implementations for this client's provider.
         
-        elif self.provider == LLMProvider.ANTHROPIC:
-            formatted_messages, system = self._format_messages_for_provider(messages)
-            
-            stream = await self.async_client.messages.create(
-                model=self.model_name,
-                messages=formatted_messages,
-                system=system,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-                stream=True,
-            )
-            
-            async for chunk in stream:
-                if chunk.type == "content_block_delta" and chunk.delta.text:
-                    content = chunk.delta.text
-                    if callback:
-                        callback(content)
-                    yield content
+        The provider is fixed for the life of a client, so it is resolved
+        here once instead of being dispatched on every call.
+        """
+        names = PROVIDER_METHODS.get(self.provider, ("_unknown_provider",) * 3)
+        self._provider_complete, self._provider_acomplete, self._provider_stream = (
+            getattr(self, name) for name in names
+        )
+    
+    def _openai_complete(self, messages: List[Dict[str, str]]) -> str:
+        """Complete a conversation with OpenAI."""
+        response = self.client.chat.completions.create(
+            model=self.model_name,
+            messages=self._format_messages_for_provider(messages),
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+        )
         
-        elif self.provider == LLMProvider.OLLAMA:
-            prompt = self._format_messages_for_provider(messages)
-            
-            response = await self.async_client.post(
-                "/api/generate",
-                json={
-                    "model": self.model_name,
-                    "prompt": prompt,
-                    "temperature": self.temperature,
-                    "max_tokens": self.max_tokens,
-                    "stream": True,
-                },
-                headers={"Accept": "application/x-ndjson"},
-            )
-            
+        return response.choices[0].message.content
+    
+    async def _openai_acomplete(self, messages: List[Dict[str, str]]) -> str:
+        """Complete a conversation with OpenAI (async)."""
+        response = await self.async_client.chat.completions.create(
+            model=self.model_name,
+            messages=self._format_messages_for_provider(messages),
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+        )
+        
+        return response.choices[0].message.content
+    
+    async def _openai_stream(
+        self,
+        messages: List[Dict[str, str]],
+        callback: Optional[Callable[[str], None]] = None
+    ) -> AsyncGenerator[str, None]:
+        """Stream a completion from OpenAI."""
+        stream = await self.async_client.chat.completions.create(
+            model=self.model_name,
+            messages=self._format_messages_for_provider(messages),
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            stream=True,
+        )
+        
+        async for chunk in stream:
+            choices = chunk.choices
+            if not choices:
+                continue
+            content = choices[0].delta.content
+            if content:
+                if callback:
+                    callback(content)
+                yield content
+    
+    def _anthropic_complete(self, messages: List[Dict[str, str]]) -> str:
+        """Complete a conversation with Anthropic."""
+        formatted_messages, system = self._format_messages_for_provider(messages)
+        
+        response = self.client.messages.create(
+            model=self.model_name,
+            messages=formatted_messages,
+            system=system,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+        )
+        
+        return response.content[0].text
+    
+    async def _anthropic_acomplete(self, messages: List[Dict[str, str]]) -> str:
+        """Complete a conversation with Anthropic (async)."""
+        formatted_messages, system = self._format_messages_for_provider(messages)
+        
+        response = await self.async_client.messages.create(
+            model=self.model_name,
+            messages=formatted_messages,
+            system=system,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens or 4096,
+        )
+        
+        return response.content[0].text
+    
+    async def _anthropic_stream(
+        self,
+        messages: List[Dict[str, str]],
+        callback: Optional[Callable[[str], None]] = None
+    ) -> AsyncGenerator[str, None]:
+        """Stream a completion from Anthropic."""
+        formatted_messages, system = self._format_messages_for_provider(messages)
+        
+        stream = await self.async_client.messages.create(
+            model=self.model_name,
+            messages=formatted_messages,
+            system=system,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            stream=True,
+        )
+        
+        async for chunk in stream:
+            if chunk.type != "content_block_delta":
+                continue
+            content = getattr(chunk.delta, "text", None)
+            if content:
+                if callback:
+                    callback(content)
+                yield content
+    
+    def _ollama_request(self, messages: List[Dict[str, str]], stream: bool) -> Dict[str, Any]:
+        """Build the body of an Ollama generate request."""
+        return {
+            "model": self.model_name,
+            "prompt": self._format_messages_for_provider(messages),
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "stream": stream,
+        }
+    
+    def _ollama_complete(self, messages: List[Dict[str, str]]) -> str:
+        """Complete a conversation with Ollama."""
+        response = self.client.post("/api/generate", json=self._ollama_request(messages, False))
+        
+        response.raise_for_status()
+        return response.json()["response"]
+    
+    async def _ollama_acomplete(self, messages: List[Dict[str, str]]) -> str:
+        """Complete a conversation with Ollama (async)."""
+        response = await self.async_client.post(
+            "/api/generate", json=self._ollama_request(messages, False))
+        
+        response.raise_for_status()
+        return response.json()["response"]
+    
+    async def _ollama_stream(
+        self,
+        messages: List[Dict[str, str]],
+        callback: Optional[Callable[[str], None]] = None
+    ) -> AsyncGenerator[str, None]:
+        """Stream a completion from Ollama."""
+        async with self.async_client.stream(
+            "POST",
+            "/api/generate",
+            json=self._ollama_request(messages, True),
+            headers={"Accept": "application/x-ndjson"},
+        ) as response:
             response.raise_for_status()
             
-            # Ollama streams line-delimited JSON
-            buffer = ""
-            async for line in response.aiter_lines():
-                if not line.strip():
-                    continue
+            # Ollama streams line-delimited JSON; split the raw bytes and
+            # parse each complete line without decoding it to str first.
+            # Bytes are taken as they arrive: a fixed chunk size would make
+            # httpx hold them back until that many had been received
+            pending = bytearray()
+            async for data in response.aiter_bytes():
+                pending += data
+                *lines, rest = pending.split(b"\n")
+                pending = bytearray(rest)
                 
-                try:
-                    chunk = json.loads(line)
-                    if "response" in chunk:
-                        content = chunk["response"]
-                        buffer += content
+                for line in lines:
+                    content = self._parse_ollama_line(line)
+                    if content is not None:
                         if callback:
                             callback(content)
                         yield content
-                except json.JSONDecodeError:
-                    continue
+            
+            content = self._parse_ollama_line(pending)
+            if content is not None:
+                if callback:
+                    callback(content)
+                yield content
+    
+    @staticmethod
+    def _parse_ollama_line(line: bytes) -> Optional[str]:
+        """
+        Parse one line of an Ollama stream.
+        
+        Args:
+            line: Raw NDJSON line
+        
+        Returns:
+            Response text of the line, or None if it carries none
+        """
+        if not line.strip():
+            return None
+        
+        try:
+            chunk = fast_json.loads(bytes(line))
+        except json.JSONDecodeError:
+            return None
+        return chunk.get("response")
+    
+    def _unknown_provider(self, *args: Any, **kwargs: Any) -> Any:
+        """Reject any request for a model with no known provider."""
+        raise ValueError(f"Unknown model provider for model: {self.model_name}")
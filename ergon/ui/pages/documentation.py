@@ -13,6 +13,8 @@ import httpx
 import time
 from datetime import datetime
 
+from sqlalchemy import case, func
+
 from ergon.core.docs.crawler import (
     crawl_pydantic_ai_docs,
     crawl_langchain_docs,
@@ -137,23 +139,22 @@ def documentation_page():
             st.subheader("Documentation Status")
             
             # Get current documentation stats
+            # Total, per-source counts and most recent date in one aggregate query
+            stat_sources = ["pydantic", "langchain", "anthropic", "langgraph"]
             with get_db_session() as db:
-                doc_count = db.query(DocumentationPage).count()
-                
-                # Get counts by source
-                source_counts = {}
-                for source in ["pydantic", "langchain", "anthropic", "langgraph"]:
-                    source_counts[source] = db.query(DocumentationPage).filter(
-                        DocumentationPage.source.contains(source)
-                    ).count()
+                doc_count, *counts, most_recent = db.query(
+                    func.count(DocumentationPage.id),
+                    *(
+                        func.count(case((DocumentationPage.source.contains(source), 1)))
+                        for source in stat_sources
+                    ),
+                    func.max(DocumentationPage.created_at)
+                ).one()
                 
-                # Get most recent document
-                most_recent = db.query(DocumentationPage).order_by(
-                    DocumentationPage.created_at.desc()
-                ).first()
+                source_counts = dict(zip(stat_sources, counts))
                 
                 if most_recent:
-                    last_updated = most_recent.created_at.strftime("%Y-%m-%d %H:%M:%S")
+                    last_updated = most_recent.strftime("%Y-%m-%d %H:%M:%S")
                 else:
                     last_updated = "Never"
             
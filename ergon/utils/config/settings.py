@@ -39,6 +39,7 @@ class Settings(BaseSettings):
     default_model: str = "gpt-4o-mini"
     use_local_models: bool = False
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    max_concurrent_llm_requests: int = 16
     
     # Tekton shared settings
     tekton_home: Path = Field(default_factory=lambda: Path(
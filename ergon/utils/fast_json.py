@@ -0,0 +1,63 @@
+"""
+Fast JSON helpers for Ergon.
+
+This module wraps orjson when it is installed and falls back to the
+standard library json module otherwise, so callers get the faster
+parser without taking a hard dependency on it.
+"""
+
+import json
+from typing import Any, Union
+
+# Try to import orjson
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    HAS_ORJSON = False
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """
+    Parse a JSON document.
+    
+    Args:
+        data: JSON text as str or bytes
+        
+    Returns:
+        Parsed Python object
+    """
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """
+    Serialize an object to a JSON string.
+    
+    Args:
+        obj: Object to serialize
+        
+    Returns:
+        JSON text
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(obj)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """
+    Serialize an object to UTF-8 encoded JSON bytes.
+    
+    Args:
+        obj: Object to serialize
+        
+    Returns:
+        JSON document as bytes, ready to send over the wire
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj).encode("utf-8")
@@ -7,6 +7,7 @@ import asyncio
 import os
 import json
 import base64
+import httpx
 from unittest.mock import MagicMock, patch, mock_open
 from ergon.core.agents.mail.providers import GmailProvider
 
@@ -50,11 +51,12 @@ async def test_gmail_authentication_with_existing_token():
         provider.credentials = mock_credentials
         
         # Just test the case where credentials are already valid
-        with patch('httpx.AsyncClient.get') as mock_get:
+        with patch('httpx.AsyncClient.request') as mock_get:
             # Mock HTTP response for user profile
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.json.return_value = {"emailAddress": "test@example.com"}
+            mock_response.content = json.dumps({"emailAddress": "test@example.com"}).encode("utf-8")
             mock_get.return_value = mock_response
             
             # Call authenticate (no need to patch it further since we're just using it normally)
@@ -170,4 +172,174 @@ async def test_gmail_send_message_mock():
         assert called_with["to"] == to_addr
         assert called_with["subject"] == subject
         assert called_with["body"] == body
-        assert called_with["content_type"] == content_type
\ No newline at end of file
+        assert called_with["content_type"] == content_type
+
+
+def test_gmail_parse_batch_response():
+    """Test parsing of a multipart/mixed Gmail batch response."""
+    provider = GmailProvider(
+        credentials_file="/tmp/fake_credentials.json",
+        token_file="/tmp/fake_token.json"
+    )
+    
+    boundary = "batch_test"
+    
+    def make_part(index, status, body):
+        return (
+            f"--{boundary}\r\n"
+            f"Content-Type: application/http\r\n"
+            f"Content-ID: <response-item-{index}>\r\n\r\n"
+            f"HTTP/1.1 {status}\r\n"
+            f"Content-Type: application/json; charset=UTF-8\r\n\r\n"
+            f"{body}\r\n"
+        )
+    
+    first = {"id": "msg1", "threadId": "t1", "payload": {"headers": []}}
+    second = {"id": "msg2", "threadId": "t2", "payload": {"headers": []}}
+    
+    # Parts arrive out of order, one sub-request failed and two may be retried
+    content = (
+        make_part(2, "200 OK", json.dumps(second)) +
+        make_part(4, "503 Service Unavailable", "{}") +
+        make_part(1, "404 Not Found", "{}") +
+        make_part(3, "429 Too Many Requests", "{}") +
+        make_part(0, "200 OK", json.dumps(first)) +
+        f"--{boundary}--\r\n"
+    ).encode("utf-8")
+    
+    results, retry_indexes = provider._parse_batch_response(
+        f"multipart/mixed; boundary={boundary}", content)
+    
+    assert {index: msg["id"] for index, msg in results.items()} == {0: "msg1", 2: "msg2"}
+    assert retry_indexes == [3, 4]
+
+
+@pytest.mark.asyncio
+async def test_gmail_batch_get_messages_refetches_rate_limited_messages():
+    """Test that rate-limited batch sub-requests are fetched again individually, in order."""
+    provider = GmailProvider(
+        credentials_file="/tmp/fake_credentials.json",
+        token_file="/tmp/fake_token.json"
+    )
+    provider.credentials = MagicMock()
+    provider.credentials.valid = True
+    provider.credentials.token = "fake_token"
+    
+    boundary = "batch_test"
+    
+    def handler(request):
+        if request.url.path.endswith("/batch/gmail/v1"):
+            content = (
+                f"--{boundary}\r\nContent-Type: application/http\r\nContent-ID: <response-item-0>\r\n\r\n"
+                f"HTTP/1.1 429 Too Many Requests\r\n\r\n{{}}\r\n"
+                f"--{boundary}\r\nContent-Type: application/http\r\nContent-ID: <response-item-1>\r\n\r\n"
+                f"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n\r\n"
+                f"{json.dumps({'id': 'msg2', 'payload': {'headers': []}})}\r\n"
+                f"--{boundary}--\r\n"
+            )
+            return httpx.Response(
+                200,
+                headers={"Content-Type": f"multipart/mixed; boundary={boundary}"},
+                content=content.encode("utf-8")
+            )
+        msg_id = request.url.path.rsplit("/", 1)[-1]
+        return httpx.Response(200, json={"id": msg_id, "payload": {"headers": []}})
+    
+    provider._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    
+    messages = await provider._batch_get_messages(["msg1", "msg2"], full=False)
+    assert [msg["id"] for msg in messages] == ["msg1", "msg2"]
+    
+    await provider.close()
+
+
+def test_gmail_extract_body_prefers_html():
+    """Test that body extraction prefers a nested text/html part over text/plain."""
+    provider = GmailProvider(
+        credentials_file="/tmp/fake_credentials.json",
+        token_file="/tmp/fake_token.json"
+    )
+    
+    def encode(text):
+        return base64.urlsafe_b64encode(text.encode("utf-8")).decode("ascii").rstrip("=")
+    
+    payload = {
+        "mimeType": "multipart/mixed",
+        "parts": [
+            {
+                "mimeType": "multipart/alternative",
+                "parts": [
+                    {"mimeType": "text/plain", "body": {"data": encode("plain body")}},
+                    {"mimeType": "text/html", "body": {"data": encode("<p>html body</p>")}}
+                ]
+            },
+            {"mimeType": "application/pdf", "body": {"attachmentId": "a1"}}
+        ]
+    }
+    
+    assert provider._extract_body(payload) == "<p>html body</p>"
+    
+    # Without an HTML alternative the first plain-text part is used
+    payload["parts"][0]["parts"].pop()
+    assert provider._extract_body(payload) == "plain body"
+
+
+@pytest.mark.asyncio
+async def test_gmail_get_inbox_follows_page_tokens():
+    """Test that later inbox pages are fetched with Gmail page tokens."""
+    provider = GmailProvider(
+        credentials_file="/tmp/fake_credentials.json",
+        token_file="/tmp/fake_token.json"
+    )
+    provider.credentials = MagicMock()
+    provider.credentials.valid = True
+    provider.credentials.token = "fake_token"
+    
+    requests = []
+    
+    def handler(request):
+        requests.append(request)
+        token = request.url.params.get("pageToken")
+        page = int(token[1:]) if token else 1
+        return httpx.Response(200, json={
+            "messages": [{"id": f"page{page}"}],
+            "nextPageToken": f"p{page + 1}"
+        })
+    
+    provider._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    
+    async def mock_batch_get_messages(message_ids, full=True):
+        return [{"id": msg_id} for msg_id in message_ids]
+    
+    provider._batch_get_messages = mock_batch_get_messages
+    
+    # Jumping straight to page 3 walks the cursor through page 2
+    messages = await provider.get_inbox(limit=10, page=3)
+    assert [msg["id"] for msg in messages] == ["page3"]
+    assert [r.url.params.get("pageToken") for r in requests] == [None, "p2", "p3"]
+    
+    # Revisiting page 2 reuses the recorded cursor
+    requests.clear()
+    messages = await provider.get_inbox(limit=10, page=2)
+    assert [msg["id"] for msg in messages] == ["page2"]
+    assert [r.url.params.get("pageToken") for r in requests] == ["p2"]
+    
+    await provider.close()
+
+
+def test_gmail_list_view_body_falls_back_to_snippet():
+    """Test that metadata-only list views carry the snippet as the message body."""
+    provider = GmailProvider(
+        credentials_file="/tmp/fake_credentials.json",
+        token_file="/tmp/fake_token.json"
+    )
+    
+    raw_message = {
+        "id": "msg1",
+        "snippet": "Lunch on Friday?",
+        "payload": {"headers": [{"name": "Subject", "value": "Lunch"}]}
+    }
+    
+    message = provider._format_message(raw_message, full=False)
+    assert message["body"] == "Lunch on Friday?"
+    assert message["snippet"] == "Lunch on Friday?"
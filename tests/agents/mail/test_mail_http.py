@@ -0,0 +1,62 @@
+"""
+Tests for the mail provider HTTP retry helper.
+"""
+
+import pytest
+import httpx
+from unittest.mock import patch, AsyncMock
+
+from ergon.core.agents.mail.providers.http import request_with_retry
+
+
+def _sequence_transport(statuses, headers=None):
+    """Build a mock transport that replies with the given statuses in order."""
+    calls = []
+    
+    def handler(request):
+        calls.append(request)
+        status = statuses[min(len(calls), len(statuses)) - 1]
+        return httpx.Response(status, headers=headers or {}, json={})
+    
+    return httpx.MockTransport(handler), calls
+
+
+@pytest.mark.asyncio
+async def test_request_with_retry_honours_retry_after():
+    """Test that 429 responses are retried after the Retry-After delay."""
+    transport, calls = _sequence_transport([429, 200], headers={"Retry-After": "3"})
+    
+    with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        async with httpx.AsyncClient(transport=transport) as client:
+            response = await request_with_retry(client, "GET", "https://example.com/")
+    
+    assert response.status_code == 200
+    assert len(calls) == 2
+    mock_sleep.assert_awaited_once_with(3.0)
+
+
+@pytest.mark.asyncio
+async def test_request_with_retry_gives_up_after_max_retries():
+    """Test that retries stop after max_retries and the last response is returned."""
+    transport, calls = _sequence_transport([503])
+    
+    with patch("asyncio.sleep", new_callable=AsyncMock):
+        async with httpx.AsyncClient(transport=transport) as client:
+            response = await request_with_retry(
+                client, "GET", "https://example.com/", max_retries=2)
+    
+    assert response.status_code == 503
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_request_with_retry_does_not_retry_post_on_server_error():
+    """Test that non-idempotent requests are not retried on transient 5xx errors."""
+    transport, calls = _sequence_transport([500, 200])
+    
+    with patch("asyncio.sleep", new_callable=AsyncMock):
+        async with httpx.AsyncClient(transport=transport) as client:
+            response = await request_with_retry(client, "POST", "https://example.com/")
+    
+    assert response.status_code == 500
+    assert len(calls) == 1
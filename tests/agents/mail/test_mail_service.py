@@ -74,9 +74,9 @@ async def test_get_mail_service_singleton():
                 mock_provider_settings.config_path = '/tmp'
                 
                 with patch('os.path.exists', return_value=False):
-                    # Reset singleton at the start
+                    # Reset cached services at the start
                     import ergon.core.agents.mail.service
-                    ergon.core.agents.mail.service._mail_service_instance = None
+                    ergon.core.agents.mail.service._mail_services.clear()
                     
                     # Get service instances
                     service1 = get_mail_service("gmail")
@@ -115,4 +115,20 @@ async def test_setup_mail_provider():
         
         # Verify result
         assert result is True
-        mock_get_service.assert_called_once_with("gmail")
\ No newline at end of file
+        mock_get_service.assert_called_once_with("gmail")
+
+
+def test_get_mail_service_per_event_loop():
+    """Test that each event loop gets its own mail service."""
+    with patch('ergon.core.agents.mail.service.MailService') as mock_service_class:
+        mock_service_class.side_effect = lambda provider_type: MagicMock(provider_type=provider_type)
+        
+        async def get_twice():
+            service = get_mail_service("gmail")
+            assert get_mail_service() is service
+            return service
+        
+        first = asyncio.run(get_twice())
+        second = asyncio.run(get_twice())
+        
+        assert first is not second
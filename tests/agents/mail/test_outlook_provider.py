@@ -0,0 +1,108 @@
+"""
+Tests for the Outlook Provider.
+"""
+
+import json
+import pytest
+import httpx
+from ergon.core.agents.mail.providers import OutlookProvider
+
+
+def make_provider(tmp_path, handler):
+    """Create an Outlook provider whose HTTP client is served by handler."""
+    provider = OutlookProvider(
+        client_id="fake_client_id",
+        token_file=str(tmp_path / "outlook_token.json"),
+        redirect_uri="http://localhost:8000/auth/outlook/callback"
+    )
+    provider.access_token = "fake_token"
+    provider._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return provider
+
+
+@pytest.mark.asyncio
+async def test_outlook_get_folders_uses_response_cache(tmp_path):
+    """Test that repeated folder lookups are served from the GET cache."""
+    requests = []
+    
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={
+            "value": [{"id": "inbox", "displayName": "Inbox", "totalItemCount": 3, "unreadItemCount": 1}]
+        })
+    
+    provider = make_provider(tmp_path, handler)
+    
+    first = await provider.get_folders()
+    second = await provider.get_folders()
+    
+    assert first == second == [{"id": "inbox", "name": "Inbox", "total_items": 3, "unread_items": 1}]
+    assert len(requests) == 1
+    
+    # Clearing the cache forces a fresh request
+    provider.clear_cache()
+    await provider.get_folders()
+    assert len(requests) == 2
+    
+    await provider.close()
+
+
+@pytest.mark.asyncio
+async def test_outlook_send_messages_reports_each_result(tmp_path):
+    """Test that bulk sends report success per message in input order."""
+    def handler(request):
+        recipient = json.loads(request.content)["message"]["toRecipients"][0]["emailAddress"]["address"]
+        return httpx.Response(400 if recipient == "bad@example.com" else 202)
+    
+    provider = make_provider(tmp_path, handler)
+    
+    results = await provider.send_messages([
+        {"to": ["one@example.com"], "subject": "One", "body": "Body"},
+        {"to": ["bad@example.com"], "subject": "Two", "body": "Body"},
+        {"to": ["three@example.com"], "subject": "Three", "body": "Body"}
+    ], concurrency=2)
+    
+    assert results == [True, False, True]
+    
+    await provider.close()
+
+
+@pytest.mark.asyncio
+async def test_outlook_redirect_listener_only_accepts_callback_path(tmp_path):
+    """Test that the sign-in listener picks a free loopback port and ignores other paths."""
+    provider = OutlookProvider(
+        client_id="fake_client_id",
+        token_file=str(tmp_path / "outlook_token.json")
+    )
+    
+    future, server, redirect_uri = await provider._start_redirect_listener("expected-state")
+    try:
+        assert redirect_uri.startswith("http://localhost:")
+        assert redirect_uri.endswith("/auth/outlook/callback")
+        
+        callback_url = redirect_uri.replace("localhost", "127.0.0.1")
+        async with httpx.AsyncClient() as client:
+            response = await client.get(callback_url.replace("/auth/outlook/callback", "/favicon.ico"))
+            assert response.status_code == 404
+            assert not future.done()
+            
+            response = await client.get(callback_url, params={"code": "auth-code", "state": "expected-state"})
+            assert response.status_code == 200
+        
+        assert await future == "auth-code"
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_outlook_redirect_listener_requires_loopback_uri(tmp_path):
+    """Test that a non-loopback redirect URI is never bound by the sign-in listener."""
+    provider = OutlookProvider(
+        client_id="fake_client_id",
+        token_file=str(tmp_path / "outlook_token.json"),
+        redirect_uri="https://ergon.example.com/auth/outlook/callback"
+    )
+    
+    with pytest.raises(ValueError):
+        await provider._start_redirect_listener("expected-state")
@@ -0,0 +1,3 @@
+"""
+Tests for the agent runner.
+"""
\ No newline at end of file
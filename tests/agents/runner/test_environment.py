@@ -0,0 +1,39 @@
+"""
+Tests for the agent runner's shared environments.
+"""
+
+import os
+import time
+
+from ergon.core.agents.runner.utils import environment
+
+
+def make_environment(env_root, agent_id, digest, age=0):
+    """Create an environment directory last used age seconds ago."""
+    path = os.path.join(env_root, f"{environment.CACHED_ENV_PREFIX}{agent_id}_{digest}")
+    os.makedirs(path)
+    used_at = time.time() - age
+    os.utime(path, (used_at, used_at))
+    return path
+
+
+def test_evict_superseded_environments_keeps_environments_in_use(tmp_path):
+    """Test that only stale environments no runner holds are evicted."""
+    env_root = str(tmp_path)
+    stale = environment.ENV_EVICTION_GRACE_PERIOD + 60
+    current = make_environment(env_root, 1, "current")
+    unused = make_environment(env_root, 1, "unused", age=stale)
+    recent = make_environment(env_root, 1, "recent")
+    held = make_environment(env_root, 1, "held", age=stale)
+    other_agent = make_environment(env_root, 2, "other", age=stale)
+    
+    environment._acquire_environment(held)
+    os.utime(held, (time.time() - stale, time.time() - stale))
+    try:
+        environment._evict_superseded_environments(env_root, 1, current)
+    finally:
+        environment._release_environment(held)
+    
+    assert not os.path.exists(unused)
+    assert all(os.path.isdir(path) for path in (current, recent, held, other_agent))
+    assert held not in environment._environments_in_use
@@ -0,0 +1,59 @@
+"""
+Tests for the agent runner's execution records.
+"""
+
+import asyncio
+import json
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from ergon.core.database.base import Base
+from ergon.core.database.models import AgentExecution, AgentMessage
+from ergon.core.agents.runner.execution.db import RecordWriter, record_tool_call
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Create a session on a temporary database, shared with writer threads."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def test_record_tool_call_persists_message(db):
+    """Test that a tool call is stored with its name, input and output."""
+    execution = AgentExecution(status="running")
+    db.add(execution)
+    db.commit()
+    
+    record_tool_call(execution.id, "search", {"query": "ergon"}, "3 results", db=db)
+    db.commit()
+    
+    message = db.query(AgentMessage).filter(AgentMessage.execution_id == execution.id).one()
+    assert message.role == "tool"
+    assert message.tool_name == "search"
+    assert json.loads(message.tool_input) == {"query": "ergon"}
+    assert message.tool_output == "3 results"
+
+
+@pytest.mark.asyncio
+async def test_record_writer_commits_tool_calls(db):
+    """Test that tool calls queued on a record writer are committed."""
+    execution = AgentExecution(status="running")
+    db.add(execution)
+    db.commit()
+    
+    writer = RecordWriter(db)
+    writer.submit(record_tool_call, execution.id, "search", {"query": "ergon"}, "3 results")
+    writer.submit(record_tool_call, execution.id, "fetch", {"url": "https://example.com"}, None)
+    await writer.aclose()
+    
+    db.expire_all()
+    names = [
+        message.tool_name
+        for message in db.query(AgentMessage).order_by(AgentMessage.id)
+    ]
+    assert names == ["search", "fetch"]
@@ -0,0 +1,70 @@
+"""
+Tests for the Ergon API endpoints.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from sqlalchemy import create_engine
+
+from ergon.api.app import app
+from ergon.core.agents.runner import AgentRunner
+from ergon.core.agents.runner.execution.db import record_execution_success
+from ergon.core.database.base import Base
+from ergon.core.database.engine import ScopedSession, SessionLocal
+from ergon.core.database.models import Agent
+
+
+@pytest.fixture
+def agent_id(tmp_path):
+    """Point the API's sessions at a temporary database holding one agent."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine)
+    previous_bind = SessionLocal.kw["bind"]
+    ScopedSession.remove()
+    SessionLocal.configure(bind=engine)
+    
+    with SessionLocal() as db:
+        agent = Agent(name="Echo", model_name="test-model", system_prompt="Echo the input.")
+        db.add(agent)
+        db.commit()
+        agent_id = agent.id
+    
+    yield agent_id
+    
+    ScopedSession.remove()
+    SessionLocal.configure(bind=previous_bind)
+    engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_submit_agent_run_completes(agent_id, monkeypatch):
+    """Test that a submitted run can be polled until it completes."""
+    async def fake_arun(self, input_text):
+        # Read the agent as a real run does, after the request's session closed
+        record_execution_success(self.execution_id)
+        return f"{self.agent.name}: {input_text}"
+    
+    monkeypatch.setattr(AgentRunner, "arun", fake_arun)
+    
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            f"/api/v1/agents/{agent_id}/submit",
+            json={"content": "hello", "stream": False}
+        )
+        assert response.status_code == 200
+        execution_id = response.json()["execution_id"]
+        
+        for _ in range(50):
+            response = await client.get(f"/api/v1/executions/{execution_id}")
+            assert response.status_code == 200
+            if response.json()["status"] == "completed":
+                break
+            await asyncio.sleep(0.1)
+        
+        assert response.json()["status"] == "completed"
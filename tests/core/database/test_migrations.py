@@ -148,4 +148,62 @@ def test_create_migration(migration_manager):
     
     # Verify migration message
     migration_data = next(m for m in migrations if m["revision"] == revision)
-    assert migration_data["message"] == "test migration"
\ No newline at end of file
+    assert migration_data["message"] == "test migration"
+
+def test_upgrade_adds_agent_columns_to_existing_database(temp_dir):
+    """Test that packaged revisions add and backfill columns missing from an older database."""
+    original_db_url = settings.database_url
+    db_path = os.path.join(temp_dir, "existing.db")
+    settings.database_url = f"sqlite:///{db_path}"
+    
+    try:
+        # Tables as created before the agent type and tool call columns existed
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+        cursor.execute("CREATE TABLE agents (id INTEGER PRIMARY KEY, name VARCHAR(255) NOT NULL)")
+        cursor.execute(
+            "CREATE TABLE agent_messages (id INTEGER PRIMARY KEY, role VARCHAR(50) NOT NULL, content TEXT NOT NULL)"
+        )
+        cursor.executemany(
+            "INSERT INTO agents (name) VALUES (?)",
+            [("Nexus-Helper",), ("Email Sorter",), ("Planner",)]
+        )
+        conn.commit()
+        conn.close()
+        
+        manager = MigrationManager(migrations_dir=os.path.join(temp_dir, "migrations"))
+        assert manager.upgrade() is True
+        
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+        cursor.execute("SELECT name, type FROM agents ORDER BY id")
+        agent_types = cursor.fetchall()
+        cursor.execute("PRAGMA table_info(agent_messages)")
+        message_columns = {row[1] for row in cursor.fetchall()}
+        conn.close()
+        
+        assert agent_types == [("Nexus-Helper", "nexus"), ("Email Sorter", "mail"), ("Planner", "standard")]
+        assert {"tool_name", "tool_input", "tool_output"} <= message_columns
+    finally:
+        settings.database_url = original_db_url
+
+
+def test_upgrade_skips_tables_not_created_yet(temp_dir):
+    """Test that packaged revisions leave a database without tables to init_db()."""
+    original_db_url = settings.database_url
+    db_path = os.path.join(temp_dir, "empty.db")
+    settings.database_url = f"sqlite:///{db_path}"
+    
+    try:
+        manager = MigrationManager(migrations_dir=os.path.join(temp_dir, "migrations"))
+        assert manager.upgrade() is True
+        
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        tables = {row[0] for row in cursor.fetchall()}
+        conn.close()
+        
+        assert tables == {"alembic_version"}
+    finally:
+        settings.database_url = original_db_url
@@ -0,0 +1,236 @@
+"""
+Tests for the LLM client in Ergon.
+"""
+
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from ergon.core.llm.client import LLMClient
+from ergon.utils.config.settings import settings
+
+
+def make_client(temperature, handler):
+    """Create an Ollama-backed client whose HTTP calls go to handler."""
+    client = LLMClient(model_name="ollama/llama3", temperature=temperature, use_rhetor=False)
+    client.async_client = httpx.AsyncClient(
+        base_url="http://ollama.test",
+        transport=httpx.MockTransport(handler)
+    )
+    return client
+
+
+@pytest.mark.asyncio
+async def test_acomplete_coalesces_identical_deterministic_requests():
+    """Test that concurrent identical requests at temperature 0 share one backend call."""
+    requests = []
+
+    async def handler(request):
+        requests.append(json.loads(request.content))
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"response": f"answer {len(requests)}"})
+
+    client = make_client(0, handler)
+    messages = [{"role": "user", "content": "What is Ergon?"}]
+
+    responses = await asyncio.gather(*(client.acomplete(messages) for _ in range(5)))
+    assert responses == ["answer 1"] * 5
+    assert len(requests) == 1
+
+    # A repeat after completion is served from the response cache
+    assert await client.acomplete(messages) == "answer 1"
+    assert len(requests) == 1
+
+    # A different conversation still reaches the backend
+    assert await client.acomplete([{"role": "user", "content": "Something else"}]) == "answer 2"
+    assert len(requests) == 2
+
+    await client.async_client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_acomplete_keeps_sampled_requests_independent():
+    """Test that requests with sampling enabled are neither coalesced nor cached."""
+    requests = []
+
+    async def handler(request):
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, json={"response": f"sample {len(requests)}"})
+
+    client = make_client(0.7, handler)
+    messages = [{"role": "user", "content": "Tell me a joke"}]
+
+    responses = await asyncio.gather(*(client.acomplete(messages) for _ in range(3)))
+    assert sorted(responses) == ["sample 1", "sample 2", "sample 3"]
+    assert len(requests) == 3
+
+    await client.async_client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_acomplete_bounds_concurrent_backend_requests(monkeypatch):
+    """Test that backend requests beyond the concurrency limit wait for a slot."""
+    monkeypatch.setattr(settings, "max_concurrent_llm_requests", 2)
+    LLMClient._request_limits.clear()
+    active = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return httpx.Response(200, json={"response": "ok"})
+
+    client = make_client(0.7, handler)
+    messages = [{"role": "user", "content": "Hello"}]
+
+    responses = await asyncio.gather(*(client.acomplete(messages) for _ in range(6)))
+    assert responses == ["ok"] * 6
+    assert peak == 2
+
+    await client.async_client.aclose()
+    LLMClient._request_limits.clear()
+
+
+@pytest.mark.asyncio
+async def test_acomplete_stream_batches_tokens():
+    """Test that streamed tokens are coalesced into size-bounded chunks."""
+    tokens = ["ab", "cd", "ef", "gh", "ij"]
+
+    async def handler(request):
+        body = "".join(json.dumps({"response": token}) + "\n" for token in tokens)
+        return httpx.Response(200, content=body.encode("utf-8"))
+
+    client = make_client(0.7, handler)
+    messages = [{"role": "user", "content": "Stream please"}]
+    received = []
+
+    chunks = [
+        chunk async for chunk in client.acomplete_stream(
+            messages, callback=received.append, batch_interval_ms=60000, batch_max_chars=4)
+    ]
+    assert chunks == ["abcd", "efgh", "ij"]
+    assert received == chunks
+
+    await client.async_client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_acomplete_stream_joins_lines_split_across_reads():
+    """Test that Ollama lines split across network reads are parsed whole."""
+    body = "".join(json.dumps({"response": token}) + "\n" for token in ["héllo", " ", "wörld"])
+    data = body.encode("utf-8")
+
+    async def pieces():
+        for start in range(0, len(data), 7):
+            yield data[start:start + 7]
+
+    async def handler(request):
+        return httpx.Response(200, content=pieces())
+
+    client = make_client(0.7, handler)
+    messages = [{"role": "user", "content": "Stream please"}]
+
+    chunks = [chunk async for chunk in client.acomplete_stream(messages, batch_max_chars=1)]
+    assert chunks == ["héllo", " ", "wörld"]
+
+    await client.async_client.aclose()
+
+
+def test_async_client_is_created_per_event_loop(monkeypatch):
+    """Test that each event loop gets its own async client, so later loops still work."""
+    async def handler(request):
+        return httpx.Response(200, json={"response": "ok"})
+
+    monkeypatch.setattr(LLMClient, "_new_ollama_async_client", staticmethod(
+        lambda base_url: httpx.AsyncClient(base_url=base_url, transport=httpx.MockTransport(handler))
+    ))
+    client = LLMClient(model_name="ollama/llama3", temperature=0.7, use_rhetor=False)
+    messages = [{"role": "user", "content": "Hello"}]
+
+    async def complete():
+        response = await client.acomplete(messages)
+        assert client.async_client is client.async_client
+        return response, client.async_client
+
+    first_response, first_client = asyncio.run(complete())
+    second_response, second_client = asyncio.run(complete())
+    assert first_response == second_response == "ok"
+    assert first_client is not second_client
+
+
+def test_acomplete_coalesces_per_event_loop(monkeypatch):
+    """Test that identical deterministic requests on loops in other threads do not share futures."""
+    async def handler(request):
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"response": "ok"})
+
+    monkeypatch.setattr(LLMClient, "_new_ollama_async_client", staticmethod(
+        lambda base_url: httpx.AsyncClient(base_url=base_url, transport=httpx.MockTransport(handler))
+    ))
+    client = LLMClient(model_name="ollama/llama3", temperature=0, use_rhetor=False)
+    messages = [{"role": "user", "content": "Hello"}]
+    barrier = threading.Barrier(2)
+
+    def complete():
+        barrier.wait()
+        return asyncio.run(client.acomplete(messages))
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        responses = list(executor.map(lambda _: complete(), range(2)))
+    assert responses == ["ok", "ok"]
+
+
+@pytest.mark.asyncio
+async def test_acomplete_stream_flushes_held_tokens_when_model_pauses():
+    """Test that buffered tokens are emitted at the batch deadline, not with the next token."""
+    async def pieces():
+        yield (json.dumps({"response": "first"}) + "\n").encode("utf-8")
+        await asyncio.sleep(0.3)
+        yield (json.dumps({"response": "second"}) + "\n").encode("utf-8")
+
+    async def handler(request):
+        return httpx.Response(200, content=pieces())
+
+    client = make_client(0.7, handler)
+    messages = [{"role": "user", "content": "Stream please"}]
+
+    chunks = [
+        chunk async for chunk in client.acomplete_stream(messages, batch_interval_ms=20)
+    ]
+    assert chunks == ["first", "second"]
+
+    await client.async_client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_acomplete_stream_releases_request_limit_before_slow_consumer(monkeypatch):
+    """Test that a stream whose consumer is idle does not hold a request slot."""
+    monkeypatch.setattr(settings, "max_concurrent_llm_requests", 1)
+    LLMClient._request_limits.clear()
+
+    async def handler(request):
+        if json.loads(request.content)["stream"]:
+            body = "".join(json.dumps({"response": token}) + "\n" for token in ["ab", "cd"])
+            return httpx.Response(200, content=body.encode("utf-8"))
+        return httpx.Response(200, json={"response": "ok"})
+
+    client = make_client(0.7, handler)
+    messages = [{"role": "user", "content": "Hello"}]
+
+    stream = client.acomplete_stream(messages, batch_max_chars=2)
+    assert await stream.__anext__() == "ab"
+
+    # The stream is not drained, yet another request still gets the only slot
+    assert await asyncio.wait_for(client.acomplete(messages), 1) == "ok"
+
+    assert [chunk async for chunk in stream] == ["cd"]
+
+    await client.async_client.aclose()
+    LLMClient._request_limits.clear()